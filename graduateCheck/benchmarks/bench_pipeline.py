@@ -0,0 +1,185 @@
+"""분석 파이프라인 단계별 벤치마크 (합성 성적표)
+
+benchmarks.transcripts로 만든 성적표를 형식/과목 수별로 돌려 단계마다 중앙값과
+백분위수를 보고합니다.
+
+    read        load_transcript (취득학점확인원은 xlsx_reader + cleaner2까지 포함)
+    detect      ExcelStructureDetector.detect_structure (레이아웃 캐시 없이)
+    cleaner2    clean_dataframe_v2 (portal 형식 제외)
+    cleaner     기존 clean_dataframe (portal 형식만)
+    common / major / field_trip / year2025
+                요건 분석기별 시간 (2022학번과 2025학번으로 분석)
+    view        업로드 뷰 전체 (Server-Timing 헤더의 단계 포함, view.<단계>)
+
+사용법 (graduateCheck 디렉토리에서):
+    python -m benchmarks.bench_pipeline [--layouts ...] [--courses 40 160 640] [--repeat N] [--json PATH]
+
+--json을 주면 측정값을 JSON으로도 저장합니다 (회귀 비교용).
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import statistics
+from collections import defaultdict
+from typing import Dict, List
+
+import django
+from django.apps import apps
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'graduateCheck.settings')
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+# 이미 설정된 프로세스(테스트 등)에서 다시 부르면 로깅 설정이 초기화됨
+if not apps.ready:
+    django.setup()
+
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+
+from benchmarks.transcripts import LAYOUTS, TranscriptSpec, generate_workbook  # noqa: E402
+from myapp.services.cleaner import clean_dataframe  # noqa: E402
+from myapp.services.cleaner2 import ExcelStructureDetector, clean_dataframe_v2  # noqa: E402
+from myapp.services.graduation.graduation_analyzer import GraduationAnalyzer  # noqa: E402
+from myapp.services.ingestion import load_transcript, read_transcript  # noqa: E402
+from myapp.services.layout_cache import layout_cache  # noqa: E402
+from myapp.services.parse_cache import parse_cache  # noqa: E402
+from myapp.services.timing import percentile, start_timer, stop_timer  # noqa: E402
+
+ANALYZER_STAGES = ('common', 'major', 'field_trip', 'year2025')
+ADMISSION_YEARS = (2022, 2025)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """초 단위 측정값 -> ms 단위 중앙값/백분위수"""
+    values = sorted(sample * 1000 for sample in samples)
+    return {
+        'median': round(statistics.median(values), 3),
+        'p90': round(percentile(values, 0.90), 3),
+        'p99': round(percentile(values, 0.99), 3),
+        'max': round(values[-1], 3),
+    }
+
+
+def timed(samples: Dict[str, List[float]], name: str, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    samples[name].append(time.perf_counter() - start)
+    return result
+
+
+def bench_stages(spec: TranscriptSpec, content: bytes, samples: Dict[str, List[float]], errors: Dict[str, str]):
+    """읽기, 형식 판별, 정제, 요건 분석기를 한 번씩 측정 (실패한 분석은 errors에 남기고 측정에서 뺌)"""
+    timed(samples, 'read', load_transcript, io.BytesIO(content))
+    raw = read_transcript(io.BytesIO(content))
+    timed(samples, 'detect', ExcelStructureDetector(layout_cache=None).detect_structure, raw)
+    if spec.layout == 'portal':
+        cleaned = timed(samples, 'cleaner', clean_dataframe, raw.copy())
+    else:
+        cleaned = timed(samples, 'cleaner2', clean_dataframe_v2, raw.copy())
+
+    analyzer = GraduationAnalyzer()
+    df = analyzer._normalize(cleaned.copy())
+    for admission_year in ADMISSION_YEARS:
+        requirement = analyzer.requirement_manager.get_requirement(admission_year, 'normal')
+        timer, token = start_timer()
+        try:
+            analyzer._analyze_requirements(df, requirement, 'normal', admission_year, 'yes')
+        except Exception as e:
+            errors[f'analyze({admission_year})'] = f'{type(e).__name__}: {e}'
+            continue
+        finally:
+            stop_timer(token)
+        seconds = timer.seconds()
+        for name in ANALYZER_STAGES:
+            if name in seconds:
+                samples[name].append(seconds[name])
+
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """'read;dur=12.3, total;dur=20.1' -> {'read': 0.0123, 'total': 0.0201}"""
+    result = {}
+    for metric in filter(None, (part.strip() for part in header.split(','))):
+        name, _, duration = metric.partition(';dur=')
+        result[name] = float(duration) / 1000
+    return result
+
+
+def bench_view(client: Client, spec: TranscriptSpec, content: bytes, samples: Dict[str, List[float]]):
+    """업로드 뷰 전체 (공유 캐시까지 파싱 캐시를 비워 매번 새로 파싱)"""
+    parse_cache.clear()
+    if parse_cache.shared:
+        caches[parse_cache.shared].clear()
+    layout_cache.clear()
+    start = time.perf_counter()
+    response = client.post(reverse('index'), {
+        'excel_file': SimpleUploadedFile('transcript.xlsx', content),
+        'student_id': f'{spec.start_year}0001',
+        'student_type': 'normal',
+        'internship_completed': 'yes',
+    })
+    samples['view'].append(time.perf_counter() - start)
+    if response.status_code != 200:
+        raise RuntimeError(f"뷰 응답 오류: {response.status_code}")
+    for name, seconds in parse_server_timing(response.get('Server-Timing', '')).items():
+        samples[f'view.{name}'].append(seconds)
+
+
+def run(layouts, course_counts, repeat: int, seed: int):
+    """-> ({'<형식>/<과목 수>': {단계: 요약}}, {'<형식>/<과목 수>': {분석: 오류}})"""
+    results, failures = {}, {}
+    client = Client()
+    with override_settings(SECRET_KEY='benchmark', ALLOWED_HOSTS=['testserver'],
+                           SECURE_SSL_REDIRECT=False, STAGE_TIMING=True, METRICS_ENABLED=False):
+        for layout in layouts:
+            for courses in course_counts:
+                spec = TranscriptSpec(layout=layout, courses=courses, seed=seed)
+                content = generate_workbook(spec)
+                samples: Dict[str, List[float]] = defaultdict(list)
+                errors: Dict[str, str] = {}
+                for _ in range(repeat):
+                    bench_stages(spec, content, samples, errors)
+                    bench_view(client, spec, content, samples)
+                results[f'{layout}/{courses}'] = {name: summarize(values) for name, values in samples.items()}
+                if errors:
+                    failures[f'{layout}/{courses}'] = errors
+    return results, failures
+
+
+def print_results(results, failures):
+    print(f"{'case':<26} {'stage':<18} {'median':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+    for case, stages in results.items():
+        for name, summary in stages.items():
+            print(f"{case:<26} {name:<18} " + ' '.join(
+                f"{summary[key]:>7.2f}ms" for key in ('median', 'p90', 'p99', 'max')))
+    for case, errors in failures.items():
+        for name, error in errors.items():
+            print(f"{case}: {name} 실패 - {error}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--layouts', nargs='+', choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument('--courses', nargs='+', type=int, default=[40, 160, 640])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='측정값을 저장할 JSON 파일')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    # 벤치마크가 레이아웃 지문 파일을 건드리지 않도록 메모리 캐시만 씀
+    layout_cache.path = None
+
+    results, failures = run(args.layouts, args.courses, args.repeat, args.seed)
+    print_results(results, failures)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'repeat': args.repeat, 'seed': args.seed, 'results': results, 'failures': failures}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""취득학점확인원 행 파싱 벤치마크: 기존 정규식 while-루프 vs CreditRowTokenizer
+
+사용법 (graduateCheck 디렉토리에서):
+    python -m benchmarks.bench_row_tokenizer [엑셀파일 ...] [--repeat N]
+
+파일을 지정하지 않으면 합성 취득학점확인원 파일로 측정합니다.
+"""
+import io
+import re
+import sys
+import time
+import argparse
+import statistics
+import logging
+
+from myapp.services.cleaner2 import ExcelStructureDetector
+from myapp.services.row_tokenizer import CreditRowTokenizer
+from myapp.services.xlsx_reader import read_row_tokens
+from benchmarks.bench_xlsx_reader import build_sample_workbook
+
+_DETECTOR = ExcelStructureDetector()
+COURSE_TYPES = _DETECTOR.course_types
+GRADE_VALUES = _DETECTOR.grade_values
+
+
+def legacy_extract_courses(row_values, course_type):
+    """이전 FlexibleCleaner._extract_courses_from_row 구현 (비교 기준)"""
+    courses = []
+    i = 0
+    if any(val in COURSE_TYPES for val in row_values[:3]):
+        while i < len(row_values):
+            if row_values[i] in COURSE_TYPES:
+                i += 1
+                while i < len(row_values) and (
+                    re.match(r'^\d+\.\d+$', row_values[i]) or
+                    re.match(r'^\(\d+\.\d+\)$', row_values[i])
+                ):
+                    i += 1
+                break
+            i += 1
+
+    while i < len(row_values):
+        if re.match(r'^(\([^)]+\))?\d{2}/\d(\s+\d)?$', row_values[i]):
+            course_info = legacy_extract_single_course(row_values, i)
+            if course_info:
+                course_info['course_type'] = course_type
+                courses.append(course_info)
+                i = course_info['next_index']
+            else:
+                i += 1
+        else:
+            i += 1
+    return courses
+
+
+def legacy_extract_single_course(row_values, start_idx):
+    course_info = {}
+    i = start_idx
+    semester_match = re.match(r'^(\([^)]+\))?(\d{2})/(\d)(\s+\d)?$', row_values[i])
+    course_info['year'] = 2000 + int(semester_match.group(2))
+    course_info['semester'] = f"{semester_match.group(3)}학기"
+    i += 1
+
+    if i < len(row_values) and (
+        re.match(r'^[A-Z]{4}\d+', row_values[i]) or
+        re.match(r'^[A-Z]+\d+', row_values[i]) or
+        '(' in row_values[i]
+    ):
+        i += 1
+
+    while i < len(row_values):
+        current_value = row_values[i]
+        i += 1
+        if (len(current_value) >= 2 and
+                re.search(r'[가-힣]', current_value) and
+                not re.match(r'^\d+(\.\d+)?$', current_value) and
+                current_value not in GRADE_VALUES):
+            course_info['course_name'] = current_value
+            break
+    else:
+        return None
+
+    course_info['credits'] = 3
+    while i < len(row_values):
+        value = row_values[i]
+        i += 1
+        if re.match(r'^\d+(\.\d+)?$', value) and 0.5 <= float(value) <= 6.0:
+            course_info['credits'] = int(float(value))
+            break
+
+    course_info['grade'] = 'P'
+    while i < len(row_values):
+        if row_values[i] in GRADE_VALUES:
+            course_info['grade'] = row_values[i]
+            i += 1
+            break
+        if re.match(r'^(\([^)]+\))?\d{2}/\d(\s+\d)?$', row_values[i]):
+            break
+        i += 1
+
+    course_info['next_index'] = i
+    return course_info
+
+
+def course_rows(token_rows):
+    """과목이 들어있는 (토큰 목록, 과목구분) 행"""
+    rows = []
+    for row_values in token_rows:
+        course_type = next((val for val in row_values[:3] if val in COURSE_TYPES), '전선')
+        if len(row_values) >= 3:
+            rows.append((row_values, course_type))
+    return rows
+
+
+def legacy_path(rows):
+    for row_values, course_type in rows:
+        legacy_extract_courses(row_values, course_type)
+
+
+def fsm_path(rows):
+    # 측정마다 새 토크나이저 (분류 캐시가 빈 상태에서 시작)
+    tokenizer = CreditRowTokenizer(COURSE_TYPES, GRADE_VALUES)
+    for row_values, course_type in rows:
+        tokenizer.extract_courses(row_values, course_type)
+
+
+def measure(func, rows, repeat: int):
+    """행 하나당 중앙값 시간"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) / max(len(rows), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+
+    samples = [(path, open(path, 'rb').read()) for path in args.files]
+    if not samples:
+        samples = [(f'synthetic({rows}행)', build_sample_workbook(rows)) for rows in (20, 80, 320)]
+
+    print(f"{'file':<30} {'legacy/row':>12} {'fsm/row':>10} {'speedup':>8}")
+    for name, content in samples:
+        rows = course_rows(read_row_tokens(io.BytesIO(content)))
+        tokenizer = CreditRowTokenizer(COURSE_TYPES, GRADE_VALUES)
+        for row_values, course_type in rows:
+            assert tokenizer.extract_courses(row_values, course_type) == legacy_extract_courses(row_values, course_type)
+
+        legacy = measure(legacy_path, rows, args.repeat)
+        current = measure(fsm_path, rows, args.repeat)
+        print(f"{name:<30} {legacy * 1e6:>10.1f}us {current * 1e6:>8.1f}us {legacy / current:>7.1f}x")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""취득학점확인원 읽기 벤치마크: pd.read_excel 경로 vs xlsx_reader 직접 읽기
+
+사용법 (graduateCheck 디렉토리에서):
+    python -m benchmarks.bench_xlsx_reader [엑셀파일 ...] [--repeat N]
+
+파일을 지정하지 않으면 합성 취득학점확인원 파일로 측정합니다.
+"""
+import io
+import sys
+import time
+import argparse
+import statistics
+import logging
+
+import pandas as pd
+from openpyxl import Workbook
+
+from myapp.services.cleaner2 import FlexibleCleaner, clean_dataframe_v2
+from myapp.services.xlsx_reader import read_row_tokens
+
+
+def build_sample_workbook(course_rows: int = 40):
+    """합성 취득학점확인원 xlsx 바이트 생성 (한 행에 과목 3개)"""
+    course_types = ['지교', '심교', '기교', '전선', '전필', '일선']
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(['취득학점 확인원'])
+    sheet.append(['학번', '202200000', '성명', '홍길동'])
+    sheet.append(['구분', '취득학점'])
+    for i in range(course_rows):
+        row = [course_types[i % len(course_types)], 9.0, '(9.0)'] if i % 4 == 0 else [None, None, None]
+        for j in range(3):
+            row += [f'{22 + (i + j) % 4}/{1 + j % 2}', f'BAGA{49000 + i * 3 + j}',
+                    f'철학과목{i * 3 + j}', 3, ['A+', 'B0', 'C+', 'P'][(i + j) % 4]]
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def pandas_path(content: bytes):
+    return clean_dataframe_v2(pd.read_excel(io.BytesIO(content)))
+
+
+def native_path(content: bytes):
+    return FlexibleCleaner().clean_row_tokens(read_row_tokens(io.BytesIO(content)))
+
+
+def measure(func, content: bytes, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='*')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+
+    samples = [(path, open(path, 'rb').read()) for path in args.files]
+    if not samples:
+        samples = [(f'synthetic({rows}행)', build_sample_workbook(rows)) for rows in (20, 80, 320)]
+
+    print(f"{'file':<30} {'read_excel+v2':>14} {'xlsx_reader':>12} {'speedup':>8}")
+    for name, content in samples:
+        pd.testing.assert_frame_equal(native_path(content), pandas_path(content))
+        baseline = measure(pandas_path, content, args.repeat)
+        native = measure(native_path, content, args.repeat)
+        print(f"{name:<30} {baseline * 1000:>12.1f}ms {native * 1000:>10.1f}ms {baseline / native:>7.1f}x")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
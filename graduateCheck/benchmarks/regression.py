@@ -0,0 +1,151 @@
+"""성능 회귀 검사: 주요 단계의 시간/최대 메모리를 저장된 기준값과 비교
+
+단계 (합성 성적표 benchmarks.transcripts, 과목 160개):
+    clean_dataframe_v2   취득학점확인원을 pd.read_excel로 읽은 DataFrame 정제
+    clean_dataframe      기존 포털 형식 정제
+    analyze              GraduationAnalyzer.analyze (정제 포함, 2022학번)
+    view                 업로드 뷰 전체 (파싱 캐시 없이)
+
+사용법 (graduateCheck 디렉토리에서):
+    python -m benchmarks.regression                 기준값과 비교, 회귀가 있으면 종료 코드 1
+    python -m benchmarks.regression --update        현재 측정값을 기준값으로 저장
+    python -m benchmarks.regression --threshold 0.3 --memory-threshold 0.2
+
+시간은 중앙값이 기준값보다 threshold 비율 넘게, 그리고 --min-ms 넘게 늘었을 때,
+최대 메모리(tracemalloc)는 memory-threshold 비율 넘게 늘었을 때 회귀로 봅니다.
+기준값은 측정한 컴퓨터에 따라 다르므로 같은 환경(예: CI)에서 --update로 다시 만드세요.
+"""
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import statistics
+import tracemalloc
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from benchmarks.bench_pipeline import bench_view  # django.setup()도 여기서 함
+from benchmarks.transcripts import TranscriptSpec, generate_workbook
+from django.test import Client, override_settings
+from myapp.services.cleaner import clean_dataframe
+from myapp.services.cleaner2 import clean_dataframe_v2
+from myapp.services.graduation.graduation_analyzer import GraduationAnalyzer
+from myapp.services.ingestion import read_transcript
+from myapp.services.layout_cache import layout_cache
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+COURSES = 160
+
+
+def _stages() -> Dict[str, Callable[[], object]]:
+    """단계 이름 -> 인자 없이 한 번 실행하는 함수"""
+    credit = generate_workbook(TranscriptSpec(layout='credit_confirmation', courses=COURSES))
+    portal = generate_workbook(TranscriptSpec(layout='portal', courses=COURSES))
+    credit_df = read_transcript(io.BytesIO(credit))
+    portal_df = read_transcript(io.BytesIO(portal))
+    client = Client()
+    spec = TranscriptSpec(courses=COURSES)
+
+    return {
+        'clean_dataframe_v2': lambda: clean_dataframe_v2(credit_df.copy()),
+        'clean_dataframe': lambda: clean_dataframe(portal_df.copy()),
+        'analyze': lambda: GraduationAnalyzer().analyze(credit_df.copy(), 'normal', 2022, 'yes'),
+        # bench_view가 남기는 단계별 측정값은 쓰지 않음 (시간은 measure가 잼)
+        'view': lambda: bench_view(client, spec, credit, defaultdict(list)),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """중앙값(ms)과 한 번 실행할 때의 최대 메모리(KiB)"""
+    func()  # 첫 실행(임포트, 캐시 준비)은 빼고 잼
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'median_ms': round(statistics.median(timings) * 1000, 3), 'peak_kib': round(peak / 1024, 1)}
+
+
+def run(repeat: int) -> Dict[str, Dict[str, float]]:
+    with override_settings(SECRET_KEY='benchmark', ALLOWED_HOSTS=['testserver'],
+                           SECURE_SSL_REDIRECT=False, STAGE_TIMING=False, METRICS_ENABLED=False):
+        return {name: measure(func, repeat) for name, func in _stages().items()}
+
+
+def compare(baseline: Dict[str, Dict[str, float]], current: Dict[str, Dict[str, float]],
+            threshold: float, memory_threshold: float, min_ms: float) -> List[dict]:
+    """단계/지표별 비교 행 (status: ok | regressed | improved | new)"""
+    rows = []
+    for name, values in current.items():
+        base = baseline.get(name)
+        for metric, limit, slack in (('median_ms', threshold, min_ms), ('peak_kib', memory_threshold, 0.0)):
+            now = values[metric]
+            if base is None or metric not in base:
+                rows.append({'stage': name, 'metric': metric, 'baseline': None, 'current': now, 'change': None, 'status': 'new'})
+                continue
+            before = base[metric]
+            change = (now - before) / before if before else 0.0
+            if change > limit and now - before > slack:
+                status = 'regressed'
+            elif change < -limit:
+                status = 'improved'
+            else:
+                status = 'ok'
+            rows.append({'stage': name, 'metric': metric, 'baseline': before, 'current': now, 'change': change, 'status': status})
+    return rows
+
+
+def format_rows(rows: List[dict]) -> str:
+    lines = [f"{'stage':<20} {'metric':<10} {'baseline':>10} {'current':>10} {'change':>8}  status"]
+    for row in rows:
+        baseline = '-' if row['baseline'] is None else f"{row['baseline']:.1f}"
+        change = '-' if row['change'] is None else f"{row['change']:+.0%}"
+        marker = '  <-- 회귀' if row['status'] == 'regressed' else ''
+        lines.append(f"{row['stage']:<20} {row['metric']:<10} {baseline:>10} {row['current']:>10.1f} {change:>8}  {row['status']}{marker}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--update', action='store_true', help='현재 측정값을 기준값으로 저장')
+    parser.add_argument('--threshold', type=float, default=0.25, help='허용하는 시간 증가 비율 (기본 0.25)')
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help='허용하는 최대 메모리 증가 비율 (기본 0.25)')
+    parser.add_argument('--min-ms', type=float, default=1.0, help='이보다 적게 늘어난 시간은 회귀로 보지 않음 (기본 1ms)')
+    parser.add_argument('--repeat', type=int, default=15)
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    layout_cache.path = None
+    current = run(args.repeat)
+
+    if args.update:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    rows = compare(baseline, current, args.threshold, args.memory_threshold, args.min_ms)
+    print(format_rows(rows))
+    regressed = [row for row in rows if row['status'] == 'regressed']
+    if regressed:
+        print(f"\n성능 회귀 {len(regressed)}건 (시간 +{args.threshold:.0%}, 메모리 +{args.memory_threshold:.0%} 초과)")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""합성 성적표 생성기 (벤치마크/부하 측정용)
+
+세 가지 형식의 xlsx를 만듭니다.
+    credit_confirmation  취득학점확인원 (과목구분별 행에 과목 3개씩, xlsx_reader + cleaner2)
+    columns              헤더가 있는 열 형식 (년도/학기/이수구분/과목명/학점/성적, cleaner2 헤더 기반)
+    portal               기존 포털 36열 고정 형식 (기존 cleaner, 취득학점포기 표시 포함)
+
+취득학점확인원과 열 형식에는 취득학점포기 과목이 나오지 않으므로 forfeits는 portal
+형식에만 행으로 들어갑니다. 같은 spec(seed 포함)이면 항상 같은 파일을 만듭니다.
+"""
+import io
+import random
+from dataclasses import dataclass, replace
+from typing import Dict, List
+
+from openpyxl import Workbook
+
+from myapp.config.requirements.base import BaseRequirements
+from myapp.config.requirements.year_2024 import Requirements2024
+from myapp.config.requirements.year_2025 import Requirements2025
+
+LAYOUTS = ('credit_confirmation', 'columns', 'portal')
+PASSING_GRADES = ['A+', 'A0', 'B+', 'B0', 'C+', 'C0', 'D+', 'P']
+FORFEIT_NOTE = '취득학점포기'
+# 기존 포털 형식의 열 위치
+PORTAL_COLUMNS = {'year': 1, 'semester': 3, 'course_type': 8, 'note': 25, 'course_name': 18, 'credits': 31, 'grade': 34}
+PORTAL_WIDTH = 36
+
+
+@dataclass(frozen=True)
+class TranscriptSpec:
+    layout: str = 'credit_confirmation'
+    courses: int = 40       # 이수한 과목 수 (재수강/F/N/포기 포함)
+    retakes: int = 2        # F를 받은 뒤 다시 들은 과목 수
+    failures: int = 2       # 다시 듣지 않은 F/N 과목 수
+    forfeits: int = 1       # 취득학점포기 과목 수 (portal 형식만)
+    noise: float = 0.1      # 과목명 공백/이전 과목명/빈 행/메모가 섞이는 비율
+    start_year: int = 2021
+    seed: int = 0
+
+    def with_layout(self, layout: str) -> 'TranscriptSpec':
+        return replace(self, layout=layout)
+
+
+def _course_pool() -> Dict[str, List[str]]:
+    """과목구분(약칭) -> 실제 요건 과목명 (분석기가 실제로 찾는 과목이 나오도록)"""
+    pool = {'심교': ['철학산책'], '지교': [], '전선': [], '전필': [], '기교': [], '일교': [], '일선': []}
+    for requirements in (Requirements2024, Requirements2025):
+        pool['지교'] += list(requirements.DESIGNATED_REQUIRED)
+        pool['전선'] += list(requirements.MAJOR_REQUIRED)
+        pool['전선'] += list(getattr(requirements, 'MAJOR_ELECTIVE_REQUIRED', []))
+        pool['전선'] += list(getattr(requirements, 'FIELD_TRIP', []))
+    pool['전필'] += ['졸업논문']
+    pool['기교'] += ['글쓰기', '영어', '컴퓨팅적사고']
+    pool['일교'] += ['생활과학', '현대사회와윤리']
+    pool['일선'] += ['경영학원론', '심리학개론']
+    return {course_type: sorted(set(names)) for course_type, names in pool.items()}
+
+
+# 과목구분 비율 (전공 과목이 가장 많음)
+TYPE_WEIGHTS = {'전선': 10, '지교': 4, '기교': 3, '일교': 3, '심교': 2, '일선': 2, '전필': 1}
+# 현재 과목명 -> 이전 과목명 (노이즈로 이전 이름을 섞음)
+OLD_NAMES = {new: old for old, new in BaseRequirements.COURSE_NAME_MAPPING.items()}
+
+
+def generate_courses(spec: TranscriptSpec) -> List[dict]:
+    """성적표에 들어갈 과목 기록 (학기 순서, 포기 과목은 forfeit=True)"""
+    rng = random.Random(spec.seed)
+    pool = _course_pool()
+    types = list(TYPE_WEIGHTS)
+    weights = [TYPE_WEIGHTS[course_type] for course_type in types]
+    semesters = [(spec.start_year + i // 2, 1 + i % 2) for i in range(8)]
+
+    courses = []
+    used = set()
+    for i in range(spec.courses):
+        course_type = rng.choices(types, weights)[0]
+        names = [name for name in pool[course_type] if name not in used]
+        # 요건 과목을 다 쓰면 같은 구분의 다른 과목으로 채움
+        name = rng.choice(names) if names else f'{course_type}과목{i}'
+        used.add(name)
+        year, semester = semesters[i * len(semesters) // max(spec.courses, 1)]
+        courses.append({
+            'year': year, 'semester': semester, 'course_type': course_type, 'course_name': name,
+            'credits': 1 if name.startswith('학술답사') else rng.choice([3, 3, 3, 2]),
+            'grade': rng.choice(PASSING_GRADES), 'forfeit': False,
+        })
+
+    picked = rng.sample(range(len(courses)), min(len(courses), spec.retakes + spec.failures + spec.forfeits))
+    retakes = picked[:spec.retakes]
+    failures = picked[spec.retakes:spec.retakes + spec.failures]
+    forfeits = picked[spec.retakes + spec.failures:]
+    for index in retakes:
+        # 처음엔 F, 다음 학기에 다시 들어 통과
+        first = dict(courses[index], grade='F')
+        courses[index]['year'] += 1
+        courses.append(first)
+    for index in failures:
+        courses[index]['grade'] = rng.choice(['F', 'N'])
+    for index in forfeits:
+        courses[index]['forfeit'] = True
+
+    for course in courses:
+        if rng.random() < spec.noise:
+            old_name = OLD_NAMES.get(course['course_name'])
+            course['course_name'] = old_name or _spaced(course['course_name'])
+    return sorted(courses, key=lambda course: (course['year'], course['semester']))
+
+
+def _spaced(name: str) -> str:
+    """'철학의이해' -> '철학의 이해'처럼 과목명 가운데 공백"""
+    middle = len(name) // 2
+    return f'{name[:middle]} {name[middle:]}' if len(name) > 3 else name
+
+
+def generate_workbook(spec: TranscriptSpec) -> bytes:
+    """spec 형식의 합성 성적표 xlsx 바이트"""
+    if spec.layout not in LAYOUTS:
+        raise ValueError(f"알 수 없는 형식: {spec.layout}")
+    courses = generate_courses(spec)
+    rows = {
+        'credit_confirmation': _credit_confirmation_rows,
+        'columns': _column_rows,
+        'portal': _portal_rows,
+    }[spec.layout](courses, spec, random.Random(spec.seed + 1))
+
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def expected_course_count(spec: TranscriptSpec) -> int:
+    """정제 후 남아야 하는 과목 수 (포기 과목은 portal 형식에서만 행이 있고 정제 때 빠짐)"""
+    return sum(1 for course in generate_courses(spec) if not course['forfeit'])
+
+
+def _header(student_id: str) -> List[list]:
+    return [['학번', student_id, '성명', '홍길동']]
+
+
+def _credit_confirmation_rows(courses, spec, rng) -> List[list]:
+    rows = [['취득학점 확인원']] + _header(f'{spec.start_year}{spec.seed:05d}') + [['구분', '취득학점']]
+    by_type: Dict[str, List[dict]] = {}
+    for course in courses:
+        if not course['forfeit']:
+            by_type.setdefault(course['course_type'], []).append(course)
+
+    for course_type, type_courses in by_type.items():
+        total = float(sum(course['credits'] for course in type_courses if course['grade'] not in ('F', 'N')))
+        for start in range(0, len(type_courses), 3):
+            row = [course_type, total, f'({total})'] if start == 0 else [None, None, None]
+            for offset, course in enumerate(type_courses[start:start + 3]):
+                term = f"{course['year'] % 100:02d}/{course['semester']}"
+                if rng.random() < spec.noise / 2:
+                    term = f'(계){term} 3'
+                row += [term, f'BPHI{20000 + start + offset}', course['course_name'], course['credits'], course['grade']]
+            rows.append(row)
+    return rows
+
+
+def _column_rows(courses, spec, rng) -> List[list]:
+    rows = [['성적 조회']] + _header(f'{spec.start_year}{spec.seed:05d}') + [[]]
+    rows.append(['년도', '학기', '이수구분', '과목명', '학점', '성적', '비고'])
+    for course in courses:
+        if course['forfeit']:
+            continue
+        note = '재수강' if rng.random() < spec.noise else None
+        rows.append([course['year'], f"{course['semester']}학기", course['course_type'],
+                     course['course_name'], course['credits'], course['grade'], note])
+    return rows
+
+
+def _portal_rows(courses, spec, rng) -> List[list]:
+    rows = [['학업성적표'] + [None] * (PORTAL_WIDTH - 1)]
+    rows += [[None, '학번', None, f'{spec.start_year}{spec.seed:05d}'] + [None] * (PORTAL_WIDTH - 4)]
+    # 기존 cleaner는 읽은 DataFrame의 5행부터 데이터 시작 행을 찾음
+    rows += [[None] * PORTAL_WIDTH for _ in range(4)]
+    for course in courses:
+        row = [None] * PORTAL_WIDTH
+        row[PORTAL_COLUMNS['year']] = str(course['year'])
+        row[PORTAL_COLUMNS['semester']] = f"{course['semester']}학기"
+        row[PORTAL_COLUMNS['course_type']] = course['course_type']
+        row[PORTAL_COLUMNS['course_name']] = course['course_name']
+        row[PORTAL_COLUMNS['credits']] = course['credits']
+        row[PORTAL_COLUMNS['grade']] = course['grade']
+        if course['forfeit']:
+            row[PORTAL_COLUMNS['note']] = FORFEIT_NOTE
+        rows.append(row)
+        if rng.random() < spec.noise / 2:
+            # 학기 사이 빈 행
+            rows.append([None] * PORTAL_WIDTH)
+    return rows
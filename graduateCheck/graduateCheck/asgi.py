@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "graduateCheck.settings")
+# ASGI 서버에서는 업로드 분석을 분석 풀로 넘기는 비동기 뷰를 사용
+os.environ.setdefault("ASYNC_UPLOAD_VIEW", "True")
 
 application = get_asgi_application()
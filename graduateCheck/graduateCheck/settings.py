@@ -33,11 +33,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "myapp.middleware.StageTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "myapp.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -118,6 +120,65 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# 업로드를 받는 동안 sha256을 계산해 파싱 캐시 키로 사용
+FILE_UPLOAD_HANDLERS = [
+    'myapp.services.parse_cache.HashingMemoryFileUploadHandler',
+    'myapp.services.parse_cache.HashingTemporaryFileUploadHandler',
+]
+
+# 업로드 성적표 제한 (파싱 전 zip 디렉토리/dimension 확인, 읽는 동안 행/열 수 확인)
+UPLOAD_LIMITS = {
+    'max_upload_bytes': 10 * 1024 * 1024,          # 업로드 파일 크기
+    'max_part_bytes': 50 * 1024 * 1024,            # xlsx(zip) 안 파일 하나의 압축 해제 크기
+    'max_uncompressed_bytes': 100 * 1024 * 1024,   # xlsx 전체 압축 해제 크기
+    'max_compression_ratio': 100,                  # 1MB 넘는 부분 파일의 압축률 상한
+    'max_rows': 5000,                              # 시트 행 수
+    'max_columns': 200,                            # 시트 열 수
+}
+
+# 파싱 캐시 (같은 성적표 재업로드 시 정제 결과 재사용)
+PARSE_CACHE_MAX_ENTRIES = 128
+PARSE_CACHE_TTL = 1800  # 30분
+# 워커 메모리에 없으면 찾는 공유 캐시 (재분석 토큰이 다른 gunicorn 워커로 가도 찾을 수 있도록)
+PARSE_CACHE_SHARED = 'transcripts'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'transcripts': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(BASE_DIR, 'cache', 'transcripts'),
+        'TIMEOUT': PARSE_CACHE_TTL,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# 엑셀 레이아웃 지문 -> 구조 감지 결과 (워커 재시작 후에도 유지)
+LAYOUT_FINGERPRINT_FILE = os.path.join(BASE_DIR, 'cache', 'layout_fingerprints.json')
+
+# 비동기 업로드 뷰 (asgi.py로 실행하면 기본으로 사용)
+ASYNC_UPLOAD_VIEW = os.getenv("ASYNC_UPLOAD_VIEW", "False") == "True"
+# 비동기 뷰의 분석 풀: 동시 분석 수, 대기열 길이, 포화 시 Retry-After(초)
+ANALYSIS_POOL_WORKERS = int(os.getenv("ANALYSIS_POOL_WORKERS", "4"))
+ANALYSIS_POOL_QUEUE = int(os.getenv("ANALYSIS_POOL_QUEUE", "8"))
+ANALYSIS_POOL_RETRY_AFTER = 5
+
+# 단계별 소요 시간 측정 (Server-Timing 헤더, stage_timing 로그, 최근 요청 히스토그램)
+STAGE_TIMING = os.getenv("STAGE_TIMING", "False") == "True"
+STAGE_TIMING_WINDOW = 1024  # 단계별로 남기는 최근 측정 수
+
+# /metrics (Prometheus 텍스트 형식). 워커별 지표를 SQLite 파일 하나에 모아 합산
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False") == "True"
+METRICS_DB = os.path.join(BASE_DIR, 'cache', 'metrics.sqlite3')
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
+# 직원용 요청 프로파일링 (?profile=<토큰> 또는 X-Profile 헤더, logs/profiles에 저장)
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILING_DIR = os.path.join(BASE_DIR, 'logs', 'profiles')
+PROFILING_TOP = 25  # 요약에 넣는 myapp.services 함수 수
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -130,6 +191,11 @@ LOGS_DIR = os.path.join(BASE_DIR, 'logs')
 if not os.path.exists(LOGS_DIR):
     os.makedirs(LOGS_DIR)
 
+# myapp 로거 레벨 (DEBUG면 과목별 확인 목록까지 남김)
+MYAPP_LOG_LEVEL = os.getenv("MYAPP_LOG_LEVEL", "INFO")
+# 로그 파일/콘솔 쓰기를 백그라운드 스레드(QueueListener)에서 처리
+LOG_QUEUE = os.getenv("LOG_QUEUE", "True") == "True"
+
 # 기본 로깅 설정 (static dictionary)
 LOGGING = {
     'version': 1,
@@ -172,7 +238,7 @@ LOGGING = {
         },
         'myapp': {
             'handlers': ['log_file', 'console'],
-            'level': 'DEBUG',
+            'level': MYAPP_LOG_LEVEL,
             'propagate': False,
         },
     },
@@ -180,6 +246,8 @@ LOGGING = {
 
 #SSL
 SECURE_SSL_REDIRECT = True
+# 로컬 수집기는 http로 /metrics를 읽음
+SECURE_REDIRECT_EXEMPT = [r'^metrics$']
 
 # HSTS
 SECURE_HSTS_SECONDS = 31536000  # 1년
@@ -20,13 +20,24 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
-from myapp.views.graduation_check import analyze_graduation
+from myapp.views.graduation_check import analyze_graduation, analyze_graduation_async, reanalyze_graduation
 from myapp.views.file_management import cleanup_files
+from myapp.views.metrics import metrics_view
+from myapp.views.analysis_jobs import submit_analysis_jobs, analysis_job_status, analysis_job_result
+
+# ASGI로 실행하면 파싱/분석을 분석 풀에 넘기는 비동기 뷰 사용
+upload_view = analyze_graduation_async if settings.ASYNC_UPLOAD_VIEW else analyze_graduation
 
 urlpatterns = [
     # path('admin/', admin.site.urls),
-    path('', analyze_graduation, name='index'),
-    path('analyze/', analyze_graduation, name='analyze'),
+    path('', upload_view, name='index'),
+    path('analyze/', upload_view, name='analyze'),
+    path('analyze/async/', analyze_graduation_async, name='analyze_async'),
+    path('reanalyze/', reanalyze_graduation, name='reanalyze'),
+    path('jobs/', submit_analysis_jobs, name='analysis_jobs'),
+    path('jobs/<uuid:job_id>/', analysis_job_status, name='analysis_job_status'),
+    path('jobs/<uuid:job_id>/result/', analysis_job_result, name='analysis_job_result'),
     path('cleanup/', cleanup_files, name='cleanup'),
+    path('metrics', metrics_view, name='metrics'),
     path('robots.txt', TemplateView.as_view(template_name='robots.txt', content_type='text/plain')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
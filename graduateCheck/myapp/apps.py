@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class MyappConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "myapp"
+
+    def ready(self):
+        # 로그 파일/콘솔 쓰기를 요청 스레드에서 백그라운드 리스너로 옮김
+        if getattr(settings, 'LOG_QUEUE', False):
+            from myapp.services.log_queue import install_queue_logging
+            install_queue_logging(('myapp', 'django', 'django.request'))
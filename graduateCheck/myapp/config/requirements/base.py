@@ -18,6 +18,14 @@ class BaseRequirements:
     # 인턴십 필수 여부
     INTERNSHIP_REQUIRED = False
     
+    # 과목명 매핑 (이전 과목명 -> 현재 과목명)
+    COURSE_NAME_MAPPING = {
+        '철학의이해': '철학산책',
+        '서양고대철학': '서양고중세철학',
+        '현대철학': '서양현대철학',
+        '유가철학': '중국유학'
+    }
+    
     @classmethod
     def get_requirements(cls, student_type: str) -> dict:
         """
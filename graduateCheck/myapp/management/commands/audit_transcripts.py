@@ -0,0 +1,152 @@
+import io
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, NamedTuple, Optional
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from myapp.services.ingestion import load_transcript, student_id_from_filename
+from myapp.services.result_json import dumps_result
+from myapp.services.graduation.graduation_analyzer import CohortStudent, GraduationAnalyzer
+
+class AuditTask(NamedTuple):
+    """워커에 넘기는 성적표 한 개 (zip 안의 파일이면 member가 있음)"""
+    label: str
+    path: str
+    member: Optional[str]
+    student_id: Optional[str]
+    admission_year: Optional[int]
+    student_type: str
+    internship_completed: str
+
+
+_analyzer = None
+
+
+def _init_worker():
+    """spawn 방식 워커에서도 Django 설정과 앱을 불러옴"""
+    django.setup()
+
+
+def _get_analyzer() -> GraduationAnalyzer:
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = GraduationAnalyzer()
+    return _analyzer
+
+
+def _load(task: AuditTask):
+    if task.member is None:
+        return load_transcript(task.path)
+    with zipfile.ZipFile(task.path) as archive:
+        return load_transcript(io.BytesIO(archive.read(task.member)))
+
+
+def audit_chunk(tasks: List[AuditTask]) -> List[dict]:
+    """성적표 묶음을 읽고 analyze_batch로 분석해 학생별 출력 레코드를 반환"""
+    records = {}
+    students = []
+    for task in tasks:
+        record = {
+            'file': task.label,
+            'student_id': task.student_id,
+            'student_type': task.student_type,
+            'admission_year': task.admission_year,
+        }
+        records[task.label] = record
+        if task.admission_year is None:
+            record['error'] = '파일명에서 학번을 찾을 수 없습니다. --admission-year를 지정해주세요.'
+            continue
+        try:
+            df = _load(task)
+        except Exception as e:
+            record['error'] = f"성적표 읽기 실패: {str(e)}"
+            continue
+        students.append(CohortStudent(task.label, df, task.student_type,
+                                      task.admission_year, task.internship_completed))
+
+    if students:
+        for label, result in _get_analyzer().analyze_batch(students).items():
+            records[label]['result'] = result
+    return [records[task.label] for task in tasks]
+
+
+class Command(BaseCommand):
+    help = '성적표 폴더(또는 zip)를 여러 프로세스로 일괄 분석해 학생별 JSON 한 줄씩 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='성적표(.xlsx)가 있는 폴더 또는 zip 파일')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='워커 프로세스 수 (0이면 현재 프로세스에서 실행)')
+        parser.add_argument('--chunk-size', type=int, default=8,
+                            help='워커에 한 번에 넘기는 성적표 수')
+        parser.add_argument('--output', help='결과를 쓸 파일 (기본: 표준 출력)')
+        parser.add_argument('--student-type', default='normal',
+                            choices=['normal', 'transfer', 'double', 'minor'])
+        parser.add_argument('--admission-year', type=int,
+                            help='파일명에 학번이 없을 때 사용할 입학년도')
+        parser.add_argument('--internship-completed', default='no', choices=['yes', 'no'])
+
+    def handle(self, *args, **options):
+        if options['workers'] < 0 or options['chunk_size'] < 1:
+            raise CommandError('--workers는 0 이상, --chunk-size는 1 이상이어야 합니다.')
+
+        tasks = self._collect_tasks(options)
+        if not tasks:
+            raise CommandError(f"성적표(.xlsx)를 찾을 수 없습니다: {options['source']}")
+        chunk_size = options['chunk_size']
+        chunks = [tasks[i:i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+
+        output = open(options['output'], 'w', encoding='utf-8') if options['output'] else self.stdout
+        count = errors = 0
+        try:
+            for records in self._run(chunks, options['workers']):
+                for record in records:
+                    output.write(dumps_result(record) + '\n')
+                    count += 1
+                    errors += 'error' in record or 'error' in record.get('result', {})
+                output.flush()
+        finally:
+            if output is not self.stdout:
+                output.close()
+        self.stderr.write(f"{count}명 분석 완료 (오류 {errors}건)")
+
+    def _run(self, chunks, workers):
+        """묶음이 끝나는 순서대로 결과를 흘려보냄"""
+        if workers == 0:
+            for chunk in chunks:
+                yield audit_chunk(chunk)
+            return
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(audit_chunk, chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def _collect_tasks(self, options) -> List[AuditTask]:
+        source = options['source']
+        if os.path.isdir(source):
+            entries = [
+                (os.path.relpath(os.path.join(root, name), source), os.path.join(root, name), None)
+                for root, _, files in os.walk(source)
+                for name in files
+            ]
+        elif zipfile.is_zipfile(source):
+            with zipfile.ZipFile(source) as archive:
+                entries = [(info.filename, source, info.filename)
+                           for info in archive.infolist() if not info.is_dir()]
+        else:
+            raise CommandError(f"폴더나 zip 파일이 아닙니다: {source}")
+
+        tasks = []
+        for label, path, member in sorted(entries):
+            name = os.path.basename(label)
+            # 엑셀 임시 파일(~$...)은 건너뜀
+            if not name.lower().endswith('.xlsx') or name.startswith('~$'):
+                continue
+            student_id = student_id_from_filename(name)
+            # 학번 앞 4자리가 입학년도 (예: 201110207 -> 2011)
+            admission_year = int(student_id[:4]) if student_id else options['admission_year']
+            tasks.append(AuditTask(label, path, member, student_id, admission_year,
+                                   options['student_type'], options['internship_completed']))
+        return tasks
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from myapp.services.jobs import requeue_stale_jobs, run_worker
+
+
+class Command(BaseCommand):
+    help = 'DB에 쌓인 분석 작업(AnalysisJob)을 처리하는 로컬 워커를 실행합니다 (별도 브로커 불필요).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=1, help='작업 스레드 수')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='대기 작업이 없을 때 다시 확인하기까지의 시간(초)')
+        parser.add_argument('--once', action='store_true', help='대기 중인 작업을 모두 처리하면 종료')
+        parser.add_argument('--requeue-after', type=int, default=600,
+                            help='이 시간(초)보다 오래 분석 중으로 남은 작업을 다시 대기로 돌림')
+
+    def handle(self, *args, **options):
+        if options['threads'] < 1:
+            raise CommandError('--threads는 1 이상이어야 합니다.')
+
+        requeued = requeue_stale_jobs(timedelta(seconds=options['requeue_after']))
+        if requeued:
+            self.stderr.write(f"멈춘 작업 {requeued}개를 다시 대기열에 넣었습니다.")
+
+        self.stderr.write(f"분석 워커 시작 (스레드 {options['threads']}개)")
+        run_worker(threads=options['threads'], poll_interval=options['poll_interval'], once=options['once'])
@@ -0,0 +1,126 @@
+import hmac
+import json
+import logging
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.urls import Resolver404, resolve
+from myapp.services.metrics import metrics
+from myapp.services.profiling import profile_call, save_profile
+from myapp.services.timing import stage_histograms, start_timer, stop_timer
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimingMiddleware:
+    """요청마다 단계별 소요 시간을 재서 Server-Timing 헤더, 로그, 히스토그램에 남김
+
+    settings.METRICS_ENABLED면 단계 시간을 지표(myapp_stage_seconds)로도 남기고 요청이
+    끝날 때 공유 지표 저장소로 내보냅니다. STAGE_TIMING과 METRICS_ENABLED가 모두
+    꺼져 있으면 미들웨어 체인에서 빠지므로 비용이 없습니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.timing = getattr(settings, 'STAGE_TIMING', False)
+        self.metrics = getattr(settings, 'METRICS_ENABLED', False)
+        if not (self.timing or self.metrics):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer, token = start_timer()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_timer(token)
+        return self._finish(request, response, timer)
+
+    async def __acall__(self, request):
+        timer, token = start_timer()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_timer(token)
+        return self._finish(request, response, timer)
+
+    def _finish(self, request, response, timer):
+        if self.metrics:
+            for name, seconds in timer.seconds().items():
+                metrics.observe('myapp_stage_seconds', seconds, stage=name)
+            # 아무 지표도 남기지 않은 요청(정적 페이지 등)은 저장소에 쓰지 않음
+            if metrics.has_pending():
+                metrics.flush()
+        if not self.timing:
+            return response
+
+        total_ms = round(timer.elapsed() * 1000, 1)
+        stages = timer.milliseconds()
+        response['Server-Timing'] = timer.server_timing(total_ms)
+        stage_histograms.record({**stages, 'total': total_ms})
+        logger.info('stage_timing ' + json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': total_ms,
+            'stages': stages,
+        }, ensure_ascii=False))
+        return response
+
+
+class ProfilingMiddleware:
+    """직원이 요청한 분석 요청 하나를 cProfile로 실행해 logs/profiles에 저장
+
+    분석 뷰(PROFILED_VIEWS) 요청에 ?profile=<값> 또는 X-Profile: <값> 헤더가 있고,
+    로그인한 직원(is_staff)이거나 값이 settings.PROFILING_TOKEN과 같을 때만 동작합니다.
+    .prof 파일과 myapp/services 함수의 누적 시간 요약(.txt)을 남기고 응답의
+    X-Profile-Id 헤더로 파일 이름을 알려줍니다. 분석 풀에서 실행되는 비동기 뷰는
+    요청 스레드 밖에서 분석하므로 대상에서 뺐습니다 (같은 파일을 동기 뷰로 보내면 됨).
+    settings.PROFILING_ENABLED가 꺼져 있으면 미들웨어 체인에서 빠집니다.
+    """
+
+    PROFILED_VIEWS = ('index', 'analyze', 'reanalyze')
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.token = getattr(settings, 'PROFILING_TOKEN', '')
+        self.directory = settings.PROFILING_DIR
+        self.limit = getattr(settings, 'PROFILING_TOP', 25)
+
+    def __call__(self, request):
+        view_name = self._requested_view(request)
+        if view_name is None:
+            return self.get_response(request)
+
+        response, profiler = profile_call(lambda: self.get_response(request))
+        name = save_profile(profiler, self.directory, view_name, self.limit)
+        logger.info("요청 프로파일 저장: %s (%s %s)", name, request.method, request.path)
+        response['X-Profile-Id'] = name
+        return response
+
+    def _requested_view(self, request):
+        """프로파일할 요청이면 뷰 이름, 아니면 None"""
+        flag = request.GET.get('profile') or request.headers.get('X-Profile')
+        if not flag or not self._allowed(request, flag):
+            return None
+        try:
+            view_name = resolve(request.path_info).url_name
+        except Resolver404:
+            return None
+        return view_name if view_name in self.PROFILED_VIEWS else None
+
+    def _allowed(self, request, flag):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_staff:
+            return True
+        # str끼리 비교하면 ASCII가 아닌 값(?profile=한)에서 TypeError가 나므로 바이트로 비교
+        return bool(self.token) and hmac.compare_digest(flag.encode(), self.token.encode())
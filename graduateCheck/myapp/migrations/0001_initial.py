@@ -0,0 +1,36 @@
+# Generated by Django 5.1.2 on 2026-10-17 17:35
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalysisJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '분석 중'), ('done', '완료'), ('failed', '실패')], db_index=True, default='queued', max_length=16)),
+                ('filename', models.CharField(max_length=255)),
+                ('payload', models.BinaryField(null=True)),
+                ('student_id', models.CharField(max_length=16)),
+                ('student_type', models.CharField(default='normal', max_length=16)),
+                ('admission_year', models.IntegerField()),
+                ('internship_completed', models.CharField(default='no', max_length=8)),
+                ('result_json', models.TextField(blank=True)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(null=True)),
+                ('finished_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,3 @@
+from .analysis_job import AnalysisJob
+
+__all__ = ['AnalysisJob']
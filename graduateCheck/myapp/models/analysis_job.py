@@ -0,0 +1,47 @@
+import json
+import uuid
+from django.db import models
+from myapp.services.result_json import dumps_result
+
+
+class AnalysisJob(models.Model):
+    """업로드 하나의 졸업요건 분석 작업 (run_analysis_worker가 처리)
+
+    성적표 바이트는 처리할 때까지 DB에 보관하고, 끝나면 비우고 결과 JSON만 남깁니다.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', '대기'
+        RUNNING = 'running', '분석 중'
+        DONE = 'done', '완료'
+        FAILED = 'failed', '실패'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED, db_index=True)
+    filename = models.CharField(max_length=255)
+    payload = models.BinaryField(null=True)
+    student_id = models.CharField(max_length=16)
+    student_type = models.CharField(max_length=16, default='normal')
+    admission_year = models.IntegerField()
+    internship_completed = models.CharField(max_length=8, default='no')
+    # numpy 값과 NaN이 섞일 수 있어 JSONField 대신 텍스트로 저장
+    result_json = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        ordering = ['created_at']
+
+    @property
+    def result(self):
+        return json.loads(self.result_json) if self.result_json else None
+
+    @result.setter
+    def result(self, value):
+        self.result_json = dumps_result(value)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (self.Status.DONE, self.Status.FAILED)
@@ -1,56 +1,164 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+import logging
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Any, Tuple
 from ..config.requirements.year_2024 import Requirements2024
 from ..config.requirements.year_2025 import Requirements2025
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+REQUIREMENT_CLASSES = {
+    2024: Requirements2024,
+    2025: Requirements2025
+}
+
+# 성적표에서 학점을 찾지 못한 요건 과목의 기본 학점
+DEFAULT_COURSE_CREDIT = 3
+# 학술답사 과목은 성적표와 상관없이 1학점
+FIELD_TRIP_CREDIT = 1
+
+@dataclass(frozen=True)
 class YearRequirement:
+    """입학년도/학생 유형별 졸업요건
+
+    RequirementPlan과 함께 프로세스 전체에서 공유하므로 과목 목록은 튜플, 공통 필수는
+    읽기 전용 매핑으로 둡니다 (순서는 결과 표시 순서라 집합을 쓰지 않음).
+    """
     year: int
-    common_required: Dict[str, List[str]]
-    designated_required: List[str]  # 지교(전공인정) 필수 과목
-    major_required: List[str]
-    major_elective_required: List[str]
+    common_required: Mapping[str, Any]      # 카테고리 -> 과목명 튜플 또는 학점 수
+    designated_required: Tuple[str, ...]    # 지교(전공인정) 필수 과목
+    major_required: Tuple[str, ...]
+    major_elective_required: Tuple[str, ...]
     major_elective_min: int
-    major_base: List[str]          # 전공 기초 과목
-    major_base_min: int            # 전공 기초 과목 최소 이수 수
+    major_base: Tuple[str, ...]             # 전공 기초 과목
+    major_base_min: int                     # 전공 기초 과목 최소 이수 수
     total_credits: int
     internship_required: bool = False
-    field_trip: List[str] = None
+    field_trip: Tuple[str, ...] = ()
     field_trip_min: int = 0
 
+@dataclass(frozen=True)
+class RequirementPlan:
+    """(입학년도, 학생 유형)별로 한 번만 만드는 졸업요건 실행 계획
+
+    요청마다 다시 계산하던 과목명 집합, 이전/현재 과목명 동의어, 표시용 과목명, 기본
+    학점을 미리 계산해 둡니다. 프로세스 전체에서 공유하므로 수정하지 않습니다.
+    """
+    requirement: YearRequirement
+    course_names: FrozenSet[str]                # 요건에 나오는 모든 과목명
+    synonyms: Mapping[str, Tuple[str, ...]]     # 과목명 -> 같은 과목의 이전/현재 과목명
+    display_names: Mapping[str, str]            # 과목명 -> "현재 과목명(전 이전 과목명)"
+    fixed_credits: Mapping[str, int]            # 성적표와 상관없이 학점이 정해진 과목
+
+    def display_name(self, course_name: str) -> str:
+        return self.display_names.get(course_name, course_name)
+
+    def course_credit(self, course_name: str, taken_credits: Mapping[str, Any]):
+        """요건 과목의 학점 (고정 학점 -> 성적표 학점 -> 기본 학점 순)"""
+        fixed = self.fixed_credits.get(course_name)
+        if fixed is None and course_name not in self.course_names:
+            fixed = _fixed_credit(course_name)
+        if fixed is not None:
+            return fixed
+        return taken_credits.get(course_name, DEFAULT_COURSE_CREDIT)
+
+def _fixed_credit(course_name: str) -> Optional[int]:
+    return FIELD_TRIP_CREDIT if '학술답사' in course_name else None
+
+def _requirement_course_names(requirement: YearRequirement) -> List[str]:
+    names = []
+    for courses in requirement.common_required.values():
+        if isinstance(courses, (list, tuple)):
+            names.extend(courses)
+    for courses in (requirement.designated_required, requirement.major_required,
+                    requirement.major_elective_required, requirement.major_base,
+                    requirement.field_trip or []):
+        names.extend(courses)
+    return names
+
+def _warn_unresolvable(requirement: YearRequirement, student_type: str, course_names, mapping: Mapping[str, str]):
+    """성적표 정규화(공백 제거, 과목명 매핑) 후에는 찾을 수 없는 요건 과목을 경고"""
+    field_trip = set(requirement.field_trip or [])
+    for name in sorted(course_names):
+        if name != name.replace(' ', ''):
+            logger.warning("%s/%s 요건 과목 '%s'에 공백이 있어 성적표 과목명과 일치할 수 없습니다",
+                           requirement.year, student_type, name)
+        elif name in mapping and name not in field_trip:
+            logger.warning("%s/%s 요건 과목 '%s'은 이전 과목명입니다 (성적표에서는 '%s'로 바뀜)",
+                           requirement.year, student_type, name, mapping[name])
+
+def _build_plan(requirement: YearRequirement, student_type: str, mapping: Mapping[str, str]) -> RequirementPlan:
+    course_names = frozenset(_requirement_course_names(requirement))
+    _warn_unresolvable(requirement, student_type, course_names, mapping)
+
+    synonyms: Dict[str, List[str]] = {}
+    display_names: Dict[str, str] = {}
+    for old_name, new_name in mapping.items():
+        synonyms.setdefault(old_name, []).append(new_name)
+        synonyms.setdefault(new_name, []).append(old_name)
+        display_names.setdefault(old_name, f"{new_name}(전 {old_name})")
+        display_names.setdefault(new_name, f"{new_name}(전 {old_name})")
+
+    fixed_credits = {}
+    for name in course_names:
+        credit = _fixed_credit(name)
+        if credit is not None:
+            fixed_credits[name] = credit
+
+    return RequirementPlan(
+        requirement=requirement,
+        course_names=course_names,
+        synonyms=MappingProxyType({name: tuple(names) for name, names in synonyms.items()}),
+        display_names=MappingProxyType(display_names),
+        fixed_credits=MappingProxyType(fixed_credits),
+    )
+
+@lru_cache(maxsize=256)
+def compile_requirement_plan(admission_year: int, student_type: str) -> Optional[RequirementPlan]:
+    """설정 클래스의 요건을 병합해 RequirementPlan으로 만듭니다 (프로세스 전체 캐시)"""
+    try:
+        # 2025년 이후 입학생은 2025년 요건 적용, 2024년 이전 입학생은 2024년 요건 적용
+        requirement_class = REQUIREMENT_CLASSES[2025 if admission_year >= 2025 else 2024]
+        cfg = requirement_class.get_requirements(student_type)
+
+        known = {field.name for field in fields(YearRequirement)}
+        unknown = sorted(set(cfg) - known)
+        if unknown:
+            logger.warning("%s/%s 요건의 알 수 없는 항목은 무시됩니다: %s", admission_year, student_type, unknown)
+
+        # YearRequirement dataclass로 매핑 (설정 클래스의 리스트를 공유하지 않고 수정할 수 없도록 튜플로)
+        requirement = YearRequirement(
+            year=admission_year,
+            common_required=MappingProxyType({
+                category: tuple(courses) if isinstance(courses, list) else courses
+                for category, courses in cfg['common_required'].items()
+            }),
+            designated_required=tuple(cfg.get('designated_required', [])),
+            major_required=tuple(cfg.get('major_required', [])),
+            major_elective_required=tuple(cfg.get('major_elective_required', [])),
+            major_elective_min=cfg.get('major_elective_min', 0),
+            major_base=tuple(cfg.get('major_base', [])),
+            major_base_min=cfg.get('major_base_min', 0),
+            total_credits=cfg['total_credits'],
+            internship_required=cfg.get('internship_required', False),
+            field_trip=tuple(cfg.get('field_trip', [])),
+            field_trip_min=cfg.get('field_trip_min', 0)
+        )
+    except KeyError:
+        return None  # 해당 연도/유형 요건이 없으면 None 반환
+
+    return _build_plan(requirement, student_type, requirement_class.COURSE_NAME_MAPPING)
+
 class GraduationRequirementManager:
     def __init__(self):
-        self.requirements = {
-            2024: Requirements2024,
-            2025: Requirements2025
-        }
+        self.requirements = REQUIREMENT_CLASSES
+
+    def get_plan(self, admission_year: int, student_type: str) -> Optional[RequirementPlan]:
+        """입학년도와 학생 유형에 따른 컴파일된 졸업요건 (처음 한 번만 컴파일)"""
+        return compile_requirement_plan(admission_year, student_type)
 
     def get_requirement(self, admission_year: int, student_type: str):
         """입학년도와 학생 유형에 따른 졸업요건을 반환"""
-        try:
-            # 2025년 이후 입학생은 2025년 요건 적용
-            if admission_year >= 2025:
-                requirement_class = self.requirements[2025]
-            # 2024년 이전 입학생은 2024년 요건 적용
-            else:
-                requirement_class = self.requirements[2024]
-
-            cfg = requirement_class.get_requirements(student_type)
-            # YearRequirement dataclass로 매핑하여 반환
-            return YearRequirement(
-                year=admission_year,
-                common_required=cfg['common_required'],
-                designated_required=cfg.get('designated_required', []),
-                major_required=cfg.get('major_required', []),
-                major_elective_required=cfg.get('major_elective_required', []),
-                major_elective_min=cfg.get('major_elective_min', 0),
-                major_base=cfg.get('major_base', []),
-                major_base_min=cfg.get('major_base_min', 0),
-                total_credits=cfg['total_credits'],
-                internship_required=cfg.get('internship_required', False),
-                field_trip=cfg.get('field_trip', []),
-                field_trip_min=cfg.get('field_trip_min', 0)
-            )
-
-        except KeyError:
-            return None  # 해당 연도/유형 요건이 없으면 None 반환
\ No newline at end of file
+        plan = self.get_plan(admission_year, student_type)
+        return plan.requirement if plan else None
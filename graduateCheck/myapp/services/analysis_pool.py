@@ -0,0 +1,80 @@
+import asyncio
+import contextvars
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PoolBusy(Exception):
+    """실행 중인 분석과 대기열이 모두 차서 새 분석을 받을 수 없음"""
+
+
+class AnalysisPool:
+    """업로드 파싱/분석을 요청 처리 흐름 밖에서 실행하는 제한된 스레드 풀
+
+    동시에 max_workers개까지 실행하고 max_queue개까지 기다리게 하며, 그 이상은 바로
+    PoolBusy를 일으켜 요청이 쌓이지 않게 합니다. 파싱 캐시와 레이아웃 캐시를 함께
+    쓰도록 프로세스가 아닌 스레드 풀을 사용합니다.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 8):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                thread_name_prefix='analysis')
+        return self._executor
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                logger.warning("분석 풀 포화로 요청 거절 - %s", self._stats())
+                raise PoolBusy()
+            self._in_flight += 1
+            executor = self._get_executor()
+        try:
+            # 요청의 단계별 타이머 등 컨텍스트 변수를 풀 스레드에서도 보이게 함
+            future = executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    async def run(self, fn, *args, **kwargs):
+        """fn을 풀에서 실행하고 결과를 기다립니다 (포화 상태면 바로 PoolBusy)"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _stats(self) -> Dict[str, int]:
+        return {
+            'workers': self.max_workers,
+            'queue': self.max_queue,
+            'in_flight': self._in_flight,
+            'rejected': self.rejected,
+        }
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return self._stats()
+
+
+analysis_pool = AnalysisPool(
+    max_workers=getattr(settings, 'ANALYSIS_POOL_WORKERS', 4),
+    max_queue=getattr(settings, 'ANALYSIS_POOL_QUEUE', 8),
+)
@@ -1,75 +1,107 @@
+import numpy as np
 import pandas as pd
 import logging
+from typing import Tuple
 
 logger = logging.getLogger(__name__)
 
+# 과목구분 값 (기존 포털 고정 열 형식)
+COURSE_TYPES = ['전선', '전필', '기교', '지교', '지필', '다선', '다필', '다지', '핵교', '일교', '일선', '심교']
+GRADES = ['A+', 'A', 'B+', 'B', 'C+', 'C', 'D+', 'D', 'F', 'P']
+# 정제할 수 있는 최소 열 수 (성적 후보 열 33~35 중 첫 열까지 있어야 함)
+MIN_COLUMNS = 34
+
 def find_data_start_row(df: pd.DataFrame):
     """실제 데이터가 시작되는 행을 찾습니다."""
-    for idx, row in df.iterrows():
-        row_text = ''.join(str(cell) for cell in row if pd.notnull(cell))
-        if ('이수구분' in row_text or '과목구분' in row_text) and ('과목' in row_text or '교과목' in row_text):
-            return idx
-    raise ValueError("성적표 헤더를 찾을 수 없습니다.")
+    # null이 아닌 셀을 이어붙인 행 문자열 (셀 경계를 넘는 키워드도 찾도록 구분자 없이)
+    row_text = df.astype(str).where(df.notna(), '').sum(axis=1).astype(str)
+    has_type = row_text.str.contains('이수구분', regex=False) | row_text.str.contains('과목구분', regex=False)
+    has_course = row_text.str.contains('과목', regex=False) | row_text.str.contains('교과목', regex=False)
+    hits = has_type & has_course
+    if not hits.any():
+        raise ValueError("성적표 헤더를 찾을 수 없습니다.")
+    return hits.idxmax()
+
+def _find_start_row(df: pd.DataFrame):
+    """5~19행 중 연도(숫자)와 학기가 있는 첫 행 (없으면 10)"""
+    head = df.iloc[5:20]
+    is_year = head.iloc[:, 1].notna() & head.iloc[:, 1].astype(str).str.isdigit()
+    hits = np.flatnonzero(is_year & head.iloc[:, 3].astype(str).str.contains('학기', regex=False))
+    if len(hits):
+        return 5 + int(hits[0])
+    if len(df) < 20:
+        # 기존 구현은 행을 하나씩 읽다가 범위를 벗어나 실패했음
+        raise IndexError("single positional indexer is out-of-bounds")
+    return 10
+
+def _find_columns(df: pd.DataFrame, start_row: int):
+    """고정 열 위치에서 값 패턴을 확인하고, 찾지 못한 컬럼은 기본 위치를 사용"""
+    # 데이터 시작부터 10행을 한 번만 문자열로 바꿔 모든 열을 함께 판별
+    window = df.iloc[start_row:start_row+10].to_numpy(dtype=object).astype(str)
+    is_digit = np.char.isdigit(window)
+    checks = {
+        'year': (range(1, 2), is_digit),
+        'semester': (range(3, 4), np.char.find(window, '학기') >= 0),
+        'course_type': (range(8, 9), np.isin(window, COURSE_TYPES)),
+        'course_name': (range(17, 20), np.char.str_len(window) > 3),
+        'credits': (range(30, 33), is_digit | np.char.isdigit(np.char.replace(window, '.', ''))),
+        'grade': (range(33, 36), np.isin(window, GRADES)),
+    }
+    defaults = {'year': 1, 'semester': 3, 'course_type': 8, 'course_name': 18, 'credits': 31, 'grade': 34}
+
+    columns_data = {}
+    for col_name, (candidates, mask) in checks.items():
+        hits = [col_idx for col_idx in candidates if col_idx < window.shape[1] and mask[:, col_idx].any()]
+        # 범위 안에서 여러 열이 맞으면 마지막 열 사용
+        columns_data[col_name] = hits[-1] if hits else defaults[col_name]
+    return columns_data
+
+def _find_forfeit_column(rows: pd.DataFrame):
+    """'취득학점포기'가 들어있는 첫 번째 열 (문자열이 있을 수 있는 열만 확인)"""
+    candidates = [col_idx for col_idx in range(rows.shape[1]) if not pd.api.types.is_numeric_dtype(rows.iloc[:, col_idx])]
+    if not candidates or rows.empty:
+        return None
+    values = rows.iloc[:, candidates].to_numpy(dtype=object)
+    # 서로 다른 셀 값은 몇 개 되지 않으므로 고유값 단위로 검사
+    codes, uniques = pd.factorize(values.ravel())
+    is_forfeit = np.fromiter(('취득학점포기' in str(value) for value in uniques), dtype=bool, count=len(uniques))
+    hits = (codes >= 0) & is_forfeit[codes]
+    hit_cols = np.flatnonzero(hits.reshape(values.shape).any(axis=0))
+    return candidates[hit_cols[0]] if len(hit_cols) else None
+
+def sniff_dataframe(df: pd.DataFrame) -> Tuple[bool, str]:
+    """앞쪽 행만 보고 이 cleaner의 고정 열 형식인지 판단합니다 (처리 가능 여부, 이유)"""
+    if df.shape[1] < MIN_COLUMNS:
+        return False, f"열 수 부족 ({df.shape[1]}열)"
+    for i in range(5, min(20, len(df))):
+        row = df.iloc[i]
+        if not pd.isna(row.iloc[1]) and str(row.iloc[1]).isdigit() and '학기' in str(row.iloc[3]):
+            return True, f"고정 열 형식 (데이터 시작 {i}행)"
+    if len(df) < 20:
+        return False, f"행 수 부족 ({len(df)}행)"
+    return True, "고정 열 형식 (기본 시작 행)"
 
 def clean_dataframe(df: pd.DataFrame):
     """성적표 데이터프레임 정제"""
-    logger.debug(f"Cleaning DataFrame with shape {df.shape}")
+    logger.debug("Cleaning DataFrame with shape %s", df.shape)
     try:
-        columns_data = {
-            'year': None,
-            'semester': None,
-            'course_type': None,
-            'course_name': None,
-            'credits': None,
-            'grade': None
-        }
+        start_row = _find_start_row(df)
+        columns_data = _find_columns(df, start_row)
+        if df.shape[1] < MIN_COLUMNS or max(columns_data.values()) >= df.shape[1]:
+            # 찾지 못해 기본 열을 쓴 결과가 시트 밖이면 기존 구현과 같이 실패
+            raise IndexError("positional indexers are out-of-bounds")
 
-        start_row = 10
-        for i in range(5, 20):
-            row = df.iloc[i]
-            if not pd.isna(row.iloc[1]) and str(row.iloc[1]).isdigit() and '학기' in str(row.iloc[3]):
-                start_row = i
-                break
-
-        for col_idx in range(df.shape[1]):
-            col_values = df.iloc[start_row:start_row+10, col_idx].astype(str)
-            if col_idx == 1 and any(str(v).isdigit() for v in col_values if not pd.isna(v)):
-                columns_data['year'] = col_idx
-            elif col_idx == 3 and any('학기' in str(v) for v in col_values if not pd.isna(v)):
-                columns_data['semester'] = col_idx
-            elif col_idx == 8 and any(v in ['전선', '전필', '기교', '지교', '지필', '다선', '다필', '다지', '핵교', '일교', '일선', '심교'] for v in col_values if not pd.isna(v)):
-                columns_data['course_type'] = col_idx
-            elif col_idx in range(17, 20) and any(len(str(v)) > 3 for v in col_values if not pd.isna(v)):
-                columns_data['course_name'] = col_idx
-            elif col_idx in range(30, 33) and any(str(v).isdigit() or str(v).replace('.', '').isdigit() for v in col_values if not pd.isna(v)):
-                columns_data['credits'] = col_idx
-            elif col_idx in range(33, 36) and any(v in ['A+', 'A', 'B+', 'B', 'C+', 'C', 'D+', 'D', 'F', 'P'] for v in col_values if not pd.isna(v)):
-                columns_data['grade'] = col_idx
-
-        if None in columns_data.values():
-            if columns_data['year'] is None:
-                columns_data['year'] = 1
-            if columns_data['semester'] is None:
-                columns_data['semester'] = 3
-            if columns_data['course_type'] is None:
-                columns_data['course_type'] = 8
-            if columns_data['course_name'] is None:
-                columns_data['course_name'] = 18
-            if columns_data['credits'] is None:
-                columns_data['credits'] = 31
-            if columns_data['grade'] is None:
-                columns_data['grade'] = 34
+        # 연도가 있고 과목구분이 유효한 값인 행만 사용
+        data = df.iloc[start_row:]
+        course_type = data.iloc[:, columns_data['course_type']]
+        is_valid = (
+            data.iloc[:, columns_data['year']].notna() &
+            course_type.notna() &
+            course_type.astype(str).str.strip().isin(COURSE_TYPES)
+        )
+        filtered_rows = (np.flatnonzero(is_valid.to_numpy()) + start_row).tolist()
 
         new_df = pd.DataFrame()
-        filtered_rows = []
-        for i in range(start_row, len(df)):
-            row = df.iloc[i]
-            if (not pd.isna(row.iloc[columns_data['year']]) and 
-                not pd.isna(row.iloc[columns_data['course_type']]) and 
-                str(row.iloc[columns_data['course_type']]).strip() in 
-                ['전선', '전필', '기교', '지교','지필','다선','다필', '다지', '핵교', '일교', '일선', '심교']):
-                filtered_rows.append(i)
-
         for col_name, col_idx in columns_data.items():
             new_df[col_name] = df.iloc[filtered_rows, col_idx]
 
@@ -77,34 +109,16 @@ def clean_dataframe(df: pd.DataFrame):
         new_df['credits'] = pd.to_numeric(new_df['credits'], errors='coerce')
         new_df['course_name'] = new_df['course_name'].astype(str).str.strip()
 
-        delete_col = None
-        for col_idx in range(df.shape[1]):
-            col_values_str = [str(v).strip() for v in df.iloc[filtered_rows, col_idx] if not pd.isna(v)]
-            if any('취득학점포기' in val for val in col_values_str):
-                delete_col = col_idx
-                new_df['delete_type'] = df.iloc[filtered_rows, col_idx]
-                break
-
-        if delete_col is None:
-            for i in filtered_rows:
-                row_text = ' '.join([str(cell) for cell in df.iloc[i] if not pd.isna(cell)])
-                if '취득학점포기' in row_text:
-                    if 'delete_type' not in new_df:
-                        new_df['delete_type'] = 'N'
-                    new_df.loc[new_df.index[filtered_rows.index(i)], 'delete_type'] = '취득학점포기'
-
-        original_count = len(new_df)
-        if 'delete_type' in new_df.columns:
-            filtered_df = new_df[~new_df['delete_type'].astype(str).str.contains('취득학점포기')]
-            deleted_count = original_count - len(filtered_df)
-            logger.debug(f"취득학점포기 과목 삭제: {deleted_count}개")
-            new_df = filtered_df.copy()
-
-        if 'grade' in new_df.columns:
-            pass
+        # 취득학점포기 과목 제외 (셀 하나에 표시되므로 표시된 열 하나만 확인하면 됨)
+        delete_col = _find_forfeit_column(df.iloc[filtered_rows])
+        if delete_col is not None:
+            new_df['delete_type'] = df.iloc[filtered_rows, delete_col]
+            original_count = len(new_df)
+            new_df = new_df[~new_df['delete_type'].astype(str).str.contains('취득학점포기')].copy()
+            logger.debug("취득학점포기 과목 삭제: %d개", original_count - len(new_df))
 
         new_df = new_df.dropna(subset=['course_name', 'course_type', 'credits']).copy()
         return new_df
     except Exception as e:
         logger.exception("Data cleaning error")
-        raise 
\ No newline at end of file
+        raise
@@ -1,14 +1,118 @@
 import pandas as pd
+import numpy as np
+import hashlib
 import logging
-import re
 from typing import Dict, List, Optional, Tuple
+from myapp.services.row_tokenizer import CreditRowTokenizer
+from myapp.services.layout_cache import LayoutCache, layout_cache
+from myapp.services.normalization import normalize_courses
+from myapp.services.metrics import metrics
+from myapp.services.timing import stage
 
 logger = logging.getLogger(__name__)
 
+
+class CellGrid:
+    """업로드 시트를 한 번만 정규화한 셀 문자열 그리드
+
+    text는 str(cell).strip() 결과(null은 ''), null_mask는 pd.isna 결과입니다.
+    감지 휴리스틱은 모두 이 그리드 위에서 벡터 연산으로 동작합니다.
+    """
+    
+    SEMESTER_PATTERN = r'\d{2}/\d'
+    # 헤더/제목 키워드를 찾는 앞쪽 행 범위
+    HEAD_ROWS = 20
+    
+    def __init__(self, values: np.ndarray):
+        if values.ndim != 2:
+            values = values.reshape(len(values), -1)
+        self.shape = values.shape
+        self.null_mask = pd.isna(values)
+        
+        # null이 아닌 셀만 문자열로 변환 (넓고 듬성한 시트에서 불필요한 변환을 피함)
+        flat_values = values.ravel()
+        present = ~self.null_mask.ravel()
+        text = np.full(flat_values.shape, '', dtype=object)
+        if present.any():
+            text[present] = pd.Series(flat_values[present], dtype=object).astype(str).str.strip().to_numpy()
+        self.text = text.reshape(self.shape)
+        
+        # 비어있지 않은 셀 = 기존 row_values에 들어가던 토큰
+        self.nonempty = self.text != ''
+        # 행 안에서 몇 번째 토큰인지 (1부터, nonempty 위치에서만 의미 있음)
+        self.token_rank = np.cumsum(self.nonempty, axis=1)
+        self.token_count = self.nonempty.sum(axis=1)
+        self._isin_cache = {}
+        self._head_codes = None
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame):
+        """DataFrame에서 그리드 생성 (열 dtype별 문자열 표현 유지)"""
+        return cls(df.to_numpy(dtype=object))
+
+    @classmethod
+    def from_token_rows(cls, token_rows: List[List[str]]):
+        """xlsx_reader의 행별 토큰 목록에서 그리드 생성"""
+        width = max((len(row) for row in token_rows), default=0)
+        values = np.full((len(token_rows), width), None, dtype=object)
+        for i, row in enumerate(token_rows):
+            values[i, :len(row)] = row
+        return cls(values)
+
+    @property
+    def n_rows(self):
+        return self.shape[0]
+
+    @property
+    def n_cols(self):
+        return self.shape[1]
+
+    def isin(self, values) -> np.ndarray:
+        """셀 값이 values에 속하는지 (그리드 전체, 같은 값 목록은 한 번만 계산)"""
+        key = tuple(values)
+        if key not in self._isin_cache:
+            hits = pd.Series(self.text.ravel(), dtype=object).isin(key).to_numpy(dtype=bool)
+            self._isin_cache[key] = hits.reshape(self.shape)
+        return self._isin_cache[key]
+
+    def matches(self, pattern: str, rows=slice(None)) -> np.ndarray:
+        """re.match(pattern, cell) 결과 (rows는 slice 또는 행 번호 배열, 비어있지 않은 셀에만 적용)"""
+        mask = self.nonempty[rows]
+        result = np.zeros(mask.shape, dtype=bool)
+        cells = self.text[rows][mask]
+        if len(cells):
+            result[mask] = pd.Series(cells, dtype=object).str.match(pattern).to_numpy(dtype=bool)
+        return result
+
+    def head_contains(self, keyword: str) -> np.ndarray:
+        """앞쪽 HEAD_ROWS개 행에서 keyword를 포함하는 셀"""
+        if self._head_codes is None:
+            # 서로 다른 셀 값은 몇 개 되지 않으므로 고유값 단위로 검사
+            head = self.text[:self.HEAD_ROWS]
+            codes, uniques = pd.factorize(head.ravel())
+            self._head_codes = (codes.reshape(head.shape), uniques)
+        codes, uniques = self._head_codes
+        hits = np.fromiter((keyword in value for value in uniques), dtype=bool, count=len(uniques))
+        return hits[codes]
+
+    def row_tokens(self, start: int = 0):
+        """행별 토큰 목록 (기존 row_values와 동일)"""
+        return [
+            row[mask].tolist()
+            for row, mask in zip(self.text[start:], self.nonempty[start:])
+        ]
+
+
 class ExcelStructureDetector:
     """엑셀 파일의 구조를 자동으로 감지하는 클래스"""
     
-    def __init__(self):
+    # 헤더 행을 판단하는 키워드
+    HEADER_KEYWORDS = ['과목명', '교과목명', '이수구분', '과목구분', '학점', '성적']
+    
+    def __init__(self, layout_cache: Optional[LayoutCache] = layout_cache):
+        # 레이아웃 지문 -> 감지 결과 (None이면 매번 전체 감지)
+        self.layout_cache = layout_cache
+        
         # 컬럼 식별을 위한 키워드들
         self.column_keywords = {
             'year': ['년도', '학년도', '이수년도', '수강년도'],
@@ -33,10 +137,90 @@ class ExcelStructureDetector:
             'A0', 'B0', 'C0', 'D0', 'F0'
         ]
 
-    def detect_structure(self, df: pd.DataFrame):
+    def detect_structure(self, df: pd.DataFrame, grid: Optional[CellGrid] = None):
         """엑셀 파일의 구조를 자동 감지"""
-        logger.info("엑셀 파일 구조 감지 시작")
-        
+        with stage('detect'):
+            logger.info("엑셀 파일 구조 감지 시작")
+            if grid is None:
+                grid = CellGrid.from_dataframe(df)
+            
+            # 같은 포털에서 내려받은 파일은 레이아웃이 같으므로 지문으로 이전 감지 결과 재사용
+            fingerprint = None
+            if self.layout_cache is not None:
+                fingerprint = self.layout_fingerprint(grid)
+                structure = self.layout_cache.get(fingerprint)
+                if structure is not None:
+                    if self._structure_fits(grid, structure):
+                        logger.info("레이아웃 지문 일치 - 캐시된 구조 사용: %s", structure)
+                        metrics.inc('myapp_cache_requests_total', cache='layout', result='hit')
+                        return structure
+                    self.layout_cache.discard(fingerprint)
+                metrics.inc('myapp_cache_requests_total', cache='layout', result='miss')
+            
+            structure = self._detect_structure(grid)
+            # 헤더가 없는 형식은 열 배치가 데이터 값으로만 정해져 지문으로 구분할 수 없으므로 캐시하지 않음
+            if fingerprint is not None and structure['format_type'] != 'pattern_based':
+                self.layout_cache.set(fingerprint, structure)
+            return structure
+
+    def layout_fingerprint(self, grid: CellGrid) -> str:
+        """시트 레이아웃 지문 (열 수, 머리 행의 토큰 위치, 헤더 키워드 위치, 머리 행 셀의 컬럼 이름)
+
+        학번/이름처럼 학생마다 다른 값은 넣지 않고 위치와 셀이 가리키는 컬럼 이름(년도,
+        학기 등)만 사용합니다. 머리 부분은 과목구분이 처음 나오는 행(데이터 시작) 앞까지입니다.
+        """
+        head_rows = min(grid.n_rows, CellGrid.HEAD_ROWS)
+        data_rows = np.flatnonzero(grid.isin(self.course_types)[:head_rows].any(axis=1))
+        head_end = int(data_rows[0]) if len(data_rows) else head_rows
+        
+        parts = [grid.n_cols, head_end]
+        parts.extend(tuple(np.flatnonzero(grid.nonempty[row]).tolist()) for row in range(head_end))
+        keywords = self.HEADER_KEYWORDS + ['취득학점', '확인원']
+        for keyword in keywords:
+            rows, cols = np.nonzero(grid.head_contains(keyword))
+            parts.append((keyword, tuple(zip(rows.tolist(), cols.tolist()))))
+        # 헤더 셀이 어떤 컬럼인지 (열 순서가 다른 헤더를 구분)
+        names = self._column_names(grid)[:head_end]
+        rows, cols = np.nonzero(names >= 0)
+        parts.append(tuple(zip(rows.tolist(), cols.tolist(), names[rows, cols].tolist())))
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    def _structure_fits(self, grid: CellGrid, structure: Dict) -> bool:
+        """캐시된 구조를 이 시트에 그대로 써도 되는지 확인
+
+        지문이 같아도 시작 행이 다른 시트가 있으므로, 형식이 같고 캐시된 데이터 시작 행이
+        이 시트에서도 감지 규칙상 첫 번째 데이터 행인지(앞쪽 행이 먼저 조건을 만족하지
+        않는지) 봅니다.
+        """
+        data_start = structure['data_start_row']
+        if data_start is None or data_start >= grid.n_rows:
+            return False
+        
+        is_credit_confirmation = structure['format_type'] == 'credit_confirmation'
+        if is_credit_confirmation != self._is_credit_confirmation_format(grid):
+            return False
+        
+        if is_credit_confirmation:
+            hits = self._credit_confirmation_start_rows(grid, stop=data_start + 1)
+            return bool(len(hits)) and int(hits[0]) == data_start
+        
+        # 헤더 없는 형식은 캐시하지 않음 (이전에 저장된 지문 파일의 항목도 쓰지 않음)
+        header_row = structure['header_row']
+        if structure['format_type'] != 'header_based' or header_row is None:
+            return False
+        course_type_col = structure['columns'].get('course_type')
+        if course_type_col is None or course_type_col >= grid.n_cols:
+            return False
+        if not grid.isin(self.course_types)[data_start, course_type_col]:
+            return False
+        # 헤더 다음 행부터 데이터 시작 행 앞까지 과목구분이 없어야 함 (_find_data_start_row)
+        if grid.isin(self.course_types)[header_row + 1:data_start].any():
+            return False
+        # 컬럼 매핑도 같아야 함 (헤더에 없는 컬럼은 데이터 패턴으로 다시 확인)
+        return self._find_column_mapping(grid, header_row, data_start) == structure['columns']
+
+    def _detect_structure(self, grid: CellGrid):
+        """지문 캐시 없이 전체 구조 감지"""
         structure = {
             'header_row': None,
             'data_start_row': None,
@@ -45,202 +229,170 @@ class ExcelStructureDetector:
         }
         
         # 취득학점확인원 형식인지 확인
-        if self._is_credit_confirmation_format(df):
+        if self._is_credit_confirmation_format(grid):
             structure['format_type'] = 'credit_confirmation'
-            structure['data_start_row'] = self._find_credit_confirmation_data_start(df)
+            structure['data_start_row'] = self._find_credit_confirmation_data_start(grid)
             logger.info("취득학점확인원 형식으로 감지됨")
             return structure
         
         # 기존 방식으로 처리
         # 1. 헤더 행 찾기
-        structure['header_row'] = self._find_header_row(df)
+        structure['header_row'] = self._find_header_row(grid)
         
         # 2. 데이터 시작 행 찾기
-        structure['data_start_row'] = self._find_data_start_row(df, structure['header_row'])
+        structure['data_start_row'] = self._find_data_start_row(grid, structure['header_row'])
         
         # 3. 컬럼 매핑 찾기
-        structure['columns'] = self._find_column_mapping(df, structure['header_row'], structure['data_start_row'])
+        structure['columns'] = self._find_column_mapping(grid, structure['header_row'], structure['data_start_row'])
         
         # 4. 파일 형식 타입 타입 결정
-        structure['format_type'] = self._determine_format_type(df, structure)
+        structure['format_type'] = self._determine_format_type(grid, structure)
         
-        logger.info(f"감지된 구조: {structure}")
+        logger.info("감지된 구조: %s", structure)
         return structure
 
-    def _is_credit_confirmation_format(self, df: pd.DataFrame):
+    def _is_credit_confirmation_format(self, grid: CellGrid):
         """취득학점확인원 형식인지 확인"""
         # 첫 번째 행에 '취득학점 확인원'이 있는지 확인
-        if len(df) > 0:
-            first_row_text = ' '.join([str(cell) for cell in df.iloc[0] if pd.notnull(cell)])
-            if '취득학점' in first_row_text and '확인원' in first_row_text:
+        if grid.n_rows > 0:
+            if grid.head_contains('취득학점')[0].any() and grid.head_contains('확인원')[0].any():
                 return True
         
-        # 과목구분이 행의 시작에 있고, 같은 행에 여러 과목이 있는 패턴 확인
-        for i in range(min(10, len(df))):
-            row = df.iloc[i]
-            row_values = [str(cell).strip() for cell in row if pd.notnull(cell) and str(cell).strip()]
-            
-            if len(row_values) > 5:  # 충분한 데이터가 있는 행
-                # 첫 번째 값이 과목구분이고, 행에 여러 과목 정보가 있는지 확인
-                if (row_values[0] in self.course_types or 
-                    (len(row_values) > 1 and row_values[1] in self.course_types)):
-                    # 학기 패턴 (22/1, 23/2 등) 확인
-                    semester_pattern_count = sum(1 for val in row_values if re.match(r'\d{2}/\d', val))
-                    if semester_pattern_count >= 2:  # 여러 학기 정보가 있음
-                        return True
-        
-        return False
-
-    def _find_credit_confirmation_data_start(self, df: pd.DataFrame):
+        # 과목구분이 행의 시작(첫 번째 또는 두 번째 토큰)에 있고, 같은 행에 여러 학기 정보가 있는 패턴 확인
+        head = slice(0, 10)
+        is_type = grid.isin(self.course_types)[head]
+        leads_with_type = (is_type & (grid.token_rank[head] <= 2)).any(axis=1)
+        candidates = np.flatnonzero((grid.token_count[head] > 5) & leads_with_type)
+        if not len(candidates):
+            return False
+        
+        # 학기 패턴 (22/1, 23/2 등)은 후보 행에서만 확인
+        semester_count = grid.matches(CellGrid.SEMESTER_PATTERN, candidates).sum(axis=1)
+        return bool((semester_count >= 2).any())
+
+    def _is_credit_confirmation_rows(self, token_rows: List[List[str]]):
+        """행별 토큰 목록으로 취득학점확인원 형식인지 확인"""
+        return self._is_credit_confirmation_format(CellGrid.from_token_rows(token_rows))
+
+    def _find_credit_confirmation_data_start(self, grid: CellGrid):
         """취득학점확인원에서 데이터 시작 행 찾기"""
-        for i in range(len(df)):
-            row = df.iloc[i]
-            row_values = [str(cell).strip() for cell in row if pd.notnull(cell) and str(cell).strip()]
-            
-            if len(row_values) > 3:
-                # 과목구분이 있고 학기 패턴이 있는 행 찾기
-                has_course_type = any(val in self.course_types for val in row_values[:3])
-                has_semester = any(re.match(r'\d{2}/\d', val) for val in row_values)
-                
-                if has_course_type and has_semester:
-                    return i
+        hits = self._credit_confirmation_start_rows(grid)
+        if len(hits):
+            return int(hits[0])
         
         return 3  # 기본값
 
-    def _find_header_row(self, df: pd.DataFrame):
+    def _credit_confirmation_start_rows(self, grid: CellGrid, stop: Optional[int] = None) -> np.ndarray:
+        """앞쪽 세 토큰 안에 과목구분이 있고 학기 패턴이 있는 행 번호 (stop 행 전까지)"""
+        rows = slice(0, stop)
+        has_course_type = (grid.isin(self.course_types)[rows] & (grid.token_rank[rows] <= 3)).any(axis=1)
+        candidates = np.flatnonzero((grid.token_count[rows] > 3) & has_course_type)
+        if not len(candidates):
+            return candidates
+        has_semester = grid.matches(CellGrid.SEMESTER_PATTERN, candidates).any(axis=1)
+        return candidates[has_semester]
+
+    def _find_header_row(self, grid: CellGrid):
         """헤더 행을 찾습니다"""
-        for idx in range(min(20, len(df))):
-            row = df.iloc[idx]
-            row_text = ' '.join([str(cell) for cell in row if pd.notnull(cell)]).lower()
-            
-            # 헤더 키워드가 포함된 행 찾기
-            header_keywords = ['과목명', '교과목명', '이수구분', '과목구분', '학점', '성적']
-            if sum(1 for keyword in header_keywords if keyword in row_text) >= 3:
-                return idx
+        # 헤더 키워드가 3개 이상 포함된 행 찾기 (앞쪽 20행)
+        keyword_hits = sum(grid.head_contains(keyword).any(axis=1).astype(int) for keyword in self.HEADER_KEYWORDS)
+        hits = np.flatnonzero(keyword_hits >= 3)
+        if len(hits):
+            return int(hits[0])
         
         return None
 
-    def _find_data_start_row(self, df: pd.DataFrame, header_row: Optional[int]):
+    def _find_data_start_row(self, grid: CellGrid, header_row: Optional[int]):
         """실제 데이터가 시작되는 행을 찾습니다"""
         start_search = header_row + 1 if header_row is not None else 0
         
-        for idx in range(start_search, min(start_search + 10, len(df))):
-            row = df.iloc[idx]
-            
-            # 과목 구분이 있는 행을 찾기
-            for cell in row:
-                if pd.notnull(cell) and str(cell).strip() in self.course_types:
-                    return idx
+        # 과목 구분이 있는 행을 찾기
+        window = grid.isin(self.course_types)[start_search:start_search + 10]
+        hits = np.flatnonzero(window.any(axis=1))
+        if len(hits):
+            return start_search + int(hits[0])
         
         # 기본값으로 헤더 다음 행 또는 10행
         return header_row + 1 if header_row is not None else 10
 
-    def _find_column_mapping(self, df: pd.DataFrame, header_row: Optional[int], data_start_row: int):
+    def _find_column_mapping(self, grid: CellGrid, header_row: Optional[int], data_start_row: int):
         """컬럼 매핑을 찾습니다"""
         columns = {}
         
         # 헤더 행이 있는 경우 헤더 기반으로 찾기
         if header_row is not None:
-            columns = self._find_columns_by_header(df, header_row)
+            columns = self._find_columns_by_header(grid, header_row)
         
         # 헤더로 찾지 못한 컬럼들은 데이터 패턴으로 찾기
         missing_columns = [col for col, idx in columns.items() if idx is None]
         if missing_columns or not columns:
-            pattern_columns = self._find_columns_by_pattern(df, data_start_row)
+            pattern_columns = self._find_columns_by_pattern(grid, data_start_row)
             for col, idx in pattern_columns.items():
                 if col not in columns or columns[col] is None:
                     columns[col] = idx
         
         return columns
 
-    def _find_columns_by_header(self, df: pd.DataFrame, header_row: int):
+    def _find_columns_by_header(self, grid: CellGrid, header_row: int):
         """헤더 행을 기반으로 컬럼을 찾습니다"""
         columns = {col: None for col in self.column_keywords.keys()}
-        header = df.iloc[header_row]
+        col_names = list(self.column_keywords.keys())
+        first_name = self._column_names(grid)[header_row]
         
-        for col_idx, cell in enumerate(header):
-            if pd.notnull(cell):
-                cell_text = str(cell).strip()
-                
-                for col_name, keywords in self.column_keywords.items():
-                    if any(keyword in cell_text for keyword in keywords):
-                        columns[col_name] = col_idx
-                        break
+        # 같은 컬럼 이름이 여러 셀에 있으면 마지막 셀을 사용
+        for name_idx, col_name in enumerate(col_names):
+            cells = np.flatnonzero(first_name == name_idx)
+            if len(cells):
+                columns[col_name] = int(cells[-1])
         
         return columns
 
-    def _find_columns_by_pattern(self, df: pd.DataFrame, data_start_row: int):
+    def _column_names(self, grid: CellGrid) -> np.ndarray:
+        """앞쪽 HEAD_ROWS개 행의 셀마다 키워드가 처음 일치하는 컬럼 이름 번호 (column_keywords 순서, 없으면 -1)"""
+        name_hits = np.array([
+            np.logical_or.reduce([grid.head_contains(keyword) for keyword in keywords])
+            for keywords in self.column_keywords.values()
+        ])
+        return np.where(name_hits.any(axis=0), name_hits.argmax(axis=0), -1)
+
+    def _find_columns_by_pattern(self, grid: CellGrid, data_start_row: int):
         """데이터 패턴을 기반으로 컬럼을 찾습니다"""
         columns = {col: None for col in self.column_keywords.keys()}
         
         # 분석할 행 범위 설정
-        end_row = min(data_start_row + 20, len(df))
+        rows = slice(data_start_row, min(data_start_row + 20, grid.n_rows))
+        present = ~grid.null_mask[rows]
+        text = grid.text[rows]
+        # 판별은 고유값에만 적용하고 셀 위치로 펼침
+        codes, uniques = pd.factorize(text.ravel())
+        codes = codes.reshape(text.shape)
+        flat = pd.Series(uniques, dtype=object)
+        
+        def ratio_above(mask, threshold):
+            counts = (mask.to_numpy(dtype=bool)[codes] & present).sum(axis=0)
+            return counts > present.sum(axis=0) * threshold
+        
+        # 컬럼별 판별 결과를 한 번에 계산
+        checks = {
+            'year': ratio_above(flat.str.match(r'^20\d{2}$'), 0.5),
+            'semester': ratio_above(flat.str.contains('학기', regex=False) | flat.isin(['1', '2', '여름', '겨울']), 0.5),
+            'course_type': ratio_above(flat.isin(self.course_types), 0.3),
+            'course_name': ratio_above((flat.str.len() >= 2) & flat.str.contains(r'[가-힣]'), 0.5),
+            'credits': ratio_above(flat.str.match(r'^\d+(\.\d+)?$'), 0.5),
+            'grade': ratio_above(flat.isin(self.grade_values), 0.3),
+        }
+        has_values = present.any(axis=0)
         
-        for col_idx in range(df.shape[1]):
-            col_data = df.iloc[data_start_row:end_row, col_idx]
-            col_values = [str(v).strip() for v in col_data if pd.notnull(v)]
-            
-            if not col_values:
-                continue
-            
-            # 년도 컬럼 찾기 (4자리 숫자)
-            if columns['year'] is None and self._is_year_column(col_values):
-                columns['year'] = col_idx
-            
-            # 학기 컬럼 찾기
-            elif columns['semester'] is None and self._is_semester_column(col_values):
-                columns['semester'] = col_idx
-            
-            # 과목구분 컬럼 찾기
-            elif columns['course_type'] is None and self._is_course_type_column(col_values):
-                columns['course_type'] = col_idx
-            
-            # 과목명 컬럼 찾기
-            elif columns['course_name'] is None and self._is_course_name_column(col_values):
-                columns['course_name'] = col_idx
-            
-            # 학점 컬럼 찾기
-            elif columns['credits'] is None and self._is_credits_column(col_values):
-                columns['credits'] = col_idx
-            
-            # 성적 컬럼 찾기
-            elif columns['grade'] is None and self._is_grade_column(col_values):
-                columns['grade'] = col_idx
+        # 컬럼마다 아직 찾지 못한 항목 중 처음 일치하는 것 하나만 할당
+        for col_idx in np.flatnonzero(has_values):
+            for col_name, is_match in checks.items():
+                if columns[col_name] is None and is_match[col_idx]:
+                    columns[col_name] = int(col_idx)
+                    break
         
         return columns
 
-    def _is_year_column(self, values: List[str]):
-        """년도 컬럼인지 확인"""
-        year_count = sum(1 for v in values if re.match(r'^20\d{2}$', v))
-        return year_count > len(values) * 0.5
-
-    def _is_semester_column(self, values: List[str]):
-        """학기 컬럼인지 확인"""
-        semester_count = sum(1 for v in values if '학기' in v or v in ['1', '2', '여름', '겨울'])
-        return semester_count > len(values) * 0.5
-
-    def _is_course_type_column(self, values: List[str]):
-        """과목구분 컬럼인지 확인"""
-        type_count = sum(1 for v in values if v in self.course_types)
-        return type_count > len(values) * 0.3
-
-    def _is_course_name_column(self, values: List[str]):
-        """과목명 컬럼인지 확인"""
-        # 한글이 포함되고 길이가 2자 이상인 값들
-        name_count = sum(1 for v in values if len(v) >= 2 and re.search(r'[가-힣]', v))
-        return name_count > len(values) * 0.5
-
-    def _is_credits_column(self, values: List[str]):
-        """학점 컬럼인지 확인"""
-        numeric_count = sum(1 for v in values if re.match(r'^\d+(\.\d+)?$', v))
-        return numeric_count > len(values) * 0.5
-
-    def _is_grade_column(self, values: List[str]):
-        """성적 컬럼인지 확인"""
-        grade_count = sum(1 for v in values if v in self.grade_values)
-        return grade_count > len(values) * 0.3
-
-    def _determine_format_type(self, df: pd.DataFrame, structure: Dict):
+    def _determine_format_type(self, grid: CellGrid, structure: Dict):
         """파일 형식 타입을 결정합니다"""
         if structure['header_row'] is not None:
             return 'header_based'
@@ -251,70 +403,82 @@ class ExcelStructureDetector:
 class FlexibleCleaner:
     """유연한 데이터 정제기"""
     
+    # 형식 판별에 쓰는 앞쪽 행 수 (헤더 탐색 20행 + 데이터 시작 탐색 10행 + 패턴 판별 20행)
+    SNIFF_ROWS = 50
+    
     def __init__(self):
         self.detector = ExcelStructureDetector()
-        
-        # 과목명 매핑 (기존과 동일)
-        self.course_name_mapping = {
-            '철학의이해': '철학산책',
-            '서양고대철학': '서양고중세철학',
-            '현대철학': '서양현대철학',
-            '유가철학': '중국유학'
-        }
-        
-        # 과목 구분 매핑 (기존과 동일)
-        self.course_type_mapping = {
-            '기교': '기초교양',
-            '핵교': '핵심교양',
-            '일교': '일반교양',
-            '지교': '지정교양',
-            '지필': '지정교양필수',
-            '전선': '전공선택',
-            '전필': '전공필수',
-            '일선': '일반선택',
-            '심교': '심화교양',
-            '다선': '다전공선택',
-            '다지': '다전공지교',
-            '다필': '다전공필수',
-        }
+        self.row_tokenizer = CreditRowTokenizer(self.detector.course_types, self.detector.grade_values)
+
+    def sniff(self, df: pd.DataFrame) -> Tuple[bool, str]:
+        """앞쪽 행만 보고 이 정제기로 처리할 수 있는지 판단합니다 (처리 가능 여부, 이유)
+
+        헤더/패턴 기반 감지는 앞쪽 SNIFF_ROWS행 안에서 끝나므로 전체 시트와 같은 구조를
+        얻습니다. 감지 결과는 레이아웃 지문 캐시에 남아 clean_dataframe에서 재사용됩니다.
+        """
+        grid = CellGrid.from_dataframe(df.head(self.SNIFF_ROWS))
+        if self.detector._is_credit_confirmation_format(grid):
+            return True, "취득학점확인원 형식"
+        
+        structure = self.detector.detect_structure(None, grid)
+        missing = [col for col, idx in structure['columns'].items() if idx is None]
+        if not structure['columns'] or missing:
+            return False, f"필수 컬럼 없음 ({', '.join(missing) or '전체'})"
+        
+        if structure['format_type'] == 'header_based':
+            return True, f"헤더 기반 형식 (헤더 {structure['header_row']}행)"
+        return True, "패턴 기반 형식"
 
     def clean_dataframe(self, df: pd.DataFrame):
         """새로운 방식으로 데이터프레임을 정제합니다"""
-        logger.info(f"FlexibleCleaner로 데이터프레임 정제 시작 - 크기: {df.shape}")
+        logger.info("FlexibleCleaner로 데이터프레임 정제 시작 - 크기: %s", df.shape)
         
         try:
-            # 1. 구조 감지
-            structure = self.detector.detect_structure(df)
+            # 1. 구조 감지 (셀 그리드는 업로드당 한 번만 생성)
+            grid = CellGrid.from_dataframe(df)
+            structure = self.detector.detect_structure(df, grid)
             
             # 2. 형식에 따른 처리
             if structure['format_type'] == 'credit_confirmation':
-                cleaned_df = self._process_credit_confirmation_format(df, structure)
+                cleaned_df = self._process_credit_confirmation_format(grid, structure)
             else:
                 if not structure['columns'] or None in structure['columns'].values():
                     raise ValueError("필수 컬럼을 찾을 수 없습니다. 파일 형식을 확인해주세요.")
                 
                 # 기존 방식으로 처리
-                cleaned_df = self._extract_data(df, structure)
+                cleaned_df = self._extract_data(df, structure, grid)
                 cleaned_df = self._clean_and_transform(cleaned_df)
                 cleaned_df = self._filter_valid_courses(cleaned_df)
             
-            logger.info(f"정제 완료 - 최종 크기: {cleaned_df.shape}")
+            logger.info("정제 완료 - 최종 크기: %s", cleaned_df.shape)
             return cleaned_df
             
         except Exception as e:
             logger.exception("FlexibleCleaner 정제 중 오류 발생")
             raise ValueError(f"데이터 정제 실패: {str(e)}")
 
-    def _process_credit_confirmation_format(self, df: pd.DataFrame, structure: Dict):
+    def clean_row_tokens(self, token_rows: List[List[str]]):
+        """xlsx_reader가 만든 행별 토큰 목록(취득학점확인원)을 바로 정제합니다"""
+        logger.info("FlexibleCleaner로 토큰 행 정제 시작 - 행 수: %d", len(token_rows))
+        grid = CellGrid.from_token_rows(token_rows)
+        structure = self.detector.detect_structure(None, grid)
+        if structure['format_type'] != 'credit_confirmation':
+            raise ValueError("취득학점확인원 형식이 아닙니다.")
+        
+        cleaned_df = self._process_credit_confirmation_rows(token_rows, structure['data_start_row'])
+        logger.info("정제 완료 - 최종 크기: %s", cleaned_df.shape)
+        return cleaned_df
+
+    def _process_credit_confirmation_format(self, grid: CellGrid, structure: Dict):
         """취득학점확인원 형식 처리"""
+        return self._process_credit_confirmation_rows(grid.row_tokens(), structure['data_start_row'])
+
+    def _process_credit_confirmation_rows(self, token_rows: List[List[str]], data_start: int):
+        """행별 토큰 목록에서 취득학점확인원 과목 추출"""
         courses = []
-        data_start = structure['data_start_row']
         current_course_type = None  # 현재 과목구분 추적
         
-        for idx in range(data_start, len(df)):
-            row = df.iloc[idx]
-            row_values = [str(cell).strip() for cell in row if pd.notnull(cell) and str(cell).strip()]
-            
+        for row_values in token_rows[data_start:]:
             if len(row_values) < 3:
                 continue
             
@@ -347,149 +511,26 @@ class FlexibleCleaner:
         result_df = self._clean_and_transform(result_df)
         result_df = self._filter_valid_courses(result_df)
         
-        logger.info(f"취득학점확인원에서 {len(result_df)}개 과목 추출")
+        logger.info("취득학점확인원에서 %d개 과목 추출", len(result_df))
         return result_df
 
     def _extract_courses_from_row(self, row_values: List[str], course_type: str):
         """한 행에서 여러 과목 추출"""
-        courses = []
-        i = 0
-        
-        # 과목구분이 있는 경우 과목구분과 총학점 정보 스킵
-        has_course_type_in_row = any(val in self.detector.course_types for val in row_values[:3])
-        
-        if has_course_type_in_row:
-            # 과목구분과 총학점 정보 스킵
-            while i < len(row_values):
-                if row_values[i] in self.detector.course_types:
-                    i += 1
-                    # 총학점 정보 스킵 (숫자.0 형태)
-                    while i < len(row_values) and (
-                        re.match(r'^\d+\.\d+$', row_values[i]) or 
-                        re.match(r'^\(\d+\.\d+\)$', row_values[i])
-                    ):
-                        i += 1
-                    break
-                i += 1
-        
-        # 과목 추출 시작
-        while i < len(row_values):
-            # 학기 패턴을 찾으면 과목 시작 (22/2, 22/2 1, (계)24/1 3 형태)
-            if re.match(r'^(\([^)]+\))?\d{2}/\d(\s+\d)?$', row_values[i]):
-                course_info = self._extract_single_course(row_values, i)
-                if course_info:
-                    course_info['course_type'] = course_type
-                    courses.append(course_info)
-                    i = course_info['next_index']
-                else:
-                    i += 1
-            else:
-                i += 1
-        
-        return courses
-
-    def _extract_single_course(self, row_values: List[str], start_idx: int):
-        """단일 과목 정보 추출"""
-        if start_idx >= len(row_values):
-            return None
-        
-        course_info = {}
-        i = start_idx
-        
-        # 학기 정보 찾기 (22/1, 23/2, 22/2 1, (계)24/1 3 형태)
-        semester_match = re.match(r'^(\([^)]+\))?(\d{2})/(\d)(\s+\d)?$', row_values[i])
-        if semester_match:
-            year = 2000 + int(semester_match.group(2))
-            semester_num = semester_match.group(3)
-            course_info['year'] = year
-            course_info['semester'] = f"{semester_num}학기"
-            i += 1
-        else:
-            # 학기 정보가 없으면 기본값
-            course_info['year'] = 2024
-            course_info['semester'] = '1학기'
-        
-        # 과목코드 스킵 (BAGA49118 형태 또는 숫자가 포함된 코드)
-        if i < len(row_values) and (
-            re.match(r'^[A-Z]{4}\d+', row_values[i]) or 
-            re.match(r'^[A-Z]+\d+', row_values[i]) or
-            '(' in row_values[i]  # BKSA56558(SW) 같은 형태
-        ):
-            i += 1
-        
-        # 과목명 찾기 - 한글이 포함되고 길이가 2자 이상
-        course_name_found = False
-        while i < len(row_values) and not course_name_found:
-            current_value = row_values[i]
-            
-            # 과목명 조건: 한글 포함, 2자 이상, 숫자나 성적이 아님
-            if (len(current_value) >= 2 and 
-                re.search(r'[가-힣]', current_value) and
-                not re.match(r'^\d+(\.\d+)?$', current_value) and  # 숫자가 아님
-                current_value not in self.detector.grade_values):  # 성적이 아님
-                
-                course_info['course_name'] = current_value
-                course_name_found = True
-                i += 1
-                break
-            i += 1
-        
-        if not course_name_found:
-            return None  # 과목명이 없으면 유효하지 않은 과목
-        
-        # 학점 찾기 - 과목명 다음에 오는 숫자
-        credits_found = False
-        while i < len(row_values) and not credits_found:
-            if re.match(r'^\d+(\.\d+)?$', row_values[i]):
-                try:
-                    credits = float(row_values[i])
-                    if 0.5 <= credits <= 6.0:  # 합리적인 학점 범위
-                        course_info['credits'] = int(credits)  # int로 변환
-                        credits_found = True
-                        i += 1
-                        break
-                except ValueError:
-                    pass
-            i += 1
-        
-        if not credits_found:
-            course_info['credits'] = 3  # 기본값도 int로
-        
-        # 성적 찾기 - 학점 다음에 오는 성적
-        grade_found = False
-        while i < len(row_values) and not grade_found:
-            if row_values[i] in self.detector.grade_values:
-                course_info['grade'] = row_values[i]
-                grade_found = True
-                i += 1
-                break
-            # 다음 학기 패턴이 나오면 성적 찾기 중단
-            if re.match(r'^(\([^)]+\))?\d{2}/\d(\s+\d)?$', row_values[i]):
-                break
-            i += 1
-        
-        if not grade_found:
-            course_info['grade'] = 'P'  # 기본값
-        
-        course_info['next_index'] = i
-        return course_info
-
-    def _extract_data(self, df: pd.DataFrame, structure: Dict):
+        return self.row_tokenizer.extract_courses(row_values, course_type)
+
+    def _extract_data(self, df: pd.DataFrame, structure: Dict, grid: Optional[CellGrid] = None):
         """구조 정보를 바탕으로 데이터를 추출합니다"""
         columns = structure['columns']
         data_start = structure['data_start_row']
+        if grid is None:
+            grid = CellGrid.from_dataframe(df)
         
-        # 유효한 데이터 행 찾기
+        # 유효한 데이터 행 찾기 - 과목구분이 유효한 값인 행
         valid_rows = []
-        for idx in range(data_start, len(df)):
-            row = df.iloc[idx]
-            
-            # 과목구분이 유효한 값인지 확인
-            course_type_col = columns.get('course_type')
-            if course_type_col is not None:
-                course_type = str(row.iloc[course_type_col]).strip()
-                if course_type in self.detector.course_types:
-                    valid_rows.append(idx)
+        course_type_col = columns.get('course_type')
+        if course_type_col is not None:
+            is_course_type = grid.isin(self.detector.course_types)[data_start:, course_type_col]
+            valid_rows = (np.flatnonzero(is_course_type) + data_start).tolist()
         
         if not valid_rows:
             raise ValueError("유효한 성적 데이터를 찾을 수 없습니다.")
@@ -526,18 +567,8 @@ class FlexibleCleaner:
         if 'credits' in df.columns:
             df['credits'] = pd.to_numeric(df['credits'], errors='coerce').astype('Int64')
         
-        # 과목명 매핑 적용
-        if 'course_name' in df.columns:
-            df['course_name'] = df['course_name'].str.replace(' ', '')
-            for old_name, new_name in self.course_name_mapping.items():
-                df.loc[df['course_name'] == old_name, 'course_name'] = new_name
-        
-        # 과목구분 매핑 적용
-        if 'course_type' in df.columns:
-            for old_type, new_type in self.course_type_mapping.items():
-                df.loc[df['course_type'] == old_type, 'course_type'] = new_type
-        
-        return df
+        # 과목명/과목구분 매핑 적용 (분석기는 정규화 표시를 보고 다시 하지 않음)
+        return normalize_courses(df)
 
     def _filter_valid_courses(self, df: pd.DataFrame):
         """유효한 과목만 필터링"""
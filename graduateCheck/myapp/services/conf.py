@@ -0,0 +1,6 @@
+from django.conf import settings
+
+
+def setting(name: str, default):
+    """Django 설정 값 (설정 밖에서 쓰면 기본값, 예: 벤치마크 스크립트)"""
+    return getattr(settings, name, default) if settings.configured else default
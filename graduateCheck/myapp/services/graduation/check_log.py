@@ -0,0 +1,38 @@
+import logging
+from typing import List, Tuple
+
+
+class CourseCheckLog:
+    """분석 한 번 동안의 과목별 확인 결과를 모았다가 로그 한 줄로 남김
+
+    분석기마다 과목 하나를 볼 때마다 로그를 쓰던 것을 모아서, 요약(구간별 이수/미이수 수와
+    미이수 과목)은 한 번에, 과목별 목록은 DEBUG가 켜져 있을 때만 남깁니다.
+    """
+
+    __slots__ = ('checks',)
+
+    def __init__(self):
+        # (구간, 과목명, 이수 여부, 비고)
+        self.checks: List[Tuple[str, str, bool, str]] = []
+
+    def passed(self, section: str, course: str, note: str = ''):
+        self.checks.append((section, course, True, note))
+
+    def missing(self, section: str, course: str):
+        self.checks.append((section, course, False, ''))
+
+    def emit(self, logger: logging.Logger):
+        """요약 한 줄 (미이수가 있으면 WARNING) + DEBUG일 때 과목별 목록 한 줄"""
+        if not self.checks:
+            return
+        missing = [f'{section}:{course}' for section, course, passed, _ in self.checks if not passed]
+        level = logging.WARNING if missing else logging.INFO
+        if logger.isEnabledFor(level):
+            logger.log(level, "과목 확인 %d건 - 이수 %d, 미이수 %d%s",
+                       len(self.checks), len(self.checks) - len(missing), len(missing),
+                       f" ({', '.join(missing)})" if missing else '')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("과목별 확인: %s", '; '.join(
+                f"{section}:{course}={'이수' if passed else '미이수'}{f'({note})' if note else ''}"
+                for section, course, passed, note in self.checks
+            ))
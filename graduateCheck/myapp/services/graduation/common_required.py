@@ -1,6 +1,7 @@
 from typing import Any
 import pandas as pd
 from myapp.services.graduation.context import AnalyzeContext
+from myapp.services.graduation.course_index import CourseIndex
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,8 +12,8 @@ class CommonRequiredAnalyzer:
 
     def analyze(self, df: pd.DataFrame, requirement, student_type: str, context: AnalyzeContext):
         logger.info("=== 공통 필수 과목 분석 시작 ===")
-        logger.info(f"입력 데이터프레임 크기: {df.shape}")
-        logger.info(f"요구사항: {requirement.common_required}")
+        logger.info("입력 데이터프레임 크기: %s", df.shape)
+        logger.info("요구사항: %s", requirement.common_required)
         
         result = {
             'required_courses': {},
@@ -20,6 +21,7 @@ class CommonRequiredAnalyzer:
             'details': {}
         }
         common_required = requirement.common_required
+        course_index = context.course_index or CourseIndex(df)
         for category, courses in common_required.items():
             # 공통 필수 과목 카테고리만 처리 (심교, 지교)
             synonyms = {
@@ -30,29 +32,24 @@ class CommonRequiredAnalyzer:
             if category not in synonyms:
                 continue
             category_types = synonyms[category]
-            logger.info(f"카테고리 '{category}' 처리 중...")
-            logger.info(f"카테고리 타입: {category_types}")
+            logger.info("카테고리 '%s' 처리 중 (타입: %s)", category, category_types)
             
-            if isinstance(courses, list):
-                logger.debug(f"Checking list-based common requirement for category {category}: {courses}")
+            if isinstance(courses, (list, tuple)):
+                logger.debug("Checking list-based common requirement for category %s: %s", category, courses)
                 for course in courses:
-                    logger.info(f"과목 '{course}' 확인 중...")
-                    course_data = df[
-                        (df['course_name'] == course) &
-                        (df['course_type'].isin(category_types))
-                    ]
-                    if not course_data.empty:
-                        logger.info(f"과목 '{course}' 이수 확인됨")
+                    course_data = course_index.find(course, category_types)
+                    if course_data is not None:
+                        context.checks.passed(category, course)
                         if category not in result['required_courses']:
                             result['required_courses'][category] = []
                         result['required_courses'][category].append({
                             'course_name': context.get_display_course_name(course),
                             'category': category,
-                            'credits': course_data['credits'].iloc[0],
+                            'credits': course_data.credits,
                             'original_type': "필수"
                         })
                     else:
-                        logger.warning(f"과목 '{course}' 미이수")
+                        context.checks.missing(category, course)
                         if category not in result['missing_courses']:
                             result['missing_courses'][category] = []
                         result['missing_courses'][category].append({
@@ -61,21 +58,21 @@ class CommonRequiredAnalyzer:
                             'credits': context.get_course_credit(category)
                         })
             elif isinstance(courses, int):
-                logger.debug(f"Checking count-based common requirement for category {category}: {courses}")
-                category_courses = df[df['course_type'].isin(category_types)]
+                logger.debug("Checking count-based common requirement for category %s: %s", category, courses)
+                category_courses = course_index.of_types(category_types)
                 completed_count = len(category_courses)
                 if completed_count >= courses:
-                    logger.info(f"Fulfilled common requirement '{category}' with {completed_count}/{courses}")
+                    logger.info("Fulfilled common requirement '%s' with %d/%d", category, completed_count, courses)
                     if category not in result['required_courses']:
                         result['required_courses'][category] = []
-                    for _, row in category_courses.iterrows():
+                    for row in category_courses:
                         # 필수 과목인지 확인
-                        is_required = row['course_name'] in requirement.designated_required
+                        is_required = row.course_name in requirement.designated_required
                         result['required_courses'][category].append({
-                            'course_name': context.get_display_course_name(row['course_name']),
+                            'course_name': context.get_display_course_name(row.course_name),
                             'category': category,
-                            'credits': row['credits'],
-                            'original_type': "필수" if is_required else row['course_type']
+                            'credits': row.credits,
+                            'original_type': "필수" if is_required else row.course_type
                         })
                     # result['details'][f'{category} 과목 수'] = f'{completed_count}/{courses} (충족)'
                     result['details'][f'{category} 과목 수'] = {
@@ -83,7 +80,7 @@ class CommonRequiredAnalyzer:
                             'is_fulfilled': True
                         }
                 else:
-                    logger.warning(f"Unfulfilled common requirement '{category}': {completed_count}/{courses}")
+                    logger.warning("Unfulfilled common requirement '%s': %d/%d", category, completed_count, courses)
                     if category not in result['missing_courses']:
                         result['missing_courses'][category] = []
                     missing_count = courses - completed_count
@@ -95,14 +92,14 @@ class CommonRequiredAnalyzer:
                     if completed_count > 0:
                         if category not in result['required_courses']:
                             result['required_courses'][category] = []
-                        for _, row in category_courses.iterrows():
+                        for row in category_courses:
                             #필수 과목인지 확인
-                            is_required = row['course_name'] in requirement.designated_required
+                            is_required = row.course_name in requirement.designated_required
                             result['required_courses'][category].append({
-                                'course_name': context.get_display_course_name(row['course_name']),
+                                'course_name': context.get_display_course_name(row.course_name),
                                 'category': category,
-                                'credits': row['credits'],
-                                'original_type': "필수" if is_required else row['course_type']
+                                'credits': row.credits,
+                                'original_type': "필수" if is_required else row.course_type
                             })
                     # result['details'][f'{category} 과목 수'] = f'{completed_count}/{courses} (미충족)'
                     result['details'][f'{category} 과목 수'] = {
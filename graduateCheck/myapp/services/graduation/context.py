@@ -1,9 +1,13 @@
-from typing import Callable
-from dataclasses import dataclass
+from typing import Callable, Optional
+from dataclasses import dataclass, field
+from myapp.services.graduation.check_log import CourseCheckLog
+from myapp.services.graduation.course_index import CourseIndex
 
 @dataclass
 class AnalyzeContext:
     get_display_course_name: Callable[[str], str]
     get_course_credit: Callable[[str], int]
     admission_year: int = None
-    internship_completed: str = None 
\ No newline at end of file
+    internship_completed: str = None
+    course_index: Optional[CourseIndex] = None  # 분석기들이 함께 쓰는 이수 기록 색인
+    checks: CourseCheckLog = field(default_factory=CourseCheckLog)  # 과목별 확인 결과 (분석 끝에 한 줄로 기록) 
\ No newline at end of file
@@ -0,0 +1,63 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import pandas as pd
+
+
+class CourseRecord(NamedTuple):
+    position: int       # 정제된 DataFrame에서의 행 위치
+    course_name: str
+    course_type: str
+    credits: object     # DataFrame 값 그대로 (numpy 스칼라)
+    grade: Optional[str]
+
+
+class CourseIndex:
+    """학생 한 명의 이수 기록을 과목명/과목구분으로 찾는 색인
+
+    GraduationAnalyzer._analyze_requirements에서 과목명 정규화(공백 제거, 이전 과목명
+    매핑)가 끝난 DataFrame으로 한 번 만들고, AnalyzeContext로 모든 요건 분석기가 함께
+    사용합니다. 조회 결과는 DataFrame 행 순서를 따르므로 기존의 df[...].iloc[0]과 같은
+    기록을 돌려줍니다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        names = df['course_name'].tolist()
+        types = df['course_type'].tolist()
+        grades = df['grade'].tolist() if 'grade' in df.columns else [None] * len(df)
+        credits = df['credits'].array
+
+        self.records: List[CourseRecord] = [
+            CourseRecord(position, name, course_type, credits[position], grade)
+            for position, (name, course_type, grade) in enumerate(zip(names, types, grades))
+        ]
+        self._by_name: Dict[str, List[CourseRecord]] = defaultdict(list)
+        self._by_type: Dict[str, List[CourseRecord]] = defaultdict(list)
+        for record in self.records:
+            self._by_name[record.course_name].append(record)
+            self._by_type[record.course_type].append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def find_all(self, course_name: str, course_types: Iterable[str], exclude_grades: Iterable[str] = ()) -> List[CourseRecord]:
+        """과목명이 같고 과목구분이 course_types에 속하는 기록 (행 순서)"""
+        course_types = set(course_types)
+        exclude_grades = set(exclude_grades)
+        return [
+            record for record in self._by_name.get(course_name, ())
+            if record.course_type in course_types and record.grade not in exclude_grades
+        ]
+
+    def find(self, course_name: str, course_types: Iterable[str], exclude_grades: Iterable[str] = ()) -> Optional[CourseRecord]:
+        """find_all의 첫 번째 기록 (없으면 None)"""
+        records = self.find_all(course_name, course_types, exclude_grades)
+        return records[0] if records else None
+
+    def last_records(self) -> List[CourseRecord]:
+        """과목명별 마지막 기록 (행 순서)"""
+        return sorted((records[-1] for records in self._by_name.values()), key=lambda record: record.position)
+
+    def of_types(self, course_types: Iterable[str]) -> List[CourseRecord]:
+        """과목구분이 course_types에 속하는 모든 기록 (행 순서)"""
+        records = [record for course_type in set(course_types) for record in self._by_type.get(course_type, ())]
+        return sorted(records, key=lambda record: record.position)
@@ -0,0 +1,85 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+from myapp.services.graduation.course_index import CourseRecord
+
+
+class CourseNameMatcher:
+    """요건 과목명 여러 개를 과목명 한 번 훑기로 찾는 매처 (대소문자 무시)
+
+    SUBSTRING: 과목명에 요건 과목명이 포함되면 일치 (Aho-Corasick 자동자)
+    EXACT: 과목명이 요건 과목명과 같아야 일치
+    """
+
+    EXACT = 'exact'
+    SUBSTRING = 'substring'
+
+    def __init__(self, patterns: Iterable[str], mode: str = SUBSTRING):
+        if mode not in (self.EXACT, self.SUBSTRING):
+            raise ValueError(f"지원하지 않는 매칭 방식: {mode}")
+        self.mode = mode
+        self.patterns: Tuple[str, ...] = tuple(dict.fromkeys(patterns))
+        self._by_key: Dict[str, List[str]] = {}
+        for pattern in self.patterns:
+            self._by_key.setdefault(pattern.lower(), []).append(pattern)
+        if mode == self.SUBSTRING:
+            self._build_automaton()
+
+    def _build_automaton(self):
+        # 상태 0이 루트, goto[state][문자] -> 다음 상태, output[state] -> 끝나는 패턴 키
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[str]] = [[]]
+        for key in self._by_key:
+            state = 0
+            for char in key:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._output.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._output[state].append(key)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def matches(self, course_name: str) -> List[str]:
+        """course_name이 만족하는 요건 과목명 (요건에 적힌 그대로)"""
+        if not isinstance(course_name, str):
+            return []
+        name = course_name.lower()
+        if self.mode == self.EXACT:
+            return list(self._by_key.get(name, ()))
+
+        keys = list(self._output[0])  # 빈 패턴은 모든 과목명에 포함
+        state = 0
+        for char in name:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            keys.extend(self._output[state])
+        return [pattern for key in dict.fromkeys(keys) for pattern in self._by_key[key]]
+
+    def first_matches(self, records: Iterable[CourseRecord]) -> Dict[str, CourseRecord]:
+        """요건 과목명 -> 처음으로 일치한 기록 (records 순서 기준)"""
+        found: Dict[str, CourseRecord] = {}
+        for record in records:
+            for pattern in self.matches(record.course_name):
+                found.setdefault(pattern, record)
+            if len(found) == len(self.patterns):
+                break
+        return found
+
+
+@lru_cache(maxsize=64)
+def compile_matcher(patterns: Tuple[str, ...], mode: str = CourseNameMatcher.SUBSTRING) -> CourseNameMatcher:
+    """요건 과목명 묶음별로 매처를 한 번만 만듭니다 (요건 설정은 요청마다 같음)"""
+    return CourseNameMatcher(patterns, mode)
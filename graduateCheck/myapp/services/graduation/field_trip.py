@@ -1,5 +1,6 @@
 import pandas as pd
 from myapp.services.graduation.context import AnalyzeContext
+from myapp.services.graduation.course_index import CourseIndex
 
 # --- 학술답사 분석기 ---
 class FieldTripAnalyzer:
@@ -23,23 +24,18 @@ class FieldTripAnalyzer:
         internship_required = requirement.internship_required
         if internship_required:
             field_trip_min = 1
+        course_index = context.course_index or CourseIndex(df)
         completed_field_trips = []
         for course in field_trip:
-            course_name = course
-            for old_name, new_name in self.course_name_mapping.items():
-                if old_name == course:
-                    course_name = new_name
-                    break
-            course_data = df[
-                (df['course_name'] == course_name) &
-                (df['course_type'].isin(['전공선택', '전선', '전공필수', '전필'])) &
-                (~df['grade'].isin(['F', 'NP']))
-            ]
-            if not course_data.empty:
+            course_name = self.course_name_mapping.get(course, course)
+            course_data = course_index.find(
+                course_name, ['전공선택', '전선', '전공필수', '전필'], exclude_grades=['F', 'NP']
+            )
+            if course_data is not None:
                 completed_field_trips.append({
                     'course_name': context.get_display_course_name(course),
                     'category': '학술답사',
-                    'credits': course_data['credits'].iloc[0]
+                    'credits': course_data.credits
                 })
         if len(completed_field_trips) >= field_trip_min:
             if '학술답사' not in result['required_courses']:
@@ -1,8 +1,16 @@
+import time
+import numpy as np
 import pandas as pd
-from typing import Any
-from myapp.services.cleaner import clean_dataframe
-from myapp.services.cleaner2 import clean_dataframe_v2
+from collections import defaultdict
+from typing import Any, Dict, Iterable, NamedTuple, Tuple
+from myapp.services.cleaner import clean_dataframe, sniff_dataframe
+from myapp.services.cleaner2 import FlexibleCleaner, clean_dataframe_v2
+from myapp.services.parse_cache import remember_cleaned
+from myapp.services.metrics import metrics
+from myapp.services.timing import stage
+from myapp.services.normalization import COURSE_NAME_MAPPING, COURSE_TYPE_MAPPING, normalize_courses
 from myapp.services.graduation.context import AnalyzeContext
+from myapp.services.graduation.course_index import CourseIndex
 from myapp.services.graduation.common_required import CommonRequiredAnalyzer
 from myapp.services.graduation.major_required import MajorRequiredAnalyzer
 from myapp.services.graduation.field_trip import FieldTripAnalyzer
@@ -12,51 +20,74 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# analyze_batch에서 쌓은 테이블의 학생 키 열
+STUDENT_KEY = '_student'
+# 쌓아서 분석하려면 있어야 하는 열 (없으면 단일 분석으로 처리해 같은 오류를 돌려줌)
+STACK_COLUMNS = frozenset(['course_name', 'course_type', 'credits', 'grade'])
+
+class CohortStudent(NamedTuple):
+    """analyze_batch에 넘기는 학생 한 명의 성적표와 분석 조건"""
+    student_id: str
+    df: pd.DataFrame
+    student_type: str
+    admission_year: int
+    internship_completed: str = 'no'
+
+def choose_cleaner(df: pd.DataFrame) -> Tuple[str, str]:
+    """앞쪽 행만 보고 사용할 cleaner와 그 이유를 고릅니다 (둘 다 거절하면 기존 cleaner)"""
+    accepted, reason = FlexibleCleaner().sniff(df)
+    if accepted:
+        return 'cleaner2', reason
+    legacy_accepted, legacy_reason = sniff_dataframe(df)
+    if legacy_accepted:
+        return 'cleaner', f"{legacy_reason}, cleaner2 거절: {reason}"
+    return 'cleaner', f"모든 cleaner 거절 - cleaner2: {reason}, 기존 cleaner: {legacy_reason}"
+
 def smart_clean_dataframe(df: pd.DataFrame):
-    """스마트 데이터 정제 - cleaner2를 먼저 시도하고 실패시 기존 cleaner 사용"""
+    """스마트 데이터 정제 - 앞쪽 행으로 형식을 판별해 맞는 cleaner 하나만 실행"""
+    if df.attrs.get('cleaned_by'):
+        logger.info("이미 정제된 데이터 사용 (%s)", df.attrs['cleaned_by'])
+        remember_cleaned(df, df)
+        return df
+    
+    started = time.perf_counter()
+    cleaner_name, reason = choose_cleaner(df)
+    logger.info("%s로 데이터 정제 - %s", cleaner_name, reason)
+    # cleaner2가 거절해 기존 cleaner로 넘어간 비율을 볼 수 있도록 실행한 정제기를 셈
+    metrics.inc('myapp_cleaner_total', cleaner=cleaner_name)
     try:
-        logger.info("cleaner2(FlexibleCleaner)로 데이터 정제 시도")
-        result = clean_dataframe_v2(df)
-        logger.info("cleaner2로 정제 성공")
-        return result
-    except Exception as e:
-        logger.warning(f"cleaner2 정제 실패: {str(e)}")
-        logger.info("기존 cleaner로 fallback 시도")
-        try:
+        if cleaner_name == 'cleaner2':
+            try:
+                result = clean_dataframe_v2(df)
+            except Exception as e:
+                # 앞쪽 행만 보고 받아들였지만 정제에 실패하면, 기존 cleaner가 받아들이는 시트는 그쪽으로 다시 시도
+                legacy_accepted, legacy_reason = sniff_dataframe(df)
+                if not legacy_accepted:
+                    raise
+                logger.warning("cleaner2 정제 실패, 기존 cleaner로 재시도: %s", e)
+                cleaner_name, reason = 'cleaner', f"{legacy_reason}, cleaner2 정제 실패: {e}"
+                metrics.inc('myapp_cleaner_total', cleaner=cleaner_name)
+                result = clean_dataframe(df)
+        else:
             result = clean_dataframe(df)
-            logger.info("기존 cleaner로 정제 성공")
-            return result
-        except Exception as e2:
-            logger.error(f"모든 cleaner 정제 실패: {str(e2)}")
-            raise ValueError(f"데이터 정제 실패 - cleaner2: {str(e)}, 기존 cleaner: {str(e2)}")
+    except Exception as e:
+        logger.error("%s 정제 실패: %s", cleaner_name, e)
+        raise ValueError(f"데이터 정제 실패 - {cleaner_name}({reason}): {str(e)}")
+    
+    logger.info("%s로 정제 성공", cleaner_name)
+    metrics.observe_seconds('myapp_parse_seconds', started, path=cleaner_name)
+    result.attrs['cleaned_by'] = cleaner_name
+    result.attrs['clean_reason'] = reason
+    remember_cleaned(df, result)
+    return result
 
 class GraduationAnalyzer:
     def __init__(self):
         self.requirement_manager = GraduationRequirementManager()
         
-        # 과목명 매핑 (이전 과목명 -> 현재 과목명)
-        self.course_name_mapping = {
-            '철학의이해': '철학산책',
-            '서양고대철학': '서양고중세철학',
-            '현대철학': '서양현대철학',
-            '유가철학': '중국유학'
-        }
-        
-        # 과목 구분 매핑
-        self.course_type_mapping = {
-            '기교': '기초교양',
-            '핵교': '핵심교양',
-            '일교': '일반교양',
-            '지교': '지정교양',
-            '지필': '지정교양필수',
-            '전선': '전공선택',
-            '전필': '전공필수',
-            '일선': '일반선택',
-            '심교': '심화교양',
-            '다선': '다전공선택',
-            '다지': '다전공지교',
-            '다필': '다전공필수',
-        }
+        # 과목명/과목 구분 매핑 (표는 normalization 모듈이 관리)
+        self.course_name_mapping = dict(COURSE_NAME_MAPPING)
+        self.course_type_mapping = dict(COURSE_TYPE_MAPPING)
         self.common_required_analyzer = CommonRequiredAnalyzer(self.course_name_mapping)
         self.major_required_analyzer = MajorRequiredAnalyzer(self.course_name_mapping)
         self.field_trip_analyzer = FieldTripAnalyzer(self.course_name_mapping)
@@ -65,41 +96,26 @@ class GraduationAnalyzer:
     def analyze(self, df: pd.DataFrame, student_type: str, admission_year: int, internship_completed: str = 'no'):
         """졸업요건 분석 수행"""
         try:
-            # 0. 원본 데이터의 총 학점 합계 확인
-            original_total_credits = df['credits'].sum() if 'credits' in df.columns else 0
-            logger.info(f"원본 데이터 총 학점: {original_total_credits}")
+            # 0. 원본 데이터의 총 학점 합계 확인 (로그에만 쓰므로 레벨이 켜져 있을 때만 계산)
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("원본 데이터 총 학점: %s", df['credits'].sum() if 'credits' in df.columns else 0)
             
-            # 1. 스마트 데이터 정제 (cleaner2 우선, 실패시 기존 cleaner)
-            df = smart_clean_dataframe(df)
+            # 1. 스마트 데이터 정제 (형식 판별 후 맞는 cleaner 하나만 실행)
+            with stage('clean'):
+                df = smart_clean_dataframe(df)
             
             # F/N 학점 과목 추출
-            f_grade_courses = []
-            # F/N 학점 과목 수 디버그 로깅
-            count_F = len(df[df['grade'] == 'F'])
-            count_N = len(df[df['grade'] == 'N'])
-            logger.info(f"F학점 과목 수: {count_F}, N학점 과목 수: {count_N}")
-            if 'grade' in df.columns:
-                f_df = df[df['grade'].isin(['F', 'N'])]
-                for _, row in f_df.iterrows():
-                    f_grade_courses.append({
-                        'course_name': row['course_name'],
-                        'year': row.get('year', ''),
-                        'semester': row.get('semester', ''),
-                        'grade': row['grade'],
-                        'credits': row['credits'],
-                    })
+            f_grade_courses = self._f_grade_courses(df)
             
             # 1.5 정제 후 총 학점 확인
-            cleaned_total_credits = df['credits'].sum()
-            logger.debug(f"정제 후 총 학점: {cleaned_total_credits}")
-            # 2. 과목명 매핑 적용
-            df = self._apply_course_name_mapping(df)
-            # 3. 과목 구분 매핑 적용
-            df = self._apply_course_type_mapping(df)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("정제 후 총 학점: %s", df['credits'].sum())
+            # 2~3. 과목명/과목 구분 매핑 적용 (cleaner2가 이미 정규화했으면 건너뜀)
+            df = self._normalize(df)
             
             # 3.5 매핑 후 총 학점 확인
-            mapped_total_credits = df['credits'].sum()
-            logger.debug(f"매핑 후 총 학점: {mapped_total_credits}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("매핑 후 총 학점: %s", df['credits'].sum())
             # 4. 졸업요건 가져오기
             requirement = self.requirement_manager.get_requirement(
                 admission_year, 
@@ -111,72 +127,158 @@ class GraduationAnalyzer:
             # 5. 요건 분석
             result = self._analyze_requirements(df, requirement, student_type, admission_year, internship_completed)
             
-            # 6. 입학년도 정보 추가
-            result['admission_year'] = admission_year
-            
-            # 7. 인턴십 이수 여부 추가
-            result['internship_completed'] = internship_completed == 'yes'
-            logger.info(f"인턴십 이수 여부: {result['internship_completed']}")
-            
-            # 8. 인턴십이 필수인 경우(2017학번~2024학번) 이수 여부 확인
-            if requirement.internship_required and (2017 <= admission_year <= 2020) and not result['internship_completed']:
-                result['status'] = '미달'
-                result.setdefault('missing_requirements', []).append('인턴십 미이수')
-            result['f_grade_courses'] = f_grade_courses
-            return result
+            return self._finish_result(result, requirement, admission_year, internship_completed, f_grade_courses)
         except Exception as e:
             return {
                 'error': str(e),
                 'status': '오류',
             }
 
-    def _apply_course_name_mapping(self, df: pd.DataFrame):
-        df['course_name'] = df['course_name'].str.replace(' ', '')
+    def _f_grade_courses(self, df: pd.DataFrame):
+        """F/N 학점 과목 목록 (과목명 매핑 전 이름 그대로)"""
+        grades = df['grade']
+        # F/N 학점 과목 수 디버그 로깅
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("F학점 과목 수: %d, N학점 과목 수: %d", (grades == 'F').sum(), (grades == 'N').sum())
+        f_df = df[grades.isin(['F', 'N'])]
+        if f_df.empty:
+            return []
+
+        # 행마다 Series를 만들지 않도록 열 단위로 꺼내 묶음
+        columns = {
+            'course_name': f_df['course_name'].tolist(),
+            'year': f_df['year'].tolist() if 'year' in f_df.columns else [''] * len(f_df),
+            'semester': f_df['semester'].tolist() if 'semester' in f_df.columns else [''] * len(f_df),
+            'grade': f_df['grade'].tolist(),
+            'credits': f_df['credits'].tolist(),
+        }
+        return [
+            dict(zip(columns, values))
+            for values in zip(*columns.values())
+        ]
+
+    def _finish_result(self, result, requirement, admission_year: int, internship_completed: str, f_grade_courses):
+        # 6. 입학년도 정보 추가
+        result['admission_year'] = admission_year
         
-        # 매핑 적용
-        for old_name, new_name in self.course_name_mapping.items():
-            df.loc[df['course_name'] == old_name, 'course_name'] = new_name
-        return df
+        # 7. 인턴십 이수 여부 추가
+        result['internship_completed'] = internship_completed == 'yes'
+        logger.info("인턴십 이수 여부: %s", result['internship_completed'])
+        
+        # 8. 인턴십이 필수인 경우(2017학번~2024학번) 이수 여부 확인
+        if requirement.internship_required and (2017 <= admission_year <= 2020) and not result['internship_completed']:
+            result['status'] = '미달'
+            result.setdefault('missing_requirements', []).append('인턴십 미이수')
+        result['f_grade_courses'] = f_grade_courses
+        return result
 
-    def _apply_course_type_mapping(self, df: pd.DataFrame):
-        for old_type, new_type in self.course_type_mapping.items():
-            df.loc[df['course_type'] == old_type, 'course_type'] = new_type
-        return df
+    def analyze_batch(self, students: Iterable[CohortStudent]) -> Dict[str, dict]:
+        """여러 학생의 성적표를 한 번에 분석 (학번 -> analyze와 같은 결과)
+
+        정제된 성적표를 학생 키와 함께 하나의 긴 테이블로 쌓아 과목명/과목구분 매핑,
+        유효 학점 합계, F/N 과목 추출을 코호트 전체에 한 번씩만 수행합니다. 요건 판정은
+        학생별 구간에 대해 컴파일된 요건 계획과 이수 기록 색인으로 진행합니다.
+        """
+        students = list(students)
+        student_ids = [student.student_id for student in students]
+        if len(set(student_ids)) != len(student_ids):
+            raise ValueError("중복된 학번이 있습니다.")
+
+        results = {}
+        # 열 구성과 dtype이 같은 성적표끼리 쌓아야 값의 타입이 단일 분석과 같게 유지됨
+        batches = defaultdict(list)
+        for student in students:
+            try:
+                cleaned = smart_clean_dataframe(student.df)
+            except Exception as e:
+                results[student.student_id] = {'error': str(e), 'status': '오류'}
+                continue
+            if self._stackable(cleaned):
+                batches[tuple(cleaned.dtypes.items())].append((student, cleaned))
+            else:
+                results[student.student_id] = self.analyze(cleaned, student.student_type,
+                                                           student.admission_year, student.internship_completed)
+
+        for batch in batches.values():
+            results.update(self._analyze_stacked(batch))
+        logger.info("코호트 분석 완료: %d명, 묶음 %d개", len(students), len(batches))
+        return {student_id: results[student_id] for student_id in student_ids}
+
+    @staticmethod
+    def _stackable(df: pd.DataFrame) -> bool:
+        """쌓아서 분석해도 단일 분석과 결과가 같은 성적표인지 (아니면 analyze로 처리)"""
+        if df.empty or not STACK_COLUMNS.issubset(df.columns) or STUDENT_KEY in df.columns:
+            return False
+        if not pd.api.types.is_numeric_dtype(df['credits']):
+            return False
+        try:
+            df['course_name'].str
+        except AttributeError:
+            return False
+        return True
 
-    def _analyze_requirements(self, df: pd.DataFrame, requirement: Any, student_type: str, admission_year: int, internship_completed: str = 'no'):
-        """졸업요건 상세 분석"""
-        valid_credits = df[
-            (df['grade'].notna()) & 
-            (~df['grade'].isin(['F', 'N']))
-        ]['credits'].sum() if 'grade' in df.columns else df['credits'].sum()
-        logger.info(f"유효한 총 이수학점: {valid_credits}")
+    def _analyze_stacked(self, batch):
+        stacked = pd.concat([cleaned for _, cleaned in batch], ignore_index=True)
+        offsets = np.cumsum([0] + [len(cleaned) for _, cleaned in batch])
+        stacked[STUDENT_KEY] = np.repeat(np.arange(len(batch)), np.diff(offsets))
+
+        # F/N 과목은 과목명 매핑 전 이름으로 기록
+        f_mask = stacked['grade'].isin(['F', 'N']).to_numpy()
+        f_rows = stacked.loc[f_mask].drop(columns=STUDENT_KEY)
+        f_bounds = np.searchsorted(np.flatnonzero(f_mask), offsets)
+
+        stacked = self._normalize(stacked)
+        valid = stacked['grade'].notna() & ~stacked['grade'].isin(['F', 'N'])
+        valid_credits = stacked.loc[valid, 'credits'].groupby(stacked.loc[valid, STUDENT_KEY]).sum()
+        valid_credits = valid_credits.reindex(range(len(batch)), fill_value=0)
+        stacked = stacked.drop(columns=STUDENT_KEY)
+
+        results = {}
+        for position, (student, _) in enumerate(batch):
+            try:
+                requirement = self.requirement_manager.get_requirement(student.admission_year, student.student_type)
+                if not requirement:
+                    raise ValueError("해당하는 졸업요건을 찾을 수 없습니다.")
+                df = stacked.iloc[offsets[position]:offsets[position + 1]]
+                result = self._analyze_requirements(
+                    df, requirement, student.student_type, student.admission_year,
+                    student.internship_completed, valid_credits=valid_credits.iloc[position]
+                )
+                f_grade_courses = self._f_grade_courses(f_rows.iloc[f_bounds[position]:f_bounds[position + 1]])
+                results[student.student_id] = self._finish_result(
+                    result, requirement, student.admission_year, student.internship_completed, f_grade_courses
+                )
+            except Exception as e:
+                results[student.student_id] = {'error': str(e), 'status': '오류'}
+        return results
+
+    def _normalize(self, df: pd.DataFrame):
+        with stage('normalize'):
+            return normalize_courses(df, self.course_name_mapping, self.course_type_mapping)
+
+    def _analyze_requirements(self, df: pd.DataFrame, requirement: Any, student_type: str, admission_year: int, internship_completed: str = 'no', valid_credits=None):
+        """졸업요건 상세 분석 (valid_credits는 analyze_batch가 미리 합산한 값)"""
+        if valid_credits is None:
+            valid_credits = df[
+                (df['grade'].notna()) & 
+                (~df['grade'].isin(['F', 'N']))
+            ]['credits'].sum() if 'grade' in df.columns else df['credits'].sum()
+        logger.info("유효한 총 이수학점: %s", valid_credits)
+        
+        # 분석기들이 과목마다 DataFrame을 다시 거르지 않도록 이수 기록 색인을 한 번만 생성
+        course_index = CourseIndex(df)
+        # 과목명 동의어, 표시용 과목명, 기본 학점은 요건 계획에 미리 계산되어 있음
+        plan = self.requirement_manager.get_plan(admission_year, student_type)
         
+        # 같은 과목명은 마지막 기록의 학점이 남으므로 과목명별 마지막 기록만 반영
         course_credits = {}
-        for _, row in df.iterrows():
-            course_name = row['course_name']
-            credits = row['credits']
-            course_credits[course_name] = credits
-            for old_name, new_name in self.course_name_mapping.items():
-                if course_name == old_name:
-                    course_credits[new_name] = credits
-                elif course_name == new_name:
-                    course_credits[old_name] = credits
+        for record in course_index.last_records():
+            course_credits[record.course_name] = record.credits
+            for synonym in plan.synonyms.get(record.course_name, ()):
+                course_credits[synonym] = record.credits
 
         def get_course_credit(course_name: str):
-            if '학술답사' in course_name:
-                return 1
-            elif course_name in course_credits:
-                return course_credits[course_name]
-            else:
-                return 3
-
-        def get_display_course_name(course_name: str):
-            for old_name, new_name in self.course_name_mapping.items():
-                if course_name == new_name:
-                    return f"{new_name}(전 {old_name})"
-                elif course_name == old_name:
-                    return f"{new_name}(전 {old_name})"
-            return course_name
+            return plan.course_credit(course_name, course_credits)
 
         result = {
             'total_credits': valid_credits,
@@ -187,29 +289,36 @@ class GraduationAnalyzer:
         }
         
         context = AnalyzeContext(
-            get_display_course_name=get_display_course_name,
+            get_display_course_name=plan.display_name,
             get_course_credit=get_course_credit,
             admission_year=admission_year,
-            internship_completed=internship_completed
+            internship_completed=internship_completed,
+            course_index=course_index
         )
-        common_result = self.common_required_analyzer.analyze(df, requirement, student_type, context)
+        with stage('common'):
+            common_result = self.common_required_analyzer.analyze(df, requirement, student_type, context)
         result['required_courses'].update(common_result['required_courses'])
         result['missing_courses'].update(common_result['missing_courses'])
         result['details'].update(common_result['details'])
 
-        major_result = self.major_required_analyzer.analyze(df, requirement, student_type, context)
+        with stage('major'):
+            major_result = self.major_required_analyzer.analyze(df, requirement, student_type, context)
         result['required_courses'].update(major_result['required_courses'])
         result['missing_courses'].update(major_result['missing_courses'])
         result['details'].update(major_result['details'])
 
-        field_trip_result = self.field_trip_analyzer.analyze(df, requirement, student_type, context)
+        with stage('field_trip'):
+            field_trip_result = self.field_trip_analyzer.analyze(df, requirement, student_type, context)
         result['required_courses'].update(field_trip_result['required_courses'])
         result['missing_courses'].update(field_trip_result['missing_courses'])
 
         if admission_year >= 2025:
-            year2025_result = self.year2025_requirement_analyzer.analyze(df, requirement, student_type, context)
+            with stage('year2025'):
+                year2025_result = self.year2025_requirement_analyzer.analyze(df, requirement, student_type, context)
             result['required_courses'].update(year2025_result['required_courses'])
             result['missing_courses'].update(year2025_result['missing_courses'])
+        # 분석기들이 모은 과목별 확인 결과를 한 번에 기록
+        context.checks.emit(logger)
 
         # 졸업 가능 여부 판단
         if result['total_credits'] >= requirement.total_credits and len(result['missing_courses']) == 0:
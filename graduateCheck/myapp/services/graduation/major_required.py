@@ -1,40 +1,47 @@
 from typing import Any
 import pandas as pd
 from myapp.services.graduation.context import AnalyzeContext
+from myapp.services.graduation.course_index import CourseIndex
+from myapp.services.graduation.course_matcher import CourseNameMatcher, compile_matcher
 import logging
 
 logger = logging.getLogger(__name__)
 
 # --- 전공 필수 분석기 ---
 class MajorRequiredAnalyzer:
-    def __init__(self, course_name_mapping):
+    def __init__(self, course_name_mapping, match_mode: str = CourseNameMatcher.SUBSTRING):
         self.course_name_mapping = course_name_mapping
+        # 요건 과목명 비교 방식 (SUBSTRING: 과목명에 포함되면 이수, EXACT: 과목명이 같아야 이수)
+        self.match_mode = match_mode
 
     def analyze(self, df: pd.DataFrame, requirement, student_type: str, context: AnalyzeContext):
         """업로드된 성적 데이터에서 전공선택(전선) 과목만 판별합니다."""
         logger.info("=== 전공 필수 과목 분석 시작 ===")
-        logger.info(f"전공 필수 과목: {requirement.major_required}")
-        logger.info(f"전공 선택 필수 과목: {requirement.major_elective_required}")
-        logger.info(f"전공 선택 최소 이수 과목 수: {requirement.major_elective_min}")
+        logger.info("전공 필수 과목: %s", requirement.major_required)
+        logger.info("전공 선택 필수 과목: %s", requirement.major_elective_required)
+        logger.info("전공 선택 최소 이수 과목 수: %s", requirement.major_elective_min)
         
         # 결과 구조 초기화
         result = {'required_courses': {}, 'missing_courses': {}, 'details': {}}
         category = '전공선택'
+        course_index = context.course_index or CourseIndex(df)
+        # 전공필수/전공선택필수 과목명을 한 자동자로 묶어 전공선택 기록을 한 번만 훑음
+        matcher = compile_matcher(
+            tuple(requirement.major_required) + tuple(requirement.major_elective_required),
+            self.match_mode
+        )
+        matched = matcher.first_matches(course_index.of_types([category]))
 
         # 1) 전공필수(list-based)
         logger.info("전공 필수 과목 확인 중...")
         completed_major_required = []
         for course in requirement.major_required:
             display = context.get_display_course_name(course)
-            logger.info(f"과목 '{display}' 확인 중...")
-            course_df = df[
-                df['course_name'].str.contains(course, case=False, na=False) &
-                (df['course_type'] == category)
-            ]
+            course_df = matched.get(course)
             
-            if not course_df.empty:
-                logger.info(f"과목 '{display}' 이수 확인됨")
-                credit = course_df['credits'].iloc[0]
+            if course_df is not None:
+                context.checks.passed('전공필수', display)
+                credit = course_df.credits
                 completed_major_required.append({
                     'course_name': display, 
                     'category': category, 
@@ -42,7 +49,7 @@ class MajorRequiredAnalyzer:
                     'original_type': "필수"  # 전공 필수 과목으로 설정
                 })
             else:
-                logger.warning(f"과목 '{display}' 미이수")
+                context.checks.missing('전공필수', display)
                 credit = context.get_course_credit(course)
                 result['missing_courses'].setdefault(category, []).append({
                     'course_name': display, 
@@ -65,15 +72,11 @@ class MajorRequiredAnalyzer:
         missing_courses = []
         for course in electives:
             display = context.get_display_course_name(course)
-            logger.info(f"과목 '{display}' 확인 중...")
-            course_df = df[
-                df['course_name'].str.contains(course, case=False, na=False) &
-                (df['course_type'] == category)
-            ]
+            course_df = matched.get(course)
             
-            if not course_df.empty:
-                logger.info(f"과목 '{display}' 이수 확인됨")
-                credit = course_df['credits'].iloc[0]
+            if course_df is not None:
+                context.checks.passed('전공선택필수', display)
+                credit = course_df.credits
                 completed_courses.append({
                     'course_name': display,
                     'category': category,
@@ -81,7 +84,7 @@ class MajorRequiredAnalyzer:
                     'original_type': '전공선택'
                 })
             else:
-                logger.warning(f"과목 '{display}' 미이수")
+                context.checks.missing('전공선택필수', display)
                 missing_courses.append({
                     'course_name': display,
                     'category': category,
@@ -91,7 +94,7 @@ class MajorRequiredAnalyzer:
         # 이수 과목 수 확인
         completed_count = len(completed_courses)+len(completed_major_required)
         min_required = len(requirement.major_elective_required)
-        logger.info(f"이수한 전공 선택 필수 과목 수: {completed_count}/{min_required}")
+        logger.info("이수한 전공 선택 필수 과목 수: %d/%d", completed_count, min_required)
         
         is_fulfilled = completed_count >= min_required
         if is_fulfilled:
@@ -102,7 +105,7 @@ class MajorRequiredAnalyzer:
                 'is_fulfilled': True
             }
         else:
-            logger.warning(f"전공 선택 필수 과목 요건 미충족: {completed_count}/{min_required}")
+            logger.warning("전공 선택 필수 과목 요건 미충족: %d/%d", completed_count, min_required)
             result['missing_courses'].setdefault(category, []).extend(missing_courses)
             if completed_courses:
                 result['required_courses'].setdefault(category, []).extend(completed_major_required+completed_courses)
@@ -111,5 +114,5 @@ class MajorRequiredAnalyzer:
                 'is_fulfilled': False
             }
         
-        logger.info(f"전공 필수 과목 분석 완료!!!!!!!!!!!!")
+        logger.info("전공 필수 과목 분석 완료")
         return result
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import Any
 import pandas as pd
 from myapp.services.graduation.context import AnalyzeContext
+from myapp.services.graduation.course_index import CourseIndex
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,16 +13,17 @@ class Year2025RequirementAnalyzer:
 
     def analyze(self, df: pd.DataFrame, requirement, student_type: str, context: AnalyzeContext):
         logger.info("=== 2025년도 졸업요건 분석 시작 ===")
-        logger.info(f"입력 데이터프레임 크기: {df.shape}")
-        logger.info(f"전공 기초 과목: {requirement.major_base}")
-        logger.info(f"전공 기초 최소 이수 과목 수: {requirement.major_base_min}")
-        logger.info(f"전공 선택 과목: {requirement.major_elective}")
-        logger.info(f"전공 선택 최소 이수 과목 수: {requirement.major_elective_min}")
+        logger.info("입력 데이터프레임 크기: %s", df.shape)
+        logger.info("전공 기초 과목: %s", requirement.major_base)
+        logger.info("전공 기초 최소 이수 과목 수: %s", requirement.major_base_min)
+        logger.info("전공 선택 과목: %s", requirement.major_elective)
+        logger.info("전공 선택 최소 이수 과목 수: %s", requirement.major_elective_min)
         
         result = {
             'required_courses': {},
             'missing_courses': {},
         }
+        course_index = context.course_index or CourseIndex(df)
         # 전공 기초 과목 처리
         major_base = requirement.major_base
         major_base_min = requirement.major_base_min
@@ -31,31 +33,23 @@ class Year2025RequirementAnalyzer:
         logger.info("전공 기초 과목 확인 중...")
         completed_base = []
         for course in major_base:
-            logger.info(f"과목 '{course}' 확인 중...")
             if course in designated_required:
-                course_data = df[
-                    (df['course_name'] == course) &
-                    (df['course_type'].isin(['전공선택', '전선', '전공필수', '전필', '지정교양', '지교']))
-                ]
+                course_data = course_index.find(course, ['전공선택', '전선', '전공필수', '전필', '지정교양', '지교'])
                 actual_category = '전공기초'
-                if not course_data.empty and course_data['course_type'].iloc[0] in ['지정교양', '지교']:
+                if course_data is not None and course_data.course_type in ['지정교양', '지교']:
                     actual_category = '지교'
                     original_type = '지교(전공기초인정)'
-                    logger.info(f"과목 '{course}' 지교로 이수 확인됨")
                 else:
-                    course_data = df[
-                        (df['course_name'] == course) &
-                        (df['course_type'].isin(['전공선택', '전선', '전공필수', '전필']))
-                    ]
+                    course_data = course_index.find(course, ['전공선택', '전선', '전공필수', '전필'])
                     actual_category = '전공기초'
                     original_type = None
-                if not course_data.empty:
-                    logger.info(f"과목 '{course}' 이수 확인됨")
+                if course_data is not None:
+                    context.checks.passed('전공기초', course, '지교' if actual_category == '지교' else '')
                     completed_base.append({
                         'course_name': context.get_display_course_name(course),
                         'category': actual_category,
-                        'credits': course_data['credits'].iloc[0],
-                        'original_type': original_type or course_data['course_type'].iloc[0]
+                        'credits': course_data.credits,
+                        'original_type': original_type or course_data.course_type
                     })
                     
                     # 지교로 이수한 전공기초 과목이면 지교 카테고리에도 추가
@@ -65,20 +59,20 @@ class Year2025RequirementAnalyzer:
                         result['required_courses']['지교'].append({
                             'course_name': context.get_display_course_name(course),
                             'category': '지교',
-                            'credits': course_data['credits'].iloc[0],
+                            'credits': course_data.credits,
                             'original_type': original_type
                         })
             else:
-                logger.warning(f"과목 '{course}' 미이수")
+                context.checks.missing('전공기초', course)
                 
-        logger.info(f"이수한 전공 기초 과목 수: {len(completed_base)}/{major_base_min}")
+        logger.info("이수한 전공 기초 과목 수: %d/%d", len(completed_base), major_base_min)
         if len(completed_base) >= major_base_min:
             logger.info("전공 기초 과목 요건 충족")
             if '전공기초' not in result['required_courses']:
                 result['required_courses']['전공기초'] = []
             result['required_courses']['전공기초'].extend(completed_base)
         else:
-            logger.warning(f"전공 기초 과목 요건 미충족: {len(completed_base)}/{major_base_min}")
+            logger.warning("전공 기초 과목 요건 미충족: %d/%d", len(completed_base), major_base_min)
             missing_count = major_base_min - len(completed_base)
             missing_message = f"전공기초 과목 중 {missing_count}개 더 이수 필요"
             if '전공기초' not in result['missing_courses']:
@@ -100,28 +94,22 @@ class Year2025RequirementAnalyzer:
         completed_electives = []
         for course in major_elective:
             if course in designated_required:
-                course_data = df[
-                    (df['course_name'] == course) &
-                    (df['course_type'].isin(['전공선택', '전선', '전공필수', '전필', '지정교양', '지교']))
-                ]
+                course_data = course_index.find(course, ['전공선택', '전선', '전공필수', '전필', '지정교양', '지교'])
                 actual_category = '전공선택'
                 original_type = None
-                if not course_data.empty and course_data['course_type'].iloc[0] in ['지정교양', '지교']:
+                if course_data is not None and course_data.course_type in ['지정교양', '지교']:
                     actual_category = '지교'
                     original_type = '지교(전공선택인정)'
             else:
-                course_data = df[
-                    (df['course_name'] == course) &
-                    (df['course_type'].isin(['전공선택', '전선', '전공필수', '전필']))
-                ]
+                course_data = course_index.find(course, ['전공선택', '전선', '전공필수', '전필'])
                 actual_category = '전공선택'
                 original_type = None
-            if not course_data.empty:
+            if course_data is not None:
                 completed_electives.append({
                     'course_name': context.get_display_course_name(course),
                     'category': actual_category,
-                    'credits': course_data['credits'].iloc[0],
-                    'original_type': original_type or course_data['course_type'].iloc[0]
+                    'credits': course_data.credits,
+                    'original_type': original_type or course_data.course_type
                 })
                 
                 # 지교로 이수한 전공선택 과목이면 지교 카테고리에도 추가
@@ -131,7 +119,7 @@ class Year2025RequirementAnalyzer:
                     result['required_courses']['지교'].append({
                         'course_name': context.get_display_course_name(course),
                         'category': '지교',
-                        'credits': course_data['credits'].iloc[0],
+                        'credits': course_data.credits,
                         'original_type': original_type
                     })
         if len(completed_electives) >= major_elective_min:
@@ -157,15 +145,12 @@ class Year2025RequirementAnalyzer:
         field_trip_min = requirement.field_trip_min
         completed_field_trips = []
         for course in field_trip:
-            course_data = df[
-                (df['course_name'] == course) &
-                (df['course_type'].isin(['전공선택', '전선', '전공필수', '전필']))
-            ]
-            if not course_data.empty:
+            course_data = course_index.find(course, ['전공선택', '전선', '전공필수', '전필'])
+            if course_data is not None:
                 completed_field_trips.append({
                     'course_name': context.get_display_course_name(course),
                     'category': '학술답사',
-                    'credits': course_data['credits'].iloc[0]
+                    'credits': course_data.credits
                 })
         if len(completed_field_trips) >= field_trip_min:
             if '학술답사' not in result['required_courses']:
@@ -0,0 +1,189 @@
+import re
+import time
+import zipfile
+import logging
+from typing import Iterator, List, Optional
+from xml.etree.ElementTree import ParseError
+
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from pandas.io.parsers import TextParser
+from myapp.services.cleaner2 import FlexibleCleaner
+from myapp.services.metrics import metrics
+from myapp.services.timing import stage
+from myapp.services.upload_guard import (
+    UploadLimits, UploadRejected, check_archive, check_dimension, check_row, check_upload_size, parse_dimension
+)
+from myapp.services.xlsx_reader import iter_row_tokens, read_dimension
+
+logger = logging.getLogger(__name__)
+
+# 파일명에서 학번을 찾는 패턴 (예: 취득학점확인원_202200001.xlsx)
+STUDENT_ID_PATTERN = re.compile(r'(?<!\d)(\d{8,10})(?!\d)')
+
+
+def _rewind(source):
+    """파일 객체라면 처음 위치로 되돌립니다"""
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+
+def _convert_value(value):
+    """openpyxl 값을 pd.read_excel과 같은 규칙으로 변환합니다"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        # 정수로 표현 가능한 숫자는 int로 (pd.read_excel과 동일)
+        int_value = int(value)
+        return int_value if int_value == value else value
+    if isinstance(value, str) and value in ERROR_CODES:
+        return float('nan')
+    return value
+
+
+def guard_workbook(source, limits: UploadLimits):
+    """파싱 전에 파일 크기, zip 디렉토리의 부분 파일 크기/압축률, 시트가 선언한
+    dimension을 확인해 제한을 넘으면 UploadRejected를 발생시킵니다.
+    """
+    check_upload_size(source, limits)
+    _rewind(source)
+    if not zipfile.is_zipfile(source):
+        return
+    _rewind(source)
+    with zipfile.ZipFile(source) as archive:
+        check_archive(archive, limits)
+        try:
+            ref = read_dimension(archive)
+        except (KeyError, ValueError, ParseError):
+            # 시트를 찾을 수 없는 파일은 읽기 단계에서 오류로 처리
+            return
+    if ref:
+        check_dimension(parse_dimension(ref), limits)
+
+
+def iter_sheet_rows(source, sheet_name: Optional[str] = None,
+                    limits: Optional[UploadLimits] = None) -> Iterator[list]:
+    """첫 번째(또는 지정한) 시트의 행을 값 목록으로 하나씩 흘려보냅니다.
+
+    read-only/values-only 모드로 열기 때문에 셀 객체와 스타일을 만들지 않으며,
+    각 행의 뒤쪽 빈 셀은 잘라낸 상태로 반환합니다. limits가 있으면 행마다 행 수/열 수를
+    확인합니다.
+    """
+    _rewind(source)
+    workbook = load_workbook(source, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        # 엑셀이 선언한 dimension은 신뢰하지 않고 실제 행을 기준으로 읽음
+        sheet.reset_dimensions()
+        for row_number, row in enumerate(sheet.iter_rows(values_only=True), start=1):
+            if limits is not None:
+                check_row(row_number, len(row), limits)
+            values = list(row)
+            while values and values[-1] is None:
+                values.pop()
+            yield [_convert_value(value) for value in values]
+    finally:
+        workbook.close()
+
+
+def read_sheet_rows(source, sheet_name: Optional[str] = None,
+                    limits: Optional[UploadLimits] = None) -> List[list]:
+    """시트의 행을 모두 읽어 직사각형 목록으로 반환합니다 (뒤쪽 빈 행 제외)"""
+    rows = []
+    last_row_with_data = -1
+    width = 0
+    for row_number, values in enumerate(iter_sheet_rows(source, sheet_name, limits)):
+        if values:
+            last_row_with_data = row_number
+            width = max(width, len(values))
+        rows.append(values)
+
+    rows = rows[:last_row_with_data + 1]
+    for values in rows:
+        if len(values) < width:
+            values.extend([''] * (width - len(values)))
+    return rows
+
+
+def read_transcript(source, sheet_name: Optional[str] = None,
+                    limits: Optional[UploadLimits] = None) -> pd.DataFrame:
+    """업로드된 성적표를 DataFrame으로 읽습니다.
+
+    결과는 pd.read_excel(source)와 같은 값/타입을 가지므로 기존 cleaner가 그대로
+    동작합니다. xlsx가 아닌 파일(xls 등)은 pd.read_excel로 처리합니다. 행 수/열 수
+    제한(limits, 기본은 settings.UPLOAD_LIMITS)을 넘으면 UploadRejected가 발생합니다.
+    """
+    limits = limits or UploadLimits.from_settings()
+    _rewind(source)
+    if not zipfile.is_zipfile(source):
+        logger.debug("xlsx 형식이 아니므로 pd.read_excel로 읽습니다")
+        _rewind(source)
+        # 데이터 행을 max_rows개까지만 읽음 (헤더 행을 더하면 max_rows를 넘는지로 판단)
+        df = pd.read_excel(source, nrows=limits.max_rows)
+        check_row(len(df) + 1, df.shape[1], limits)
+        return df
+
+    rows = read_sheet_rows(source, sheet_name, limits)
+    if not rows:
+        return pd.DataFrame()
+
+    # pd.read_excel과 동일하게 첫 행을 헤더로 쓰고 타입 추론도 같은 파서에 맡김
+    parser = TextParser(rows, header=0, skip_blank_lines=False)
+    try:
+        df = parser.read()
+    finally:
+        parser.close()
+    logger.debug("성적표 읽기 완료 - 크기: %s", df.shape)
+    return df
+
+
+def _read_credit_confirmation(source, limits: UploadLimits) -> Optional[pd.DataFrame]:
+    """취득학점확인원이면 xlsx_reader로 읽어 정제까지 마친 DataFrame을 반환합니다"""
+    cleaner = FlexibleCleaner()
+    token_rows_iter = iter_row_tokens(source, limits)
+    head = [row for _, row in zip(range(10), token_rows_iter)]
+    if not cleaner.detector._is_credit_confirmation_rows(head):
+        token_rows_iter.close()
+        return None
+
+    token_rows = head + list(token_rows_iter)
+    df = cleaner.clean_row_tokens(token_rows)
+    df.attrs['cleaned_by'] = 'cleaner2'
+    df.attrs['clean_reason'] = '취득학점확인원 형식 (xlsx 직접 읽기)'
+    return df
+
+
+def load_transcript(source, limits: Optional[UploadLimits] = None) -> pd.DataFrame:
+    """업로드 파일을 읽어 분석기에 넘길 DataFrame을 반환합니다.
+
+    취득학점확인원 형식은 zip/XML을 직접 읽어 바로 정제된 DataFrame을 반환하고
+    (attrs['cleaned_by']로 표시), 그 외 형식은 read_transcript 결과를 반환합니다.
+    파싱 전에 guard_workbook으로 크기를 확인하고, 읽는 동안에도 행 수/열 수 제한을
+    지킵니다 (넘으면 UploadRejected).
+    """
+    limits = limits or UploadLimits.from_settings()
+    with stage('read'):
+        started = time.perf_counter()
+        guard_workbook(source, limits)
+        _rewind(source)
+        if zipfile.is_zipfile(source):
+            try:
+                df = _read_credit_confirmation(source, limits)
+                if df is not None:
+                    metrics.observe_seconds('myapp_parse_seconds', started, path='xlsx_reader')
+                    return df
+            except UploadRejected:
+                raise
+            except Exception as e:
+                logger.warning("취득학점확인원 직접 읽기 실패, 일반 경로로 처리: %s", e)
+
+        df = read_transcript(source, limits=limits)
+        metrics.observe_seconds('myapp_parse_seconds', started, path='read')
+        return df
+
+
+def student_id_from_filename(filename: str) -> Optional[str]:
+    """파일명에 들어 있는 학번 (8~10자리 숫자, 없으면 None)"""
+    match = STUDENT_ID_PATTERN.search(filename)
+    return match.group(1) if match else None
@@ -0,0 +1,137 @@
+import io
+import logging
+import threading
+from datetime import timedelta
+from typing import Optional
+
+from django.db import DatabaseError, close_old_connections, connection
+from django.utils import timezone
+from myapp.models import AnalysisJob
+from myapp.models.graduation_requirement import GraduationRequirementManager
+from myapp.services.parse_cache import load_cached_transcript
+from myapp.services.upload_guard import UploadLimits, check_upload_size
+from myapp.services.graduation.graduation_analyzer import GraduationAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_upload(upload, student_id: str, student_type: str, internship_completed: str) -> AnalysisJob:
+    """업로드 파일을 분석 작업으로 등록 (파싱은 워커가 함)
+
+    DB에 넣기 전에 업로드 크기 제한을 확인합니다 (넘으면 UploadRejected).
+    """
+    check_upload_size(upload, UploadLimits.from_settings())
+    return AnalysisJob.objects.create(
+        filename=getattr(upload, 'name', '') or '',
+        payload=b''.join(upload.chunks()),
+        student_id=student_id,
+        student_type=student_type,
+        # 학번에서 입학년도 추출 (예: 201110207 -> 2011)
+        admission_year=int(student_id[:4]),
+        internship_completed=internship_completed,
+    )
+
+
+def requeue_stale_jobs(older_than: timedelta) -> int:
+    """워커가 죽어 오래 '분석 중'으로 남은 작업을 다시 대기로 돌림"""
+    return AnalysisJob.objects.filter(
+        status=AnalysisJob.Status.RUNNING,
+        started_at__lt=timezone.now() - older_than,
+    ).update(status=AnalysisJob.Status.QUEUED, started_at=None)
+
+
+def claim_next_job() -> Optional[AnalysisJob]:
+    """대기 중인 가장 오래된 작업을 가져옴 (여러 워커가 같은 작업을 잡지 않도록 조건부 update)"""
+    queued = AnalysisJob.objects.filter(status=AnalysisJob.Status.QUEUED)
+    for job_id in queued.values_list('id', flat=True)[:10]:
+        claimed = AnalysisJob.objects.filter(id=job_id, status=AnalysisJob.Status.QUEUED).update(
+            status=AnalysisJob.Status.RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            return AnalysisJob.objects.get(id=job_id)
+    return None
+
+
+def run_job(job: AnalysisJob):
+    """작업 하나를 분석하고 결과를 저장"""
+    logger.info("분석 작업 시작: %s (%s)", job.id, job.filename)
+    try:
+        df = load_cached_transcript(io.BytesIO(bytes(job.payload)))
+        result = GraduationAnalyzer().analyze(df, job.student_type, job.admission_year, job.internship_completed)
+        if 'error' in result:
+            job.status = AnalysisJob.Status.FAILED
+            job.error = result['error']
+        else:
+            # 남은 학점 계산
+            requirement = GraduationRequirementManager().get_requirement(job.admission_year, job.student_type)
+            result['remaining_credits'] = max(0, requirement.total_credits - result['total_credits'])
+            job.status = AnalysisJob.Status.DONE
+            job.result = result
+    except Exception as e:
+        logger.error("분석 작업 실패: %s - %s", job.id, e)
+        job.status = AnalysisJob.Status.FAILED
+        job.error = str(e)
+    job.payload = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'result_json', 'payload', 'finished_at'])
+    logger.info("분석 작업 종료: %s (%s)", job.id, job.status)
+
+
+def _requeue(job: AnalysisJob):
+    """처리 중 오류(DB 잠김 등)로 결과를 저장하지 못한 작업을 다시 대기로 돌림"""
+    try:
+        AnalysisJob.objects.filter(id=job.id, status=AnalysisJob.Status.RUNNING).update(
+            status=AnalysisJob.Status.QUEUED, started_at=None
+        )
+    except DatabaseError:
+        # 여기서도 실패하면 재시작 때 requeue_stale_jobs가 돌려놓음
+        logger.exception("분석 작업을 대기로 돌리지 못함: %s", job.id)
+
+
+def _work(poll_interval: float, once: bool, stop_event: threading.Event):
+    try:
+        while not stop_event.is_set():
+            close_old_connections()
+            job = None
+            try:
+                job = claim_next_job()
+                if job is not None:
+                    run_job(job)
+                    continue
+                if once:
+                    return
+            except Exception:
+                # 작업 하나의 오류로 작업 스레드가 멈추지 않도록 기록하고 잠시 뒤 다시 시도
+                logger.exception("분석 작업 처리 오류: %s", job.id if job is not None else '작업 가져오기')
+                if job is not None:
+                    _requeue(job)
+            stop_event.wait(poll_interval)
+    finally:
+        if threading.current_thread() is not threading.main_thread():
+            connection.close()
+
+
+def run_worker(threads: int = 1, poll_interval: float = 1.0, once: bool = False,
+               stop_event: Optional[threading.Event] = None):
+    """대기 중인 작업을 처리 (once면 대기열이 빌 때까지만)
+
+    threads가 1이면 현재 스레드에서, 그보다 크면 작업 스레드 여러 개로 처리합니다.
+    """
+    stop_event = stop_event or threading.Event()
+    if threads == 1:
+        _work(poll_interval, once, stop_event)
+        return
+    workers = [
+        threading.Thread(target=_work, args=(poll_interval, once, stop_event), name=f'analysis-job-{i}')
+        for i in range(threads)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            while worker.is_alive():
+                worker.join(timeout=0.5)
+    except KeyboardInterrupt:
+        stop_event.set()
+        for worker in workers:
+            worker.join()
@@ -0,0 +1,150 @@
+import os
+import json
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _default_path() -> Optional[str]:
+    """Django 설정의 LAYOUT_FINGERPRINT_FILE (설정 밖에서 쓰면 메모리에만 보관)"""
+    try:
+        from django.conf import settings
+        if settings.configured:
+            return getattr(settings, 'LAYOUT_FINGERPRINT_FILE', None)
+    except ImportError:
+        pass
+    return None
+
+
+class LayoutCache:
+    """레이아웃 지문 -> ExcelStructureDetector 구조 결과
+
+    path가 있으면 JSON 파일로 저장해 워커가 재시작돼도 유지됩니다 (함수를 넘기면 처음
+    쓸 때 경로를 구함). 여러 워커가 같은 파일을 쓰므로 저장할 때 파일 내용을 다시 읽어
+    합친 뒤 통째로 교체합니다. set은 메모리만 갱신하고, 파일 저장은 save_delay초 뒤
+    백그라운드 타이머(그 사이의 새 지문을 한 번에)와 프로세스 종료 때 flush가 합니다.
+    """
+
+    def __init__(self, path=None, max_entries: int = 256, save_delay: float = 5.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+        # 파일 쓰기끼리만 막음 (쓰는 동안에도 get/set은 _lock만 잠깐 잡음)
+        self._save_lock = threading.Lock()
+        self._loaded = False
+        self._dirty = False
+        self._timer: Optional[threading.Timer] = None
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint: str) -> Optional[Dict]:
+        with self._lock:
+            self._load()
+            structure = self._entries.get(fingerprint)
+            if structure is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return _copy(structure)
+
+    def set(self, fingerprint: str, structure: Dict):
+        with self._lock:
+            self._load()
+            self._entries[fingerprint] = _copy(structure)
+            self._trim()
+            if not self.path:
+                return
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        """저장하지 않은 지문이 있으면 파일에 저장"""
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+            self._save()
+
+    def discard(self, fingerprint: str):
+        """캐시된 구조가 시트와 맞지 않으면 버림 (다음 감지 결과로 다시 채워짐)"""
+        with self._lock:
+            self._entries.pop(fingerprint, None)
+
+    def clear(self):
+        """메모리의 지문만 비움 (파일은 그대로)"""
+        with self._lock:
+            self._load()
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+    def _trim(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_file(self) -> Dict[str, Dict]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("레이아웃 지문 파일 읽기 실패: %s", e)
+            return {}
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if callable(self.path):
+            self.path = self.path()
+        for fingerprint, structure in self._read_file().items():
+            self._entries.setdefault(fingerprint, structure)
+        self._trim()
+        logger.debug("레이아웃 지문 %d개 로드", len(self._entries))
+
+    def _save(self):
+        # 다른 워커가 저장한 지문도 잃지 않도록 합친 뒤 저장
+        saved = self._read_file()
+        with self._lock:
+            for fingerprint, structure in saved.items():
+                if fingerprint not in self._entries:
+                    self._entries[fingerprint] = structure
+                    self._entries.move_to_end(fingerprint, last=False)
+            self._trim()
+            entries = dict(self._entries)
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("레이아웃 지문 파일 저장 실패: %s", e)
+
+
+def _copy(structure: Dict) -> Dict:
+    """columns까지 복사 (호출한 쪽에서 구조를 수정해도 캐시에 영향 없도록)"""
+    copied = dict(structure)
+    copied['columns'] = dict(structure.get('columns') or {})
+    return copied
+
+
+layout_cache = LayoutCache(path=_default_path)
+atexit.register(layout_cache.flush)
@@ -0,0 +1,48 @@
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Iterable
+
+# 로거 이름 -> 그 로거의 원래 핸들러로 기록하는 리스너 (한 번만 설치)
+_listeners: Dict[str, QueueListener] = {}
+
+
+def install_queue_logging(logger_names: Iterable[str]) -> Dict[str, QueueListener]:
+    """로거의 핸들러(파일/콘솔)를 백그라운드 스레드로 옮기고 로거에는 QueueHandler만 남김
+
+    요청 스레드는 큐에 레코드를 넣기만 하므로 파일 쓰기(회전 포함)를 기다리지 않습니다.
+    원래 핸들러의 레벨은 그대로 지킵니다 (respect_handler_level). 큐에 남은 레코드는
+    프로세스 종료 때 리스너를 멈추면서 모두 기록합니다.
+    """
+    for name in logger_names:
+        if name in _listeners:
+            continue
+        logger = logging.getLogger(name)
+        handlers = list(logger.handlers)
+        if not handlers:
+            continue
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, *handlers, respect_handler_level=True)
+        for handler in handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(QueueHandler(records))
+        listener.start()
+        _listeners[name] = listener
+    return _listeners
+
+
+def stop_queue_logging():
+    """리스너를 멈추고(남은 레코드 기록) 원래 핸들러를 로거에 되돌림"""
+    for name, listener in list(_listeners.items()):
+        listener.stop()
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            if isinstance(handler, QueueHandler):
+                logger.removeHandler(handler)
+        for handler in listener.handlers:
+            logger.addHandler(handler)
+        del _listeners[name]
+
+
+atexit.register(stop_queue_logging)
@@ -0,0 +1,190 @@
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from myapp.services.conf import setting
+
+logger = logging.getLogger(__name__)
+
+# 초 단위 지연 시간 구간 (+Inf는 _count와 같음)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 업로드 크기 구간 (bytes)
+SIZE_BUCKETS = (16 * 1024, 64 * 1024, 256 * 1024, 1024 * 1024, 4 * 1024 * 1024, 16 * 1024 * 1024)
+
+# 이름 -> (종류, 설명, 히스토그램 구간)
+METRICS = {
+    'myapp_uploads_total': ('counter', '성적표 업로드 분석 요청 수 (outcome=ok|error|rejected)', None),
+    'myapp_upload_bytes': ('histogram', '업로드된 성적표 크기', SIZE_BUCKETS),
+    'myapp_parse_seconds': ('histogram', '성적표 읽기/정제 시간 (path=xlsx_reader|read|cleaner2|cleaner)', LATENCY_BUCKETS),
+    'myapp_cleaner_total': ('counter', '실행된 정제기 수 (cleaner="cleaner"는 cleaner2가 거절해 기존 정제기로 넘어간 경우)', None),
+    'myapp_cache_requests_total': ('counter', '캐시 조회 수 (cache=parse|layout, result=hit|miss)', None),
+    'myapp_stage_seconds': ('histogram', '요청 단계별 시간 (요건 분석기별 포함)', LATENCY_BUCKETS),
+}
+
+# (이름, 레이블 문자열, 필드) -> 값. 필드: ''(카운터), 'le=<구간>', 'sum', 'count'
+_Key = Tuple[str, str, str]
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in sorted(labels.items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class SharedMetricsStore:
+    """여러 gunicorn 워커가 함께 쓰는 SQLite 지표 저장소 (증가분만 더함)"""
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        if not self._initialized:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS metrics ('
+                'name TEXT NOT NULL, labels TEXT NOT NULL, field TEXT NOT NULL, value REAL NOT NULL, '
+                'PRIMARY KEY (name, labels, field))'
+            )
+            self._initialized = True
+        return conn
+
+    def add(self, deltas: Dict[_Key, float]):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT INTO metrics (name, labels, field, value) VALUES (?, ?, ?, ?) '
+                    'ON CONFLICT (name, labels, field) DO UPDATE SET value = value + excluded.value',
+                    [(name, labels, field, value) for (name, labels, field), value in deltas.items()],
+                )
+        finally:
+            conn.close()
+
+    def read(self) -> Dict[_Key, float]:
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT name, labels, field, value FROM metrics').fetchall()
+        finally:
+            conn.close()
+        return {(name, labels, field): value for name, labels, field, value in rows}
+
+
+class MetricsRegistry:
+    """프로세스 안에서 지표 증가분을 모았다가 공유 저장소로 내보냄
+
+    inc/observe는 메모리 dict만 갱신하므로 요청 처리 중에 불러도 가볍습니다. flush는
+    요청이 끝날 때 미들웨어가, 그리고 /metrics 조회와 프로세스 종료 때 부릅니다.
+    """
+
+    def __init__(self, path=None, enabled: bool = False):
+        self.path = path
+        self.enabled = enabled
+        self._store: Optional[SharedMetricsStore] = None
+        self._pending: Dict[_Key, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _labels(labels), '')
+        with self._lock:
+            self._pending[key] = self._pending.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        label_text = _labels(labels)
+        buckets = METRICS[name][2]
+        with self._lock:
+            pending = self._pending
+            for bound in buckets:
+                if value <= bound:
+                    key = (name, label_text, f'le={_number(bound)}')
+                    pending[key] = pending.get(key, 0) + 1
+            for field, amount in (('sum', value), ('count', 1)):
+                key = (name, label_text, field)
+                pending[key] = pending.get(key, 0) + amount
+
+    def observe_seconds(self, name: str, started: float, **labels):
+        """started(time.perf_counter 값)부터 지금까지를 observe"""
+        self.observe(name, time.perf_counter() - started, **labels)
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def store(self) -> SharedMetricsStore:
+        if self._store is None:
+            path = self.path() if callable(self.path) else self.path
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._store = SharedMetricsStore(path)
+        return self._store
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            self.store().add(pending)
+        except sqlite3.Error as e:
+            # 저장소가 잠겨 있으면 다음 flush 때 다시 시도
+            logger.warning("지표 저장 실패: %s", e)
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + value
+
+    def render(self) -> str:
+        """모든 워커의 지표를 Prometheus 텍스트 형식으로"""
+        self.flush()
+        values = self.store().read()
+        grouped: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (name, labels, field), value in values.items():
+            grouped.setdefault(name, {}).setdefault(labels, {})[field] = value
+
+        lines = []
+        for name, (kind, help_text, buckets) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, fields in sorted(grouped.get(name, {}).items()):
+                if kind == 'counter':
+                    lines.append(f'{name}{_braces(labels)} {_number(fields.get("", 0))}')
+                    continue
+                count = fields.get('count', 0)
+                for bound in buckets:
+                    le = _number(bound)
+                    bucket_labels = _braces(labels, f'le="{le}"')
+                    lines.append(f'{name}_bucket{bucket_labels} {_number(fields.get(f"le={le}", 0))}')
+                inf_labels = _braces(labels, 'le="+Inf"')
+                lines.append(f'{name}_bucket{inf_labels} {_number(count)}')
+                lines.append(f'{name}_sum{_braces(labels)} {_number(fields.get("sum", 0))}')
+                lines.append(f'{name}_count{_braces(labels)} {_number(count)}')
+        return '\n'.join(lines) + '\n'
+
+
+def _braces(*labels: Iterable[str]) -> str:
+    text = ','.join(label for label in labels if label)
+    return f'{{{text}}}' if text else ''
+
+
+def _default_path() -> str:
+    return settings.METRICS_DB
+
+
+metrics = MetricsRegistry(path=_default_path, enabled=setting('METRICS_ENABLED', False))
+atexit.register(metrics.flush)
@@ -0,0 +1,52 @@
+import pandas as pd
+from myapp.config.requirements.base import BaseRequirements
+
+# 정규화를 마친 DataFrame에 붙이는 attrs 키 (붙어 있으면 다음 단계는 건너뜀)
+NORMALIZED_ATTR = 'normalized'
+
+# 과목명 매핑 (이전 과목명 -> 현재 과목명, 졸업요건 설정과 같은 표)
+COURSE_NAME_MAPPING = dict(BaseRequirements.COURSE_NAME_MAPPING)
+
+# 과목 구분 매핑 (약칭 -> 정식 명칭)
+COURSE_TYPE_MAPPING = {
+    '기교': '기초교양',
+    '핵교': '핵심교양',
+    '일교': '일반교양',
+    '지교': '지정교양',
+    '지필': '지정교양필수',
+    '전선': '전공선택',
+    '전필': '전공필수',
+    '일선': '일반선택',
+    '심교': '심화교양',
+    '다선': '다전공선택',
+    '다지': '다전공지교',
+    '다필': '다전공필수',
+}
+
+
+def _map_values(series: pd.Series, mapping) -> pd.Series:
+    """매핑에 있는 값만 바꾸고 나머지는 그대로 둠 (해시 조회 한 번)"""
+    mapped = series.map(mapping)
+    return mapped.where(mapped.notna(), series)
+
+
+def normalize_courses(df: pd.DataFrame, course_name_mapping=None, course_type_mapping=None) -> pd.DataFrame:
+    """과목명 공백 제거, 과목명/과목구분 매핑을 한 번에 적용 (df를 제자리에서 수정)
+
+    이미 정규화한 DataFrame(attrs[NORMALIZED_ATTR])은 그대로 반환합니다.
+    """
+    if df.attrs.get(NORMALIZED_ATTR):
+        return df
+
+    if 'course_name' in df.columns:
+        df['course_name'] = _map_values(
+            df['course_name'].str.replace(' ', ''),
+            COURSE_NAME_MAPPING if course_name_mapping is None else course_name_mapping,
+        )
+    if 'course_type' in df.columns:
+        df['course_type'] = _map_values(
+            df['course_type'],
+            COURSE_TYPE_MAPPING if course_type_mapping is None else course_type_mapping,
+        )
+    df.attrs[NORMALIZED_ATTR] = True
+    return df
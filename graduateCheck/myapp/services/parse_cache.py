@@ -0,0 +1,207 @@
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import pandas as pd
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+from myapp.services.ingestion import load_transcript
+from myapp.services.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 정제 결과를 캐시에 넣을 때 쓰는 DataFrame.attrs 키 (업로드 바이트의 sha256)
+DIGEST_ATTR = 'upload_digest'
+# 재분석 토큰 서명용 salt
+TOKEN_SALT = 'myapp.parse_cache.transcript'
+
+
+class _HashingMixin:
+    """업로드가 들어오는 동안 청크 단위로 sha256을 계산해 파일 객체에 붙입니다"""
+
+    def new_file(self, *args, **kwargs):
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        data = super().receive_data_chunk(raw_data, start)
+        # None이면 이 핸들러가 청크를 저장한 것 (다음 핸들러로 넘긴 청크는 그쪽에서 계산)
+        if data is None:
+            self.sha256.update(raw_data)
+        return data
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.sha256.hexdigest()
+        return file
+
+
+class HashingMemoryFileUploadHandler(_HashingMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(_HashingMixin, TemporaryFileUploadHandler):
+    pass
+
+
+def upload_digest(upload) -> str:
+    """업로드 파일의 sha256 (업로드 핸들러가 계산해 두지 않았다면 청크 단위로 계산)"""
+    digest = getattr(upload, 'sha256', None)
+    if digest:
+        return digest
+
+    sha256 = hashlib.sha256()
+    if hasattr(upload, 'chunks'):
+        for chunk in upload.chunks():
+            sha256.update(chunk)
+    else:
+        upload.seek(0)
+        for chunk in iter(lambda: upload.read(64 * 1024), b''):
+            sha256.update(chunk)
+    upload.seek(0)
+    return sha256.hexdigest()
+
+
+class ParseCache:
+    """업로드 바이트 해시 -> 정제된 과목 DataFrame (LRU + TTL)
+
+    분석기가 정제 결과를 제자리에서 수정하므로 넣을 때와 꺼낼 때 모두 복사본을 씁니다.
+    shared(Django 캐시 별칭)가 있으면 정제 결과를 그 캐시에도 넣고, 이 프로세스 메모리에
+    없을 때 찾습니다. gunicorn 워커마다 메모리가 따로라서 재분석 요청이 업로드를 받은
+    워커와 다른 워커로 가도 같은 결과를 쓰기 위함입니다.
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 1800, clock=time.monotonic,
+                 shared: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.shared = shared
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < self.clock():
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1].copy()
+
+        df = self._shared_get(key)
+        with self._lock:
+            if df is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, df)
+        return df
+
+    def set(self, key: str, df: pd.DataFrame):
+        with self._lock:
+            self._store(key, df)
+        self._shared_set(key, df)
+
+    def clear(self):
+        """이 프로세스 메모리만 비움 (공유 캐시는 그대로)"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _store(self, key: str, df: pd.DataFrame):
+        self._entries[key] = (self.clock() + self.ttl, df.copy())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _shared_get(self, key: str) -> Optional[pd.DataFrame]:
+        if not self.shared:
+            return None
+        try:
+            return caches[self.shared].get(key)
+        except Exception as e:
+            # 공유 캐시를 못 읽으면 메모리 캐시만으로 계속
+            logger.warning("공유 파싱 캐시 읽기 실패: %s", e)
+            return None
+
+    def _shared_set(self, key: str, df: pd.DataFrame):
+        if not self.shared:
+            return
+        try:
+            caches[self.shared].set(key, df, timeout=self.ttl)
+        except Exception as e:
+            logger.warning("공유 파싱 캐시 저장 실패: %s", e)
+
+
+parse_cache = ParseCache(
+    max_entries=getattr(settings, 'PARSE_CACHE_MAX_ENTRIES', 128),
+    ttl=getattr(settings, 'PARSE_CACHE_TTL', 1800),
+    shared=getattr(settings, 'PARSE_CACHE_SHARED', None),
+)
+
+
+def load_cached_transcript(upload) -> pd.DataFrame:
+    """같은 파일을 다시 올리면 정제된 DataFrame을 바로 반환하고, 처음이면 읽기만 합니다.
+
+    처음 읽은 DataFrame에는 attrs[DIGEST_ATTR]를 붙여 두고, smart_clean_dataframe이
+    정제를 마치면 remember_cleaned로 캐시에 넣습니다.
+    """
+    digest = upload_digest(upload)
+    df = parse_cache.get(digest)
+    if df is not None:
+        logger.info("파싱 캐시 적중 - %s", parse_cache.stats())
+        metrics.inc('myapp_cache_requests_total', cache='parse', result='hit')
+        return df
+
+    logger.info("파싱 캐시 미스 - %s", parse_cache.stats())
+    metrics.inc('myapp_cache_requests_total', cache='parse', result='miss')
+    df = load_transcript(upload)
+    df.attrs[DIGEST_ATTR] = digest
+    return df
+
+
+def remember_cleaned(source: pd.DataFrame, cleaned: pd.DataFrame):
+    """source가 업로드에서 읽은 DataFrame이면 정제 결과를 캐시에 넣습니다"""
+    digest = source.attrs.get(DIGEST_ATTR)
+    if not digest:
+        return
+    cleaned.attrs.pop(DIGEST_ATTR, None)
+    parse_cache.set(digest, cleaned)
+
+
+def transcript_token(digest: str) -> str:
+    """캐시된 정제 결과를 가리키는 서명된 토큰 (파일 없이 다시 분석할 때 사용)"""
+    return signing.dumps(digest, salt=TOKEN_SALT)
+
+
+def load_transcript_by_token(token: str) -> Optional[pd.DataFrame]:
+    """토큰의 정제된 DataFrame (위조됐거나 캐시에서 밀려났으면 None, 다른 워커가 넣은 결과는 공유 캐시에서)"""
+    try:
+        digest = signing.loads(token, salt=TOKEN_SALT, max_age=parse_cache.ttl)
+    except signing.BadSignature:
+        logger.warning("재분석 토큰 검증 실패")
+        return None
+    return parse_cache.get(digest)
@@ -0,0 +1,53 @@
+import cProfile
+import os
+import pstats
+import time
+import uuid
+from typing import Any, Callable, Tuple
+
+# 요약에 넣을 함수의 위치 (myapp/services 아래 코드만)
+SERVICES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def profile_call(func: Callable[[], Any]) -> Tuple[Any, cProfile.Profile]:
+    """func()를 cProfile로 실행 -> (반환값, 프로파일)
+
+    cProfile은 호출한 스레드만 기록하므로 분석 풀 등 다른 스레드의 작업은 빠집니다.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = func()
+    finally:
+        profiler.disable()
+    return result, profiler
+
+
+def summarize(profiler: cProfile.Profile, limit: int = 25, root: str = SERVICES_DIR) -> str:
+    """root 아래 함수들을 누적 시간순으로 정리한 요약 텍스트"""
+    stats = pstats.Stats(profiler)
+    # 'myapp/services/cleaner2.py'처럼 패키지부터 표시
+    base = os.path.dirname(os.path.dirname(root))
+    rows = []
+    for (filename, lineno, function), (_, calls, own, cumulative, _) in stats.stats.items():
+        if os.path.abspath(filename).startswith(root + os.sep):
+            rows.append((cumulative, own, calls, f"{os.path.relpath(filename, base)}:{lineno}({function})"))
+    rows.sort(reverse=True)
+
+    lines = [
+        f"전체 {stats.total_tt * 1000:.1f}ms, {os.path.relpath(root, base)} 함수 누적 시간 상위 {min(limit, len(rows))}개",
+        f"{'cumulative':>12} {'own':>10} {'calls':>8}  function",
+    ]
+    for cumulative, own, calls, name in rows[:limit]:
+        lines.append(f"{cumulative * 1000:>10.1f}ms {own * 1000:>8.1f}ms {calls:>8}  {name}")
+    return '\n'.join(lines) + '\n'
+
+
+def save_profile(profiler: cProfile.Profile, directory: str, label: str, limit: int = 25) -> str:
+    """프로파일(.prof, pstats/snakeviz용)과 요약(.txt)을 저장하고 파일 이름(확장자 제외)을 반환"""
+    os.makedirs(directory, exist_ok=True)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}"
+    profiler.dump_stats(os.path.join(directory, f'{name}.prof'))
+    with open(os.path.join(directory, f'{name}.txt'), 'w', encoding='utf-8') as f:
+        f.write(summarize(profiler, limit))
+    return name
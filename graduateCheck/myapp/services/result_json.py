@@ -0,0 +1,14 @@
+import json
+import numpy as np
+
+
+def json_default(value):
+    """numpy 스칼라 등 json이 모르는 값 변환"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def dumps_result(result) -> str:
+    """분석 결과 dict를 JSON 문자열로 (한글은 그대로)"""
+    return json.dumps(result, ensure_ascii=False, default=json_default)
@@ -0,0 +1,172 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# 토큰 분류 (한 토큰이 여러 분류에 속할 수 있으므로 비트 플래그)
+TYPE = 1        # 과목구분 (전선, 지교 ...)
+TOTAL = 2       # 총학점 (12.0, (12.0))
+SEMESTER = 4    # 학기 (22/1, 22/2 1, (계)24/1 3)
+CODE = 8        # 과목코드 (BAGA49118, BKSA56558(SW))
+NAME = 16       # 과목명 (한글 포함 2자 이상, 숫자/성적 아님)
+CREDIT = 32     # 학점 (0.5 ~ 6.0 사이 숫자)
+GRADE = 64      # 성적 (A+, B0, P ...)
+
+_TOTAL_PATTERN = re.compile(r'^(\d+\.\d+|\(\d+\.\d+\))$')
+_SEMESTER_PATTERN = re.compile(r'^(\([^)]+\))?(\d{2})/(\d)(\s+\d)?$')
+_CODE_PATTERN = re.compile(r'^[A-Z]+\d+')
+_NUMBER_PATTERN = re.compile(r'^\d+(\.\d+)?$')
+_HANGUL_PATTERN = re.compile(r'[가-힣]')
+
+# 상태
+HEAD = 'head'                # 행 앞쪽 과목구분 찾는 중
+SKIP_TOTAL = 'skip_total'    # 과목구분 뒤 총학점 건너뛰는 중
+SCAN = 'scan'                # 다음 학기 찾는 중
+EXPECT_CODE = 'expect_code'  # 학기 바로 다음 (과목코드 자리)
+EXPECT_NAME = 'expect_name'
+EXPECT_CREDIT = 'expect_credit'
+EXPECT_GRADE = 'expect_grade'
+
+# 상태별 전이표: 상태 -> [(플래그, 동작, 다음 상태, 토큰 소비 여부), ...]
+# 위에서부터 처음 일치하는 항목을 적용하고, 플래그가 0이면 항상 일치합니다.
+TRANSITIONS: Dict[str, List[Tuple[int, Optional[str], str, bool]]] = {
+    HEAD: [
+        (TYPE, None, SKIP_TOTAL, True),
+        (0, None, HEAD, True),
+    ],
+    SKIP_TOTAL: [
+        (TOTAL, None, SKIP_TOTAL, True),
+        (0, None, SCAN, False),
+    ],
+    SCAN: [
+        (SEMESTER, 'start', EXPECT_CODE, True),
+        (0, None, SCAN, True),
+    ],
+    EXPECT_CODE: [
+        (CODE, None, EXPECT_NAME, True),
+        (0, None, EXPECT_NAME, False),
+    ],
+    EXPECT_NAME: [
+        (NAME, 'name', EXPECT_CREDIT, True),
+        (0, None, EXPECT_NAME, True),
+    ],
+    EXPECT_CREDIT: [
+        (CREDIT, 'credits', EXPECT_GRADE, True),
+        (0, None, EXPECT_CREDIT, True),
+    ],
+    EXPECT_GRADE: [
+        (GRADE, 'grade', SCAN, True),
+        # 성적 없이 다음 학기가 나오면 현재 과목을 마치고 그 학기부터 다시 시작
+        (SEMESTER, 'emit', SCAN, False),
+        (0, None, EXPECT_GRADE, True),
+    ],
+}
+
+
+class Token(NamedTuple):
+    flags: int
+    year: Optional[int] = None
+    semester: Optional[str] = None
+    credits: Optional[int] = None
+
+
+# 같은 토큰(학기, 학점, 성적, 과목명)은 행과 업로드를 넘나들며 반복되므로 분류 결과를 캐시
+@lru_cache(maxsize=4096)
+def _classify(value: str, course_types: frozenset, grade_values: frozenset) -> Token:
+    """토큰 하나를 분류합니다 (학기면 연도/학기, 학점이면 학점 값도 함께)"""
+    flags = 0
+    year = semester = credits = None
+
+    if value in course_types:
+        flags |= TYPE
+    if value in grade_values:
+        flags |= GRADE
+    if _TOTAL_PATTERN.match(value):
+        flags |= TOTAL
+
+    semester_match = _SEMESTER_PATTERN.match(value)
+    if semester_match:
+        flags |= SEMESTER
+        year = 2000 + int(semester_match.group(2))
+        semester = f"{semester_match.group(3)}학기"
+
+    if _CODE_PATTERN.match(value) or '(' in value:
+        flags |= CODE
+
+    if _NUMBER_PATTERN.match(value):
+        number = float(value)
+        if 0.5 <= number <= 6.0:  # 합리적인 학점 범위
+            flags |= CREDIT
+            credits = int(number)
+    elif len(value) >= 2 and not flags & GRADE and _HANGUL_PATTERN.search(value):
+        flags |= NAME
+
+    return Token(flags, year, semester, credits)
+
+
+class CreditRowTokenizer:
+    """취득학점확인원 한 행의 토큰을 한 번씩만 분류하고 한 번의 순회로 과목을 뽑아내는 상태 기계
+
+    FlexibleCleaner의 기존 행 파싱 규칙(과목구분/총학점 건너뛰기, 학기로 과목 시작,
+    과목코드는 한 칸만 건너뛰기, 학점 기본값 3, 성적 기본값 P)을 그대로 따릅니다.
+    """
+
+    def __init__(self, course_types: Iterable[str], grade_values: Iterable[str]):
+        self.course_types = frozenset(course_types)
+        self.grade_values = frozenset(grade_values)
+
+    def classify(self, value: str) -> Token:
+        """토큰 하나를 분류합니다"""
+        return _classify(value, self.course_types, self.grade_values)
+
+    def extract_courses(self, row_values: List[str], course_type: str) -> List[Dict]:
+        """한 행에서 과목 목록을 추출합니다"""
+        tokens = [self.classify(value) for value in row_values]
+        n = len(tokens)
+        courses = []
+        course = None
+
+        # 과목구분이 행 앞쪽(세 번째 토큰까지)에 있으면 과목구분과 총학점부터 건너뜀
+        state = HEAD if any(token.flags & TYPE for token in tokens[:3]) else SCAN
+        i = 0
+        while i < n:
+            token = tokens[i]
+            for flag, action, next_state, consume in TRANSITIONS[state]:
+                if flag == 0 or token.flags & flag:
+                    break
+
+            if action == 'start':
+                course = {'year': token.year, 'semester': token.semester}
+            elif action == 'name':
+                course['course_name'] = row_values[i]
+            elif action == 'credits':
+                course['credits'] = token.credits
+            elif action == 'grade':
+                course['grade'] = row_values[i]
+                courses.append(self._finish(course, course_type, i + 1))
+                course = None
+            elif action == 'emit':
+                courses.append(self._finish(course, course_type, i))
+                course = None
+
+            state = next_state
+            if consume:
+                i += 1
+
+        # 행 끝: 과목명을 찾은 과목만 기본값을 채워 마무리 (과목명이 없으면 이후 과목도 없음)
+        if state in (EXPECT_CREDIT, EXPECT_GRADE):
+            courses.append(self._finish(course, course_type, n))
+
+        return courses
+
+    @staticmethod
+    def _finish(course: Dict, course_type: str, next_index: int) -> Dict:
+        """기본값을 채우고 기존 출력과 같은 키 순서로 과목 레코드를 만듭니다"""
+        return {
+            'year': course['year'],
+            'semester': course['semester'],
+            'course_name': course['course_name'],
+            'credits': course.get('credits', 3),
+            'grade': course.get('grade', 'P'),
+            'next_index': next_index,
+            'course_type': course_type,
+        }
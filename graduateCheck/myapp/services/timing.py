@@ -0,0 +1,158 @@
+import bisect
+import contextvars
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from myapp.services.conf import setting
+
+# 요청 처리 중인 StageTimer (없으면 stage()는 아무것도 하지 않음)
+_current_timer = contextvars.ContextVar('stage_timer', default=None)
+
+# 누적 히스토그램 구간 상한 (ms)
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+
+
+class _NullStage:
+    """타이밍이 꺼져 있을 때 쓰는 빈 컨텍스트 (객체 생성도 하지 않도록 하나만 둠)"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('timer', 'name', 'started')
+
+    def __init__(self, timer: 'StageTimer', name: str):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.started = self.timer.clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.timer.add(self.name, self.timer.clock() - self.started)
+        return False
+
+
+class StageTimer:
+    """요청 하나의 단계별 소요 시간
+
+    같은 단계를 여러 번 지나면 합산합니다. 분석 풀 스레드에서도 기록하므로 잠금을 씁니다.
+    단계는 겹칠 수 있습니다 (예: clean 안의 detect).
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.durations: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, seconds: float):
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def seconds(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self.durations)
+
+    def milliseconds(self) -> Dict[str, float]:
+        with self._lock:
+            return {name: round(seconds * 1000, 1) for name, seconds in self.durations.items()}
+
+    def server_timing(self, total_ms: Optional[float] = None) -> str:
+        """Server-Timing 헤더 값 (예: read;dur=12.3, clean;dur=4.0, total;dur=20.1)"""
+        metrics = [f"{name};dur={ms}" for name, ms in self.milliseconds().items()]
+        if total_ms is not None:
+            metrics.append(f"total;dur={total_ms}")
+        return ', '.join(metrics)
+
+
+def stage(name: str):
+    """단계 소요 시간을 재는 컨텍스트 (요청 타이머가 없으면 빈 컨텍스트)
+
+        with stage('read'):
+            df = load_transcript(upload)
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        return _NULL_STAGE
+    return _Stage(timer, name)
+
+
+def start_timer() -> tuple:
+    """현재 컨텍스트에 새 타이머를 설치 -> (타이머, reset 토큰)"""
+    timer = StageTimer()
+    return timer, _current_timer.set(timer)
+
+
+def stop_timer(token):
+    _current_timer.reset(token)
+
+
+def current_timer() -> Optional[StageTimer]:
+    return _current_timer.get()
+
+
+class StageHistograms:
+    """단계별 최근 소요 시간(ms) 창과 그 분포
+
+    단계마다 최근 window개만 남기므로 오래 실행해도 메모리가 늘지 않습니다.
+    """
+
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, durations_ms: Dict[str, float]):
+        with self._lock:
+            for name, ms in durations_ms.items():
+                samples = self._samples.get(name)
+                if samples is None:
+                    samples = self._samples[name] = deque(maxlen=self.window)
+                samples.append(ms)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self) -> Dict[str, dict]:
+        """단계 -> 개수, 합계, 백분위수, 누적 구간 개수"""
+        with self._lock:
+            samples = {name: sorted(values) for name, values in self._samples.items()}
+
+        result = {}
+        for name, values in samples.items():
+            count = len(values)
+            result[name] = {
+                'count': count,
+                'sum': round(sum(values), 1),
+                'p50': percentile(values, 0.50),
+                'p95': percentile(values, 0.95),
+                'p99': percentile(values, 0.99),
+                'max': values[-1],
+                'buckets': {bound: bisect.bisect_right(values, bound) for bound in BUCKETS_MS},
+            }
+        return result
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """정렬된 값의 백분위수 (가장 가까운 순위, 보간 없음)"""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+stage_histograms = StageHistograms(window=setting('STAGE_TIMING_WINDOW', 1024))
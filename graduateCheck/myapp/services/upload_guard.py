@@ -0,0 +1,101 @@
+import os
+import re
+import zipfile
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from myapp.services.conf import setting
+
+# <dimension ref="A1:AJ120"/> 의 마지막 셀 (열 문자, 행 번호)
+_DIMENSION_PATTERN = re.compile(r'(?:[A-Z]+\d+:)?([A-Z]+)(\d+)$')
+# 이보다 작은 부분 파일은 압축률을 보지 않음 (작은 XML은 원래 압축이 잘 됨)
+RATIO_MIN_BYTES = 1024 * 1024
+
+
+class UploadRejected(ValueError):
+    """크기/차원 제한을 넘어 파싱하지 않고 거절한 업로드 (메시지는 사용자에게 그대로 보임)"""
+
+
+@dataclass(frozen=True)
+class UploadLimits:
+    max_upload_bytes: int = 10 * 1024 * 1024        # 업로드 파일 크기
+    max_part_bytes: int = 50 * 1024 * 1024          # zip 안 파일 하나의 압축 해제 크기
+    max_uncompressed_bytes: int = 100 * 1024 * 1024 # zip 전체 압축 해제 크기
+    max_compression_ratio: int = 100                # zip 안 파일의 압축률 (압축 해제 / 압축)
+    max_rows: int = 5000                            # 시트 행 수
+    max_columns: int = 200                          # 시트 열 수
+
+    @classmethod
+    def from_settings(cls) -> 'UploadLimits':
+        """settings.UPLOAD_LIMITS의 값으로 기본값을 덮어씀"""
+        return cls(**setting('UPLOAD_LIMITS', {}))
+
+
+def upload_size(source) -> Optional[int]:
+    """업로드 파일(UploadedFile, 파일 객체, 경로)의 크기 (알 수 없으면 None)"""
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    size = getattr(source, 'size', None)
+    if size is not None:
+        return size
+    if hasattr(source, 'seek') and hasattr(source, 'tell'):
+        position = source.tell()
+        size = source.seek(0, os.SEEK_END)
+        source.seek(position)
+        return size
+    return None
+
+
+def check_upload_size(source, limits: UploadLimits):
+    size = upload_size(source)
+    if size is not None and size > limits.max_upload_bytes:
+        raise UploadRejected(
+            f"파일이 너무 큽니다 ({size // 1024:,}KB). "
+            f"{limits.max_upload_bytes // 1024:,}KB 이하의 성적표만 분석할 수 있습니다."
+        )
+
+
+def check_archive(archive: zipfile.ZipFile, limits: UploadLimits):
+    """zip 디렉토리에 적힌 크기만 보고 압축 폭탄을 거절 (압축은 풀지 않음)"""
+    total = 0
+    for info in archive.infolist():
+        total += info.file_size
+        if info.file_size > limits.max_part_bytes:
+            raise UploadRejected(f"엑셀 파일 안의 {info.filename}이(가) 너무 큽니다.")
+        if (info.file_size > RATIO_MIN_BYTES and
+                info.file_size > limits.max_compression_ratio * max(info.compress_size, 1)):
+            raise UploadRejected(f"엑셀 파일 안의 {info.filename}의 압축률이 비정상적입니다.")
+    if total > limits.max_uncompressed_bytes:
+        raise UploadRejected("엑셀 파일의 압축을 푼 크기가 너무 큽니다.")
+
+
+def parse_dimension(ref: str) -> Optional[Tuple[int, int]]:
+    """'A1:AJ120' -> (120, 36), 해석할 수 없으면 None"""
+    match = _DIMENSION_PATTERN.match(ref.strip().upper().replace('$', ''))
+    if not match:
+        return None
+    letters, row = match.groups()
+    column = 0
+    for letter in letters:
+        column = column * 26 + (ord(letter) - 64)
+    return int(row), column
+
+
+def check_dimension(dimension: Optional[Tuple[int, int]], limits: UploadLimits):
+    """시트가 선언한 (행 수, 열 수)가 제한 안인지"""
+    if dimension is None:
+        return
+    rows, columns = dimension
+    if rows > limits.max_rows or columns > limits.max_columns:
+        raise UploadRejected(
+            f"시트가 너무 큽니다 ({rows:,}행 x {columns:,}열). "
+            f"{limits.max_rows:,}행, {limits.max_columns:,}열까지 분석할 수 있습니다."
+        )
+
+
+def check_row(row_number: int, width: int, limits: UploadLimits):
+    """행을 읽는 중에 행 수(1부터)/열 수 제한 확인"""
+    if row_number > limits.max_rows:
+        raise UploadRejected(f"시트의 행이 너무 많습니다. {limits.max_rows:,}행까지 분석할 수 있습니다.")
+    if width > limits.max_columns:
+        raise UploadRejected(f"시트의 열이 너무 많습니다. {limits.max_columns:,}열까지 분석할 수 있습니다.")
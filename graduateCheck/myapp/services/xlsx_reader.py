@@ -0,0 +1,206 @@
+import re
+import zipfile
+import logging
+import posixpath
+from typing import Iterator, List, Optional
+from xml.etree.ElementTree import XMLPullParser, iterparse
+
+from myapp.services.upload_guard import UploadLimits, check_row
+
+logger = logging.getLogger(__name__)
+
+# pd.read_excel이 기본으로 NaN 처리하는 문자열 (pandas 기본 na_values와 동일)
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+    'n/a', 'nan', 'null',
+])
+
+_CELL_REF_PATTERN = re.compile(r'([A-Z]+)(\d+)')
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+
+def _local(tag: str):
+    """네임스페이스를 제외한 태그 이름"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _column_index(letters: str):
+    """'A' -> 0, 'AJ' -> 35"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - 64)
+    return index - 1
+
+
+def _first_sheet_path(archive: zipfile.ZipFile):
+    """workbook.xml 순서상 첫 번째 시트의 zip 내부 경로를 찾습니다"""
+    relationship_id = None
+    with archive.open('xl/workbook.xml') as stream:
+        for _, elem in iterparse(stream):
+            if _local(elem.tag) == 'sheet':
+                relationship_id = elem.get(f'{{{_REL_NS}}}id')
+                break
+
+    with archive.open('xl/_rels/workbook.xml.rels') as stream:
+        for _, elem in iterparse(stream):
+            if _local(elem.tag) == 'Relationship' and elem.get('Id') == relationship_id:
+                target = elem.get('Target')
+                if target.startswith('/'):
+                    return target.lstrip('/')
+                return posixpath.normpath(posixpath.join('xl', target))
+
+    raise ValueError("엑셀 파일에서 시트를 찾을 수 없습니다.")
+
+
+def _text_of(elem):
+    """<si>/<is> 요소의 텍스트 (서식 run은 이어붙이고 윗주(rPh)는 제외)"""
+    parts = []
+    for child in elem:
+        name = _local(child.tag)
+        if name == 't':
+            parts.append(child.text or '')
+        elif name == 'r':
+            for run_child in child:
+                if _local(run_child.tag) == 't':
+                    parts.append(run_child.text or '')
+    return ''.join(parts)
+
+
+def read_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    """sharedStrings.xml을 iterparse로 읽어 문자열 목록을 만듭니다"""
+    if 'xl/sharedStrings.xml' not in archive.namelist():
+        return []
+
+    strings = []
+    with archive.open('xl/sharedStrings.xml') as stream:
+        for _, elem in iterparse(stream):
+            if _local(elem.tag) == 'si':
+                strings.append(_text_of(elem))
+                elem.clear()
+    return strings
+
+
+def _cell_value(cell, shared_strings: List[str]):
+    """<c> 요소의 값을 pd.read_excel과 같은 규칙으로 변환합니다"""
+    cell_type = cell.get('t', 'n')
+    raw = None
+    for child in cell:
+        name = _local(child.tag)
+        if name == 'v':
+            raw = child.text
+        elif name == 'is':
+            return _text_of(child)
+
+    if raw is None:
+        return None
+    if cell_type == 's':
+        return shared_strings[int(raw)]
+    if cell_type == 'n':
+        number = float(raw)
+        int_number = int(number)
+        return int_number if int_number == number else number
+    if cell_type == 'b':
+        return raw == '1'
+    if cell_type == 'e':
+        return None
+    # str(수식 결과), d(ISO 날짜) 등은 문자열 그대로
+    return raw
+
+
+def read_dimension(archive: zipfile.ZipFile) -> Optional[str]:
+    """첫 번째 시트가 선언한 dimension ref (예: 'A1:AJ120', 없으면 None)
+
+    시트 XML 앞부분만 읽고 sheetData가 시작되면 멈춥니다.
+    """
+    # 중간에 멈추면 iterparse 제너레이터가 파서를 물고 남으므로 파서를 직접 씀
+    parser = XMLPullParser(events=('start',))
+    with archive.open(_first_sheet_path(archive)) as stream:
+        while chunk := stream.read(4096):
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                name = _local(elem.tag)
+                if name == 'dimension':
+                    return elem.get('ref')
+                if name == 'sheetData':
+                    return None
+    return None
+
+
+def iter_native_rows(source, limits: Optional[UploadLimits] = None) -> Iterator[List[Optional[object]]]:
+    """xlsx 첫 번째 시트의 행을 1행부터 순서대로 흘려보냅니다.
+
+    openpyxl/pandas를 거치지 않고 zip 안의 XML을 직접 iterparse하며, 값이 없는
+    행은 빈 목록으로, 빈 셀은 None으로 채워 열 위치를 유지합니다. limits가 있으면
+    행 번호와 열 위치를 빈 칸을 채우기 전에 확인합니다 (UploadRejected).
+    """
+    if hasattr(source, 'seek'):
+        source.seek(0)
+
+    with zipfile.ZipFile(source) as archive:
+        shared_strings = read_shared_strings(archive)
+        sheet_path = _first_sheet_path(archive)
+
+        next_row_number = 1
+        with archive.open(sheet_path) as stream:
+            for _, elem in iterparse(stream):
+                if _local(elem.tag) != 'row':
+                    continue
+
+                row_number = int(elem.get('r', next_row_number))
+                if limits is not None:
+                    check_row(row_number, 0, limits)
+                # 값이 없어 생략된 행은 빈 행으로 채움
+                while next_row_number < row_number:
+                    yield []
+                    next_row_number += 1
+
+                values: List[Optional[object]] = []
+                for cell in elem:
+                    if _local(cell.tag) != 'c':
+                        continue
+                    ref = cell.get('r')
+                    col = _column_index(_CELL_REF_PATTERN.match(ref).group(1)) if ref else len(values)
+                    value = _cell_value(cell, shared_strings)
+                    if value is None:
+                        continue
+                    if limits is not None and col >= len(values):
+                        check_row(row_number, col + 1, limits)
+                    if col >= len(values):
+                        values.extend([None] * (col - len(values) + 1))
+                    values[col] = value
+
+                elem.clear()
+                next_row_number = row_number + 1
+                yield values
+
+
+def _tokens(values: List[Optional[object]]):
+    """행의 값 목록을 cleaner가 쓰는 row_values 토큰 목록으로 변환합니다"""
+    tokens = []
+    for value in values:
+        if value is None or (isinstance(value, str) and value in NA_STRINGS):
+            continue
+        text = str(value).strip()
+        if text:
+            tokens.append(text)
+    return tokens
+
+
+def iter_row_tokens(source, limits: Optional[UploadLimits] = None) -> Iterator[List[str]]:
+    """DataFrame 행 번호에 맞춘 row_values 토큰 목록을 흘려보냅니다.
+
+    pd.read_excel은 첫 행을 헤더로 쓰므로 시트의 첫 행은 건너뜁니다.
+    """
+    rows = iter_native_rows(source, limits)
+    next(rows, None)
+    for values in rows:
+        yield _tokens(values)
+
+
+def read_row_tokens(source, limits: Optional[UploadLimits] = None) -> List[List[str]]:
+    """iter_row_tokens 결과를 목록으로 반환합니다 (뒤쪽 빈 행 제외)"""
+    token_rows = list(iter_row_tokens(source, limits))
+    while token_rows and not token_rows[-1]:
+        token_rows.pop()
+    return token_rows
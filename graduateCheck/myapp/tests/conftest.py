@@ -1,7 +1,33 @@
 import pytest
 import pandas as pd
+from django.core.cache import caches
 from django.test import Client
 from django.contrib.auth.models import User
+from myapp.services.parse_cache import parse_cache
+from myapp.services.layout_cache import layout_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(monkeypatch, settings):
+    """테스트 사이에 파싱/레이아웃 캐시가 공유되지 않도록 비움 (지문 파일, 공유 캐시 파일은 쓰지 않음)"""
+    monkeypatch.setattr(layout_cache, 'path', None)
+    settings.CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        parse_cache.shared: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'transcripts'},
+    }
+    caches[parse_cache.shared].clear()
+    parse_cache.clear()
+    layout_cache.clear()
+    yield
+    caches[parse_cache.shared].clear()
+    parse_cache.clear()
+    layout_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def no_ssl_redirect(settings):
+    """테스트 클라이언트 요청이 HTTPS로 리다이렉트되지 않도록 SSL 리다이렉트 비활성화"""
+    settings.SECURE_SSL_REDIRECT = False
 
 
 @pytest.fixture
@@ -0,0 +1,109 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import OperationalError
+from django.urls import reverse
+from myapp.models import AnalysisJob
+from myapp.services.jobs import claim_next_job, run_worker
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+@pytest.mark.django_db
+class TestAnalysisJobs:
+    """분석 작업 큐 테스트"""
+
+    def submit(self, client, files, **data):
+        data.setdefault('student_type', 'normal')
+        data.setdefault('internship_completed', 'yes')
+        return client.post(reverse('analysis_jobs'), {'excel_file': files, **data})
+
+    def test_submit_returns_without_parsing(self, client):
+        """업로드는 파싱 없이 작업 id만 돌려주는지 테스트"""
+        content = build_credit_confirmation_workbook()
+        response = self.submit(client, [
+            SimpleUploadedFile('202200001.xlsx', content),
+            SimpleUploadedFile('취득학점_202300002.xlsx', content),
+            SimpleUploadedFile('이름만.xlsx', content),
+        ])
+
+        assert response.status_code == 202
+        jobs = response.json()['jobs']
+        assert [job.get('student_id') for job in jobs] == ['202200001', '202300002', None]
+        assert all(job['status'] == 'queued' for job in jobs[:2])
+        assert '학번' in jobs[2]['error']
+        assert AnalysisJob.objects.filter(status='queued').count() == 2
+
+    def test_worker_runs_jobs_and_result_page(self, client):
+        """워커가 작업을 처리하면 상태와 결과 페이지로 확인할 수 있는지 테스트"""
+        response = self.submit(client, [SimpleUploadedFile('성적표.xlsx', build_credit_confirmation_workbook())],
+                               student_id='20220001')
+        job = response.json()['jobs'][0]
+        assert client.get(reverse('analysis_job_result', args=[job['id']])).status_code == 202
+
+        call_command('run_analysis_worker', once=True)
+
+        status = client.get(job['status_url']).json()
+        assert status['status'] == 'done'
+        page = client.get(status['result_url'])
+        assert page.status_code == 200
+        assert 'remaining_credits' in page.context['result']
+        assert AnalysisJob.objects.get(id=job['id']).payload is None
+
+    def test_failed_job(self, client):
+        """읽을 수 없는 파일은 실패 상태와 오류를 남기는지 테스트"""
+        response = self.submit(client, [SimpleUploadedFile('202200001.xlsx', b'not a workbook')])
+        job_id = response.json()['jobs'][0]['id']
+
+        call_command('run_analysis_worker', once=True)
+
+        job = AnalysisJob.objects.get(id=job_id)
+        assert job.status == AnalysisJob.Status.FAILED and job.error
+        assert client.get(reverse('analysis_job_status', args=[job_id])).json()['error'] == job.error
+
+    def test_oversized_upload_not_queued(self, client, settings):
+        """크기 제한을 넘는 업로드는 DB에 넣지 않고 파일별 오류로 돌려주는지 테스트"""
+        settings.UPLOAD_LIMITS = {'max_upload_bytes': 1024}
+
+        response = self.submit(client, [SimpleUploadedFile('202200001.xlsx', build_credit_confirmation_workbook())])
+
+        job = response.json()['jobs'][0]
+        assert '너무 큽니다' in job['error'] and 'id' not in job
+        assert not AnalysisJob.objects.exists()
+
+    def test_worker_survives_save_error(self, monkeypatch):
+        """결과 저장 중 DB 오류가 나도 작업 스레드가 멈추지 않고 작업을 다시 처리하는지 테스트"""
+        job = AnalysisJob.objects.create(filename='a.xlsx', payload=build_credit_confirmation_workbook(),
+                                         student_id='20220001', admission_year=2022)
+        original_save = AnalysisJob.save
+        failures = []
+
+        def locked_once(self, *args, **kwargs):
+            if not failures:
+                failures.append(self.id)
+                raise OperationalError('database is locked')
+            return original_save(self, *args, **kwargs)
+
+        monkeypatch.setattr(AnalysisJob, 'save', locked_once)
+        run_worker(once=True, poll_interval=0)
+
+        assert failures == [job.id]
+        assert AnalysisJob.objects.get(id=job.id).status == AnalysisJob.Status.DONE
+
+    def test_job_claimed_once(self):
+        """같은 작업을 두 번 가져가지 않는지 테스트"""
+        AnalysisJob.objects.create(filename='a.xlsx', payload=b'', student_id='20220001', admission_year=2022)
+
+        assert claim_next_job() is not None
+        assert claim_next_job() is None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_threaded_worker_drains_queue():
+    """작업 스레드 여러 개가 작업을 나눠 처리하는지 테스트"""
+    content = build_credit_confirmation_workbook()
+    for i in range(4):
+        AnalysisJob.objects.create(filename=f'{i}.xlsx', payload=content, student_id='20220001', admission_year=2022)
+
+    call_command('run_analysis_worker', once=True, threads=2)
+
+    assert set(AnalysisJob.objects.values_list('status', flat=True)) == {'done'}
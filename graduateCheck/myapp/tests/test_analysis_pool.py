@@ -0,0 +1,95 @@
+import asyncio
+import threading
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from myapp.services.analysis_pool import AnalysisPool, PoolBusy
+from myapp.views import graduation_check
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+class TestAnalysisPool:
+    """제한된 분석 풀 테스트"""
+
+    def test_rejects_when_saturated(self):
+        """실행 수 + 대기열을 넘으면 바로 PoolBusy"""
+        pool = AnalysisPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        running = [pool.submit(release.wait), pool.submit(release.wait)]
+
+        with pytest.raises(PoolBusy):
+            pool.submit(release.wait)
+
+        release.set()
+        for future in running:
+            future.result(timeout=5)
+        assert pool.stats() == {'workers': 1, 'queue': 1, 'in_flight': 0, 'rejected': 1}
+        assert pool.submit(lambda: 42).result(timeout=5) == 42
+
+    def test_run_awaits_result(self):
+        """run은 결과를 await로 돌려주는지 테스트"""
+        pool = AnalysisPool(max_workers=2, max_queue=0)
+
+        assert asyncio.run(pool.run(sum, [1, 2, 3])) == 6
+
+
+@pytest.mark.django_db
+class TestAsyncUploadView:
+    """비동기 업로드 뷰 테스트"""
+
+    def post(self, client):
+        return client.post(reverse('analyze_async'), {
+            'excel_file': SimpleUploadedFile("test.xlsx", build_credit_confirmation_workbook()),
+            'student_id': '20220001',
+            'student_type': 'normal',
+            'internship_completed': 'yes',
+        })
+
+    def test_analysis_runs_in_pool(self, client):
+        """분석 결과가 동기 뷰와 같은 템플릿으로 렌더링되는지 테스트"""
+        response = self.post(client)
+
+        assert response.status_code == 200
+        assert 'remaining_credits' in response.context['result']
+
+    def test_blocking_work_runs_off_event_loop(self, client, monkeypatch):
+        """폼 읽기, 토큰 계산, 렌더링이 이벤트 루프 스레드에서 실행되지 않는지 테스트"""
+        def on_event_loop():
+            try:
+                asyncio.get_running_loop()
+                return True
+            except RuntimeError:
+                return False
+
+        calls = {}
+
+        def record(name, fn):
+            def wrapper(*args, **kwargs):
+                calls[name] = on_event_loop()
+                return fn(*args, **kwargs)
+            return wrapper
+
+        for name in ['_read_upload_form', 'upload_digest', 'render']:
+            monkeypatch.setattr(graduation_check, name, record(name, getattr(graduation_check, name)))
+
+        response = self.post(client)
+
+        assert response.status_code == 200
+        assert calls == {'_read_upload_form': False, 'upload_digest': False, 'render': False}
+
+    def test_busy_response(self, client, monkeypatch):
+        """풀이 가득 차면 기다리지 않고 503과 Retry-After로 응답하는지 테스트"""
+        pool = AnalysisPool(max_workers=1, max_queue=0)
+        monkeypatch.setattr('myapp.views.graduation_check.analysis_pool', pool)
+        release = threading.Event()
+        blocker = pool.submit(release.wait)
+
+        try:
+            response = self.post(client)
+        finally:
+            release.set()
+            blocker.result(timeout=5)
+
+        assert response.status_code == 503
+        assert response['Retry-After'] == '5'
+        assert '분석 요청이 많습니다' in response.context['error']
@@ -0,0 +1,55 @@
+import io
+import json
+import zipfile
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+def run_audit(*args, **options):
+    stdout, stderr = io.StringIO(), io.StringIO()
+    call_command('audit_transcripts', *args, stdout=stdout, stderr=stderr, **options)
+    return [json.loads(line) for line in stdout.getvalue().splitlines()], stderr.getvalue()
+
+
+class TestAuditTranscriptsCommand:
+    """audit_transcripts 관리 명령 테스트"""
+
+    def test_directory_inline(self, tmp_path):
+        """폴더의 성적표를 학생별 JSON 한 줄씩 출력하는지 테스트"""
+        content = build_credit_confirmation_workbook()
+        (tmp_path / '취득학점확인원_202200001.xlsx').write_bytes(content)
+        (tmp_path / 'nested').mkdir()
+        (tmp_path / 'nested' / '202300002.xlsx').write_bytes(content)
+        (tmp_path / '메모.txt').write_text('무시')
+
+        records, summary = run_audit(str(tmp_path), workers=0)
+
+        assert [r['file'] for r in records] == ['nested/202300002.xlsx', '취득학점확인원_202200001.xlsx']
+        assert [r['admission_year'] for r in records] == [2023, 2022]
+        assert all('total_credits' in r['result'] for r in records)
+        assert '2명 분석 완료' in summary
+
+    def test_zip_with_process_pool(self, tmp_path):
+        """zip을 워커 프로세스로 나눠 분석하고 파일로 쓰는지 테스트"""
+        archive_path = tmp_path / 'cohort.zip'
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            for i in range(3):
+                archive.writestr(f'2022000{i}1.xlsx', build_credit_confirmation_workbook())
+            archive.writestr('학번없음.xlsx', build_credit_confirmation_workbook())
+            archive.writestr('깨진파일_202100001.xlsx', b'not a workbook')
+        output = tmp_path / 'audit.jsonl'
+
+        run_audit(str(archive_path), workers=2, chunk_size=2, output=str(output))
+
+        records = {r['file']: r for r in map(json.loads, output.read_text(encoding='utf-8').splitlines())}
+        assert len(records) == 5
+        assert all('result' in records[f'2022000{i}1.xlsx'] for i in range(3))
+        assert '학번' in records['학번없음.xlsx']['error']
+        assert '성적표 읽기 실패' in records['깨진파일_202100001.xlsx']['error']
+
+    def test_missing_source(self, tmp_path):
+        """성적표가 없으면 CommandError"""
+        with pytest.raises(CommandError):
+            run_audit(str(tmp_path), workers=0)
@@ -0,0 +1,57 @@
+import pandas as pd
+from unittest.mock import patch
+from myapp.services.graduation.course_index import CourseIndex
+from myapp.services.graduation.graduation_analyzer import GraduationAnalyzer
+
+
+def course_dataframe():
+    return pd.DataFrame({
+        'course_name': ['윤리학', '인식론', '윤리학', '서양고중세철학특강', '철학과현대사회'],
+        'course_type': ['전선', '전공선택', '전공선택', '전공선택', '심교'],
+        'credits': [3, 3, 2, 3, 3],
+        'grade': ['A+', 'F', 'B0', 'A0', 'P'],
+    })
+
+
+class TestCourseIndex:
+    """이수 기록 색인 테스트"""
+
+    def test_find_returns_first_row(self):
+        """기존 df[...].iloc[0]처럼 행 순서상 첫 기록을 돌려주는지 테스트"""
+        index = CourseIndex(course_dataframe())
+
+        record = index.find('윤리학', ['전공선택', '전선'])
+
+        assert record.position == 0 and record.credits == 3
+        assert index.find('윤리학', ['전공선택']).credits == 2
+        assert index.find('윤리학', ['심교']) is None
+
+    def test_exclude_grades(self):
+        """제외할 성적의 기록은 찾지 않는지 테스트"""
+        index = CourseIndex(course_dataframe())
+
+        assert index.find('인식론', ['전공선택']) is not None
+        assert index.find('인식론', ['전공선택'], exclude_grades=['F', 'NP']) is None
+
+    def test_of_types(self):
+        """과목구분별 기록을 행 순서대로 돌려주는지 테스트"""
+        index = CourseIndex(course_dataframe())
+
+        assert [r.position for r in index.of_types(['전공선택', '전선'])] == [0, 1, 2, 3]
+        assert index.of_types(['전필']) == []
+
+    def test_last_records(self):
+        """과목명별 마지막 기록만 행 순서대로 돌려주는지 테스트"""
+        index = CourseIndex(course_dataframe())
+
+        assert [r.position for r in index.last_records()] == [1, 2, 3, 4]
+
+    def test_built_once_per_analysis(self):
+        """요건 분석 한 번에 색인을 한 번만 만드는지 테스트"""
+        analyzer = GraduationAnalyzer()
+        requirement = analyzer.requirement_manager.get_requirement(2022, 'normal')
+
+        with patch('myapp.services.graduation.graduation_analyzer.CourseIndex', wraps=CourseIndex) as mock_index:
+            analyzer._analyze_requirements(course_dataframe(), requirement, 'normal', 2022, 'no')
+
+        assert mock_index.call_count == 1
@@ -0,0 +1,41 @@
+import pandas as pd
+from myapp.services.graduation.course_index import CourseIndex
+from myapp.services.graduation.course_matcher import CourseNameMatcher, compile_matcher
+
+
+class TestCourseNameMatcher:
+    """요건 과목명 매처 테스트"""
+
+    def test_substring_reports_every_pattern(self):
+        """과목명 하나에 포함된 요건 과목명을 모두 찾는지 테스트"""
+        matcher = CourseNameMatcher(['윤리학', '응용윤리학', '인식론', 'Logic'])
+
+        assert sorted(matcher.matches('응용윤리학특강')) == ['윤리학', '응용윤리학']
+        assert matcher.matches('기호logic입문') == ['Logic']
+        assert matcher.matches('형이상학') == []
+
+    def test_exact_mode(self):
+        """EXACT는 과목명이 같을 때만 일치하는지 테스트"""
+        matcher = CourseNameMatcher(['윤리학', '인식론'], mode=CourseNameMatcher.EXACT)
+
+        assert matcher.matches('윤리학') == ['윤리학']
+        assert matcher.matches('응용윤리학') == []
+
+    def test_first_matches_follows_record_order(self):
+        """요건 과목마다 처음 일치한 기록을 돌려주는지 테스트"""
+        index = CourseIndex(pd.DataFrame({
+            'course_name': ['응용윤리학', '윤리학', '인식론'],
+            'course_type': ['전공선택'] * 3,
+            'credits': [2, 3, 3],
+            'grade': ['A0'] * 3,
+        }))
+
+        found = CourseNameMatcher(['윤리학', '형이상학']).first_matches(index.records)
+
+        assert found['윤리학'].position == 0
+        assert '형이상학' not in found
+
+    def test_compiled_once_per_requirement_set(self):
+        """같은 요건 과목명 묶음이면 같은 매처를 재사용하는지 테스트"""
+        assert compile_matcher(('윤리학', '인식론')) is compile_matcher(('윤리학', '인식론'))
+        assert compile_matcher(('윤리학',), CourseNameMatcher.EXACT).mode == CourseNameMatcher.EXACT
@@ -0,0 +1,53 @@
+import io
+import pytest
+import pandas as pd
+from openpyxl import Workbook
+from unittest.mock import patch
+from myapp.services.ingestion import iter_sheet_rows, read_transcript
+
+
+def build_workbook(cells):
+    """(행, 열, 값) 목록으로 xlsx 바이트 생성"""
+    workbook = Workbook()
+    sheet = workbook.active
+    for row, col, value in cells:
+        sheet.cell(row=row, column=col, value=value)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class TestReadTranscript:
+    """스트리밍 성적표 읽기 테스트"""
+
+    def test_matches_read_excel(self):
+        """pd.read_excel과 동일한 DataFrame을 반환하는지 테스트"""
+        content = build_workbook([
+            (1, 1, '취득학점 확인원'),
+            (3, 2, 3), (3, 3, '전선'),
+            (5, 1, 2.5), (5, 4, '  철학산책 '),
+            (8, 1, '2022'), (8, 2, 1),
+            (9, 36, 'A+'),
+        ])
+
+        expected = pd.read_excel(io.BytesIO(content))
+        result = read_transcript(io.BytesIO(content))
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_trailing_empty_cells_trimmed(self):
+        """행 뒤쪽의 빈 셀이 잘려서 전달되는지 테스트"""
+        content = build_workbook([(1, 1, '과목명'), (2, 1, '논리학'), (2, 3, None)])
+
+        rows = list(iter_sheet_rows(io.BytesIO(content)))
+
+        assert rows == [['과목명'], ['논리학']]
+
+    def test_non_xlsx_falls_back_to_read_excel(self):
+        """xlsx가 아닌 파일은 pd.read_excel로 처리하는지 테스트"""
+        mock_df = pd.DataFrame({'course_name': ['철학산책']})
+        with patch('pandas.read_excel', return_value=mock_df) as mock_read_excel:
+            result = read_transcript(io.BytesIO(b"dummy excel content"))
+
+        mock_read_excel.assert_called_once()
+        assert result is mock_df
@@ -0,0 +1,155 @@
+import io
+import pandas as pd
+from openpyxl import Workbook
+from unittest.mock import patch
+from myapp.services.cleaner2 import CellGrid, ExcelStructureDetector
+from myapp.services.layout_cache import LayoutCache
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+def header_based_dataframe(n_courses, student_id='202200000'):
+    """헤더가 있는 일반 성적표 형식의 DataFrame"""
+    rows = [['학번', student_id, None, None, None], [None] * 5,
+            ['년도', '이수구분', '과목명', '학점', '성적']]
+    for i in range(n_courses):
+        rows.append([2022 + i % 3, '전선', f'철학과목{i}', 3, 'A+'])
+    return pd.DataFrame(rows)
+
+
+def workbook_dataframe(rows):
+    """행 목록으로 xlsx를 만들어 pd.read_excel로 다시 읽은 DataFrame"""
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return pd.read_excel(io.BytesIO(buffer.getvalue()))
+
+
+class TestLayoutCache:
+    """레이아웃 지문 캐시 테스트"""
+
+    def test_persists_across_instances(self, tmp_path):
+        """파일로 저장된 지문을 새 인스턴스(워커 재시작)에서 읽는지 테스트"""
+        path = str(tmp_path / 'layout.json')
+        structure = {'header_row': None, 'data_start_row': 2, 'columns': {}, 'format_type': 'credit_confirmation'}
+
+        cache = LayoutCache(path)
+        cache.set('abc', structure)
+        cache.flush()
+
+        assert LayoutCache(path).get('abc') == structure
+
+    def test_set_defers_file_write(self, tmp_path):
+        """set은 파일을 바로 쓰지 않고 flush(타이머/종료) 때 한 번에 쓰는지 테스트"""
+        path = tmp_path / 'layout.json'
+        cache = LayoutCache(str(path), save_delay=60)
+        structure = {'header_row': None, 'data_start_row': 2, 'columns': {}, 'format_type': 'credit_confirmation'}
+
+        cache.set('abc', structure)
+        cache.set('def', structure)
+        assert not path.exists()
+
+        cache.flush()
+        assert LayoutCache(str(path)).get('def') == structure
+
+    def test_same_layout_reuses_structure(self):
+        """학생이 달라도 레이아웃이 같으면 캐시된 구조를 쓰는지 테스트"""
+        detector = ExcelStructureDetector(layout_cache=LayoutCache())
+        first = header_based_dataframe(5)
+        second = header_based_dataframe(12, student_id='202311111')
+
+        expected = ExcelStructureDetector(layout_cache=None).detect_structure(second)
+        detector.detect_structure(first)
+        with patch.object(detector, '_detect_structure') as mock_detect:
+            result = detector.detect_structure(second)
+
+        mock_detect.assert_not_called()
+        assert result == expected
+        assert detector.layout_fingerprint(CellGrid.from_dataframe(first)) == \
+            detector.layout_fingerprint(CellGrid.from_dataframe(second))
+
+    def test_credit_confirmation_layout(self):
+        """취득학점확인원도 지문으로 같은 구조를 얻는지 테스트"""
+        cache = LayoutCache()
+        df = pd.read_excel(io.BytesIO(build_credit_confirmation_workbook()))
+
+        first = ExcelStructureDetector(layout_cache=cache).detect_structure(df)
+        second = ExcelStructureDetector(layout_cache=cache).detect_structure(df)
+
+        assert first == second
+        assert first['format_type'] == 'credit_confirmation'
+        assert cache.stats()['hits'] == 1
+
+    def test_stale_structure_falls_back_to_detection(self):
+        """캐시된 구조가 시트와 맞지 않으면 전체 감지로 돌아가는지 테스트"""
+        cache = LayoutCache()
+        detector = ExcelStructureDetector(layout_cache=cache)
+        df = header_based_dataframe(5)
+        fingerprint = detector.layout_fingerprint(CellGrid.from_dataframe(df))
+        cache.set(fingerprint, {'header_row': 2, 'data_start_row': 2, 'columns': {'course_type': 1},
+                                'format_type': 'header_based'})
+
+        result = detector.detect_structure(df)
+
+        assert result['data_start_row'] == 3
+        assert cache.get(fingerprint)['data_start_row'] == 3
+
+    def test_colliding_credit_confirmation_layouts(self):
+        """지문이 같아도 데이터 시작 행이 다른 취득학점확인원은 캐시를 쓰지 않는지 테스트"""
+        def course_row(n):
+            return ['전선', 9.0, '(9.0)', '23/1', f'BPHI2000{n}', f'과목{n}', 3, 'A+',
+                    '23/2', f'BPHI3000{n}', f'과목{n}-2', 3, 'A0']
+
+        head = [['취득학점 확인원'], ['학번', '202200000', '성명', '홍길동']]
+        # 두 번째 시트는 과목구분으로 시작하지만 학기가 없는 요약 행이 먼저 나옴
+        starts_at_summary = workbook_dataframe(head + [['지교', 12.0, '(12.0)'], course_row(1), course_row(2)])
+        starts_at_course = workbook_dataframe(head + [course_row(1), course_row(2), course_row(3)])
+        detector = ExcelStructureDetector(layout_cache=LayoutCache())
+        assert detector.layout_fingerprint(CellGrid.from_dataframe(starts_at_summary)) == \
+            detector.layout_fingerprint(CellGrid.from_dataframe(starts_at_course))
+
+        assert detector.detect_structure(starts_at_summary)['data_start_row'] == 2
+        assert detector.detect_structure(starts_at_course)['data_start_row'] == 1
+        assert detector.detect_structure(starts_at_summary)['data_start_row'] == 2
+
+    def test_headerless_layouts_with_different_column_order(self):
+        """헤더 없는 시트는 열 순서가 달라도 이전 시트의 컬럼 매핑을 쓰지 않는지 테스트"""
+        def sheet(order):
+            rows = []
+            for i in range(5):
+                row = {'year': 2022, 'semester': 1, 'course_type': '전선', 'course_name': f'철학과목{i}',
+                       'credits': 3, 'grade': 'A+'}
+                rows.append([row[col] for col in order])
+            return pd.DataFrame(rows)
+
+        detector = ExcelStructureDetector(layout_cache=LayoutCache())
+        first = detector.detect_structure(
+            sheet(['year', 'semester', 'course_type', 'course_name', 'credits', 'grade']))
+        second = detector.detect_structure(
+            sheet(['year', 'semester', 'course_type', 'credits', 'grade', 'course_name']))
+
+        assert first['columns']['course_name'] == 3
+        assert (second['columns']['course_name'], second['columns']['credits'],
+                second['columns']['grade']) == (5, 3, 4)
+
+    def test_header_layouts_with_swapped_columns(self):
+        """헤더의 년도/학기 순서가 바뀐 시트는 지문이 달라 각자 매핑되는지 테스트"""
+        def sheet(header):
+            rows = [['학번', '202200000', None, None, None, None], [None] * 6, header]
+            by_name = {'년도': 2022, '학기': 1, '이수구분': '전선', '과목명': '철학과목',
+                       '학점': 3, '성적': 'A+'}
+            rows += [[by_name[name] for name in header] for _ in range(5)]
+            return pd.DataFrame(rows)
+
+        year_first = sheet(['년도', '학기', '이수구분', '과목명', '학점', '성적'])
+        semester_first = sheet(['학기', '년도', '이수구분', '과목명', '학점', '성적'])
+        detector = ExcelStructureDetector(layout_cache=LayoutCache())
+        assert detector.layout_fingerprint(CellGrid.from_dataframe(year_first)) != \
+            detector.layout_fingerprint(CellGrid.from_dataframe(semester_first))
+
+        detector.detect_structure(year_first)
+        columns = detector.detect_structure(semester_first)['columns']
+
+        assert (columns['year'], columns['semester']) == (1, 0)
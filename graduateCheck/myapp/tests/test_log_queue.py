@@ -0,0 +1,83 @@
+import logging
+import threading
+from logging.handlers import QueueHandler
+import pytest
+from myapp.services.graduation.check_log import CourseCheckLog
+from myapp.services.graduation.graduation_analyzer import GraduationAnalyzer
+from myapp.services.log_queue import _listeners, install_queue_logging
+
+
+class ListHandler(logging.Handler):
+    """받은 레코드와 기록한 스레드를 남기는 핸들러"""
+
+    def __init__(self, level=logging.DEBUG):
+        super().__init__(level)
+        self.records = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.records.append(record)
+        self.threads.add(threading.get_ident())
+
+
+@pytest.fixture
+def captured():
+    """graduation 로거의 레코드를 바로 받음 (큐를 거치지 않도록 전파 끔)"""
+    logger = logging.getLogger('myapp.services.graduation')
+    handler = ListHandler()
+    old_level, old_propagate = logger.level, logger.propagate
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    yield handler
+    logger.removeHandler(handler)
+    logger.setLevel(old_level)
+    logger.propagate = old_propagate
+
+
+def test_queue_listener_writes_off_request_thread():
+    """핸들러가 백그라운드 스레드에서 기록하고, 레벨을 지키는지 테스트"""
+    logger = logging.getLogger('myapp.tests.queue_logging')
+    logger.propagate = False
+    handler = ListHandler(level=logging.WARNING)
+    logger.addHandler(handler)
+    try:
+        install_queue_logging([logger.name])
+        assert [type(h) for h in logger.handlers] == [QueueHandler]
+
+        logger.warning("경고 %d", 1)
+        logger.info("핸들러 레벨보다 낮음")
+        listener = _listeners.pop(logger.name)
+        listener.stop()
+    finally:
+        logger.handlers.clear()
+
+    assert [record.getMessage() for record in handler.records] == ['경고 1']
+    assert threading.get_ident() not in handler.threads
+
+
+def test_myapp_logger_uses_queue():
+    """설정(LOG_QUEUE)대로 myapp 로거가 큐 핸들러만 쓰는지 테스트"""
+    assert [type(h) for h in logging.getLogger('myapp').handlers] == [QueueHandler]
+
+
+def test_check_log_emits_one_summary(captured):
+    """과목별 확인을 요약 한 줄로 남기고, DEBUG 목록은 꺼져 있으면 만들지 않는지 테스트"""
+    checks = CourseCheckLog()
+    checks.passed('전공필수', '논리학')
+    checks.missing('전공필수', '윤리학')
+    checks.emit(logging.getLogger('myapp.services.graduation.test'))
+
+    assert len(captured.records) == 1
+    assert captured.records[0].levelno == logging.WARNING
+    assert captured.records[0].getMessage() == "과목 확인 2건 - 이수 1, 미이수 1 (전공필수:윤리학)"
+
+
+def test_analyze_logs_no_per_course_records(captured, sample_dataframe):
+    """분석 한 번에 과목별 확인 로그 대신 요약 한 줄만 남는지 테스트"""
+    result = GraduationAnalyzer().analyze(sample_dataframe, 'normal', 2022, 'yes')
+
+    messages = [record.getMessage() for record in captured.records]
+    assert 'error' not in result
+    assert not [message for message in messages if message.startswith("과목 '")]
+    assert len([message for message in messages if message.startswith('과목 확인')]) == 1
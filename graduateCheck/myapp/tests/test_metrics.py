@@ -0,0 +1,92 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from myapp.services.metrics import MetricsRegistry, metrics
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+def sample_lines(text):
+    return {line for line in text.splitlines() if not line.startswith('#')}
+
+
+class TestMetricsRegistry:
+    """지표 레지스트리 테스트"""
+
+    def test_render_counter_and_histogram(self, tmp_path):
+        """카운터와 누적 히스토그램을 Prometheus 텍스트 형식으로 내보내는지 테스트"""
+        registry = MetricsRegistry(path=str(tmp_path / 'metrics.sqlite3'), enabled=True)
+        registry.inc('myapp_uploads_total', outcome='ok')
+        registry.observe('myapp_parse_seconds', 0.02, path='cleaner2')
+        registry.observe('myapp_parse_seconds', 0.3, path='cleaner2')
+
+        lines = sample_lines(registry.render())
+
+        assert 'myapp_uploads_total{outcome="ok"} 1' in lines
+        assert 'myapp_parse_seconds_bucket{path="cleaner2",le="0.025"} 1' in lines
+        assert 'myapp_parse_seconds_bucket{path="cleaner2",le="0.5"} 2' in lines
+        assert 'myapp_parse_seconds_bucket{path="cleaner2",le="+Inf"} 2' in lines
+        assert 'myapp_parse_seconds_count{path="cleaner2"} 2' in lines
+
+    def test_workers_share_store(self, tmp_path):
+        """여러 워커(레지스트리)의 지표가 같은 저장소에서 합산되는지 테스트"""
+        path = str(tmp_path / 'metrics.sqlite3')
+        workers = [MetricsRegistry(path=path, enabled=True) for _ in range(3)]
+        for worker in workers:
+            worker.inc('myapp_cleaner_total', cleaner='cleaner')
+            worker.flush()
+
+        assert 'myapp_cleaner_total{cleaner="cleaner"} 3' in sample_lines(workers[0].render())
+
+    def test_disabled_records_nothing(self, tmp_path):
+        """꺼져 있으면 아무것도 모으지 않는지 테스트"""
+        registry = MetricsRegistry(path=str(tmp_path / 'metrics.sqlite3'))
+        registry.inc('myapp_uploads_total', outcome='ok')
+
+        assert not registry.has_pending()
+
+
+@pytest.mark.django_db
+class TestMetricsView:
+    """/metrics 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def enable_metrics(self, settings, monkeypatch, tmp_path):
+        settings.METRICS_ENABLED = True
+        monkeypatch.setattr(metrics, 'enabled', True)
+        monkeypatch.setattr(metrics, 'path', str(tmp_path / 'metrics.sqlite3'))
+        monkeypatch.setattr(metrics, '_store', None)
+        monkeypatch.setattr(metrics, '_pending', {})
+
+    def test_upload_metrics(self, client):
+        """업로드 후 업로드/파싱/캐시/단계 지표가 보이는지 테스트"""
+        excel_file = SimpleUploadedFile("test.xlsx", build_credit_confirmation_workbook())
+        client.post(reverse('index'), {
+            'excel_file': excel_file,
+            'student_id': '20220001',
+            'student_type': 'normal',
+            'internship_completed': 'yes',
+        })
+        client.post(reverse('index'), {'excel_file': SimpleUploadedFile("test.xlsx", b'x')})
+
+        response = client.get(reverse('metrics'))
+        lines = sample_lines(response.content.decode())
+
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        assert 'myapp_uploads_total{outcome="ok"} 1' in lines
+        assert 'myapp_uploads_total{outcome="rejected"} 1' in lines
+        assert 'myapp_upload_bytes_count 1' in lines
+        assert 'myapp_parse_seconds_count{path="xlsx_reader"} 1' in lines
+        assert 'myapp_cache_requests_total{cache="parse",result="miss"} 1' in lines
+        assert 'myapp_stage_seconds_count{stage="common"} 1' in lines
+
+    def test_remote_scraper_forbidden(self, client):
+        """허용되지 않은 주소에서는 읽을 수 없는지 테스트"""
+        response = client.get(reverse('metrics'), REMOTE_ADDR='10.0.0.1')
+
+        assert response.status_code == 403
+
+    def test_disabled(self, client, monkeypatch):
+        """지표 수집이 꺼져 있으면 404인지 테스트"""
+        monkeypatch.setattr(metrics, 'enabled', False)
+
+        assert client.get(reverse('metrics')).status_code == 404
@@ -1,5 +1,11 @@
 import pytest
-from myapp.models.graduation_requirement import GraduationRequirementManager, YearRequirement
+from collections.abc import Mapping
+from unittest.mock import patch
+from dataclasses import FrozenInstanceError, replace
+from myapp.models.graduation_requirement import (
+    GraduationRequirementManager, YearRequirement, RequirementPlan, _build_plan
+)
+from myapp.config.requirements.base import BaseRequirements
 
 
 class TestGraduationRequirementManager:
@@ -17,8 +23,8 @@ class TestGraduationRequirementManager:
         assert isinstance(requirement, YearRequirement)
         assert requirement.year == 2024
         assert requirement.total_credits > 0
-        assert isinstance(requirement.common_required, dict)
-        assert isinstance(requirement.major_required, list)
+        assert isinstance(requirement.common_required, Mapping)
+        assert isinstance(requirement.major_required, tuple)
     
     def test_get_requirement_2025_normal(self):
         """2025학번 일반학생 졸업요건 조회 테스트"""
@@ -85,4 +91,65 @@ class TestGraduationRequirementManager:
         
         # 인턴십 요구사항이 boolean 타입인지 확인
         assert isinstance(requirement_2024.internship_required, bool)
-        assert isinstance(requirement_2025.internship_required, bool) 
\ No newline at end of file
+        assert isinstance(requirement_2025.internship_required, bool)
+
+
+class TestRequirementPlan:
+    """컴파일된 졸업요건 계획 테스트"""
+
+    def test_plan_compiled_once(self):
+        """같은 (입학년도, 학생 유형)이면 매니저가 달라도 같은 계획을 쓰는지 테스트"""
+        plan = GraduationRequirementManager().get_plan(2022, 'normal')
+
+        assert isinstance(plan, RequirementPlan)
+        assert GraduationRequirementManager().get_plan(2022, 'normal') is plan
+        assert GraduationRequirementManager().get_requirement(2022, 'normal') is plan.requirement
+        with pytest.raises(FrozenInstanceError):
+            plan.requirement.total_credits = 0
+
+    def test_shared_course_lists_are_read_only(self):
+        """공유하는 요건의 과목 목록과 공통 필수를 요청 중에 바꿀 수 없는지 테스트"""
+        requirement = GraduationRequirementManager().get_requirement(2022, 'normal')
+
+        assert requirement.common_required['심교'] == ('철학산책',)
+        with pytest.raises(TypeError):
+            requirement.common_required['심교'] = ()
+        with pytest.raises(AttributeError):
+            requirement.major_required.append('논리학')
+        assert all(isinstance(courses, tuple) for courses in (
+            requirement.designated_required, requirement.major_required,
+            requirement.major_elective_required, requirement.major_base, requirement.field_trip,
+        ))
+
+    def test_synonyms_and_display_names(self):
+        """이전/현재 과목명 동의어와 표시용 과목명을 미리 계산하는지 테스트"""
+        plan = GraduationRequirementManager().get_plan(2022, 'normal')
+
+        assert plan.synonyms['현대철학'] == ('서양현대철학',)
+        assert plan.synonyms['서양현대철학'] == ('현대철학',)
+        assert plan.display_name('현대철학') == '서양현대철학(전 현대철학)'
+        assert plan.display_name('윤리학') == '윤리학'
+        assert '서양고중세철학' in plan.course_names
+
+    def test_course_credit(self):
+        """고정 학점 -> 성적표 학점 -> 기본 학점 순서 테스트"""
+        plan = GraduationRequirementManager().get_plan(2022, 'normal')
+
+        assert plan.course_credit('학술답사Ⅰ', {'학술답사Ⅰ': 3}) == 1
+        assert plan.course_credit('학술답사', {}) == 1
+        assert plan.course_credit('윤리학', {'윤리학': 2}) == 2
+        assert plan.course_credit('윤리학', {}) == 3
+
+    def test_warns_unresolvable_course(self):
+        """정규화 후 찾을 수 없는 요건 과목이면 경고하는지 테스트"""
+        requirement = replace(
+            GraduationRequirementManager().get_requirement(2022, 'normal'),
+            major_required=['현대철학', '서양 근세철학']
+        )
+
+        with patch('myapp.models.graduation_requirement.logger') as mock_logger:
+            _build_plan(requirement, 'normal', BaseRequirements.COURSE_NAME_MAPPING)
+
+        warnings = ' '.join(call.args[0] % call.args[1:] for call in mock_logger.warning.call_args_list)
+        assert "'현대철학'" in warnings
+        assert "'서양 근세철학'" in warnings
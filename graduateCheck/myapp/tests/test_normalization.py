@@ -0,0 +1,45 @@
+import io
+import pandas as pd
+from unittest.mock import patch
+from myapp.services.ingestion import load_transcript
+from myapp.services.normalization import NORMALIZED_ATTR, normalize_courses
+from myapp.services.graduation.graduation_analyzer import GraduationAnalyzer
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+class TestNormalizeCourses:
+    """과목명/과목구분 정규화 테스트"""
+
+    def test_maps_names_and_types(self):
+        """공백 제거 후 이전 과목명과 과목구분 약칭을 바꾸고 나머지는 그대로 두는지 테스트"""
+        df = pd.DataFrame({
+            'course_name': ['서양 고대철학', '철학의이해', '논리학', None],
+            'course_type': ['전선', '심교', '전공선택', None],
+        })
+
+        normalize_courses(df)
+
+        assert df['course_name'].tolist()[:3] == ['서양고중세철학', '철학산책', '논리학']
+        assert pd.isna(df['course_name'].iloc[3])
+        assert df['course_type'].tolist()[:3] == ['전공선택', '심화교양', '전공선택']
+        assert df.attrs[NORMALIZED_ATTR]
+
+    def test_skips_normalized_frame(self):
+        """정규화 표시가 있으면 다시 매핑하지 않는지 테스트"""
+        df = pd.DataFrame({'course_name': ['철학의이해'], 'course_type': ['심교']})
+        df.attrs[NORMALIZED_ATTR] = True
+
+        normalize_courses(df)
+
+        assert df['course_name'].tolist() == ['철학의이해']
+
+    def test_analyzer_reuses_cleaner_normalization(self):
+        """cleaner2가 정규화한 성적표는 분석기가 다시 매핑하지 않는지 테스트"""
+        df = load_transcript(io.BytesIO(build_credit_confirmation_workbook()))
+        assert df.attrs[NORMALIZED_ATTR]
+
+        with patch('myapp.services.normalization._map_values') as mock_map:
+            result = GraduationAnalyzer().analyze(df, 'normal', 2022, 'yes')
+
+        mock_map.assert_not_called()
+        assert 'error' not in result
@@ -0,0 +1,164 @@
+import hashlib
+import pytest
+import pandas as pd
+from unittest.mock import patch
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from myapp.services.ingestion import load_transcript
+from myapp.services.parse_cache import ParseCache, parse_cache
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+from myapp.views.graduation_check import EXPIRED_MESSAGE
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestParseCache:
+    """파싱 캐시 LRU/TTL 테스트"""
+
+    def test_lru_eviction(self):
+        """가장 오래 쓰지 않은 항목부터 밀려나는지 테스트"""
+        cache = ParseCache(max_entries=2)
+        cache.set('a', pd.DataFrame({'x': [1]}))
+        cache.set('b', pd.DataFrame({'x': [2]}))
+        cache.get('a')
+        cache.set('c', pd.DataFrame({'x': [3]}))
+
+        assert cache.get('b') is None
+        assert cache.get('a')['x'].tolist() == [1]
+        assert cache.stats() == {'entries': 2, 'hits': 2, 'misses': 1, 'evictions': 1}
+
+    def test_ttl_expiry(self):
+        """TTL이 지난 항목은 미스로 처리되는지 테스트"""
+        clock = FakeClock()
+        cache = ParseCache(ttl=10, clock=clock)
+        cache.set('a', pd.DataFrame({'x': [1]}))
+
+        clock.now = 11
+        assert cache.get('a') is None
+        assert cache.stats()['evictions'] == 1
+
+    def test_returns_copy(self):
+        """꺼낸 DataFrame을 수정해도 캐시 내용이 바뀌지 않는지 테스트"""
+        cache = ParseCache()
+        cache.set('a', pd.DataFrame({'x': [1]}))
+
+        cache.get('a')['x'] = 2
+
+        assert cache.get('a')['x'].tolist() == [1]
+
+    def test_shared_cache_fallback(self):
+        """메모리에 없으면 공유 캐시에서 찾아 메모리에 다시 넣는지 테스트 (다른 워커가 넣은 결과)"""
+        ParseCache(shared=parse_cache.shared).set('a', pd.DataFrame({'x': [1]}))
+        other_worker = ParseCache(shared=parse_cache.shared)
+
+        assert other_worker.get('a')['x'].tolist() == [1]
+        assert other_worker.stats() == {'entries': 1, 'hits': 1, 'misses': 0, 'evictions': 0}
+        assert ParseCache().get('a') is None
+
+
+@pytest.mark.django_db
+class TestParseCacheView:
+    """같은 성적표 재업로드 테스트"""
+
+    def post(self, client, content, student_type='normal'):
+        excel_file = SimpleUploadedFile("test.xlsx", content)
+        return client.post(reverse('index'), {
+            'excel_file': excel_file,
+            'student_id': '20220001',
+            'student_type': student_type,
+            'internship_completed': 'yes',
+        })
+
+    def test_resubmit_skips_parsing(self, client):
+        """두 번째 제출은 파싱 없이 캐시된 정제 결과를 쓰는지 테스트"""
+        content = build_credit_confirmation_workbook()
+
+        with patch('myapp.services.parse_cache.load_transcript', side_effect=load_transcript) as mock_load:
+            first = self.post(client, content)
+            second = self.post(client, content, student_type='double')
+
+        assert mock_load.call_count == 1
+        assert parse_cache.stats()['hits'] == 1
+        assert 'result' in first.context and 'result' in second.context
+
+    def test_digest_computed_while_uploading(self, client):
+        """업로드 핸들러가 계산한 sha256이 캐시 키로 쓰이는지 테스트"""
+        content = build_credit_confirmation_workbook()
+
+        self.post(client, content)
+
+        assert parse_cache.get(hashlib.sha256(content).hexdigest()) is not None
+
+
+@pytest.mark.django_db
+class TestReanalyzeView:
+    """업로드 없이 조건만 바꿔 다시 분석하는 테스트"""
+
+    def upload(self, client):
+        excel_file = SimpleUploadedFile("test.xlsx", build_credit_confirmation_workbook())
+        return client.post(reverse('index'), {
+            'excel_file': excel_file,
+            'student_id': '20220001',
+            'student_type': 'normal',
+            'internship_completed': 'yes',
+        })
+
+    def reanalyze(self, client, token, student_type='double'):
+        return client.post(reverse('reanalyze'), {
+            'transcript_token': token,
+            'student_id': '20220001',
+            'student_type': student_type,
+            'internship_completed': 'no',
+        })
+
+    def test_reanalyze_without_parsing(self, client):
+        """업로드 결과의 토큰으로 파싱 없이 다른 조건의 결과를 받는지 테스트"""
+        first = self.upload(client)
+        token = first.context['transcript_token']
+        assert token
+
+        with patch('myapp.services.parse_cache.load_transcript') as mock_load:
+            second = self.reanalyze(client, token)
+
+        mock_load.assert_not_called()
+        assert second.context['student_type'] == 'double'
+        assert second.context['result']['total_credits'] == first.context['result']['total_credits']
+        assert second.context['transcript_token'] == token
+
+    def test_tampered_token(self, client):
+        """위조된 토큰은 다시 업로드하라는 오류를 보여주는지 테스트"""
+        token = self.upload(client).context['transcript_token']
+
+        response = self.reanalyze(client, token[:-1] + ('A' if token[-1] != 'A' else 'B'))
+
+        assert 'result' not in response.context
+        assert response.context['error'] == EXPIRED_MESSAGE
+
+    def test_expired_entry(self, client):
+        """캐시에서 밀려난 성적표는 다시 업로드하라는 오류를 보여주는지 테스트"""
+        token = self.upload(client).context['transcript_token']
+        parse_cache.clear()
+        caches[parse_cache.shared].clear()
+
+        response = self.reanalyze(client, token)
+
+        assert response.context['error'] == EXPIRED_MESSAGE
+
+    def test_reanalyze_on_other_worker(self, client):
+        """업로드를 받지 않은 워커(메모리 캐시가 빈 프로세스)도 공유 캐시로 다시 분석하는지 테스트"""
+        first = self.upload(client)
+        parse_cache.clear()
+
+        with patch('myapp.services.parse_cache.load_transcript') as mock_load:
+            second = self.reanalyze(client, first.context['transcript_token'])
+
+        mock_load.assert_not_called()
+        assert second.context['result']['total_credits'] == first.context['result']['total_credits']
+        assert parse_cache.stats()['entries'] == 1
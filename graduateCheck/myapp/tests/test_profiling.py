@@ -0,0 +1,86 @@
+import os
+import pytest
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from myapp.services.profiling import profile_call, summarize
+from myapp.services.normalization import normalize_courses
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+def test_summary_lists_services_functions(sample_dataframe):
+    """요약에 myapp/services 함수만 누적 시간순으로 들어가는지 테스트"""
+    _, profiler = profile_call(lambda: normalize_courses(sample_dataframe.copy()))
+
+    summary = summarize(profiler)
+
+    assert 'services/normalization.py' in summary
+    assert 'pandas' not in summary
+
+
+@pytest.mark.django_db
+class TestProfilingMiddleware:
+    """직원용 요청 프로파일링 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def profiling_settings(self, settings, tmp_path):
+        settings.PROFILING_ENABLED = True
+        settings.PROFILING_TOKEN = 'secret-token'
+        settings.PROFILING_DIR = str(tmp_path)
+        self.directory = tmp_path
+
+    def post(self, client, path=None, **extra):
+        excel_file = SimpleUploadedFile("test.xlsx", build_credit_confirmation_workbook())
+        return client.post(path or reverse('index'), {
+            'excel_file': excel_file,
+            'student_id': '20220001',
+            'student_type': 'normal',
+            'internship_completed': 'yes',
+        }, **extra)
+
+    def test_token_header_saves_profile(self, client):
+        """토큰이 맞는 X-Profile 헤더면 프로파일과 요약을 저장하는지 테스트"""
+        response = self.post(client, headers={'X-Profile': 'secret-token'})
+
+        name = response['X-Profile-Id']
+        assert os.path.exists(self.directory / f'{name}.prof')
+        summary = (self.directory / f'{name}.txt').read_text(encoding='utf-8')
+        assert 'services/graduation/graduation_analyzer.py' in summary
+
+    def test_staff_query_flag(self, client):
+        """로그인한 직원은 ?profile=1만으로 프로파일할 수 있는지 테스트"""
+        client.force_login(User.objects.create_user('staff', password='pw', is_staff=True))
+
+        response = self.post(client, reverse('index') + '?profile=1')
+
+        assert 'X-Profile-Id' in response
+
+    def test_wrong_token_is_ignored(self, client):
+        """직원이 아니고 토큰이 틀리면 프로파일하지 않는지 테스트"""
+        response = self.post(client, reverse('index') + '?profile=guess')
+
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response
+        assert not list(self.directory.iterdir())
+
+    def test_non_ascii_flag_is_ignored(self, client):
+        """ASCII가 아닌 플래그 값도 오류 없이 틀린 토큰으로 처리하는지 테스트"""
+        response = self.post(client, reverse('index') + '?profile=한')
+
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response
+        assert client.get('/robots.txt?profile=한').status_code != 500
+
+    def test_other_views_are_not_profiled(self, client):
+        """분석 뷰가 아닌 요청은 프로파일하지 않는지 테스트"""
+        response = client.get('/robots.txt', headers={'X-Profile': 'secret-token'})
+
+        assert 'X-Profile-Id' not in response
+
+    def test_disabled(self, client, settings):
+        """꺼져 있으면 토큰이 맞아도 프로파일하지 않는지 테스트"""
+        settings.PROFILING_ENABLED = False
+
+        response = self.post(client, headers={'X-Profile': 'secret-token'})
+
+        assert 'X-Profile-Id' not in response
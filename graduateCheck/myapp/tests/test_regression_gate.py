@@ -0,0 +1,46 @@
+from benchmarks.regression import compare, format_rows
+
+BASELINE = {
+    'clean_dataframe_v2': {'median_ms': 10.0, 'peak_kib': 200.0},
+    'view': {'median_ms': 20.0, 'peak_kib': 500.0},
+}
+
+
+def statuses(rows):
+    return {(row['stage'], row['metric']): row['status'] for row in rows}
+
+
+def test_regression_beyond_threshold():
+    """허용 비율을 넘게 느려지거나 메모리가 늘면 회귀로 보는지 테스트"""
+    current = {
+        'clean_dataframe_v2': {'median_ms': 14.0, 'peak_kib': 210.0},
+        'view': {'median_ms': 21.0, 'peak_kib': 700.0},
+    }
+    result = statuses(compare(BASELINE, current, threshold=0.25, memory_threshold=0.25, min_ms=1.0))
+
+    assert result[('clean_dataframe_v2', 'median_ms')] == 'regressed'
+    assert result[('clean_dataframe_v2', 'peak_kib')] == 'ok'
+    assert result[('view', 'median_ms')] == 'ok'
+    assert result[('view', 'peak_kib')] == 'regressed'
+
+
+def test_small_absolute_increase_is_not_regression():
+    """비율은 넘어도 min_ms보다 적게 늘어난 시간은 회귀가 아닌지 테스트"""
+    baseline = {'analyze': {'median_ms': 0.5, 'peak_kib': 100.0}}
+    current = {'analyze': {'median_ms': 1.0, 'peak_kib': 100.0}}
+
+    assert statuses(compare(baseline, current, 0.25, 0.25, min_ms=1.0))[('analyze', 'median_ms')] == 'ok'
+
+
+def test_new_stage_and_readable_diff():
+    """기준값에 없는 단계는 new로 표시하고 표에 회귀 표시가 붙는지 테스트"""
+    current = {
+        'clean_dataframe_v2': {'median_ms': 30.0, 'peak_kib': 200.0},
+        'clean_dataframe': {'median_ms': 5.0, 'peak_kib': 100.0},
+    }
+    rows = compare(BASELINE, current, 0.25, 0.25, 1.0)
+    text = format_rows(rows)
+
+    assert statuses(rows)[('clean_dataframe', 'median_ms')] == 'new'
+    assert '+200%' in text
+    assert '회귀' in text
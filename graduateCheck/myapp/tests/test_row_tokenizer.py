@@ -0,0 +1,47 @@
+from myapp.services.cleaner2 import ExcelStructureDetector
+from myapp.services.row_tokenizer import CreditRowTokenizer, SEMESTER, CODE, NAME, CREDIT, GRADE
+
+
+def build_tokenizer():
+    detector = ExcelStructureDetector()
+    return CreditRowTokenizer(detector.course_types, detector.grade_values)
+
+
+class TestCreditRowTokenizer:
+    """취득학점확인원 행 토크나이저 테스트"""
+
+    def test_classify(self):
+        """토큰 분류와 학기/학점 값 테스트"""
+        tokenizer = build_tokenizer()
+
+        semester = tokenizer.classify('(계)24/1 3')
+        assert semester.flags & SEMESTER and semester.flags & CODE
+        assert (semester.year, semester.semester) == (2024, '1학기')
+        assert tokenizer.classify('3').credits == 3
+        assert tokenizer.classify('철학의문제들').flags == NAME
+        assert tokenizer.classify('A+').flags & GRADE
+        assert not tokenizer.classify('12').flags & CREDIT
+
+    def test_extract_courses(self):
+        """과목구분/총학점을 건너뛰고 한 행의 여러 과목을 추출하는지 테스트"""
+        row = ['지교', '12.0', '(12.0)', '22/1', 'BAGA49118', '철학의문제들', '3', 'A+',
+               '22/2', 'BAGA49119', '논리학', '2', 'B0']
+
+        courses = build_tokenizer().extract_courses(row, '지교')
+
+        assert [c['course_name'] for c in courses] == ['철학의문제들', '논리학']
+        assert courses[0] == {
+            'year': 2022, 'semester': '1학기', 'course_name': '철학의문제들',
+            'credits': 3, 'grade': 'A+', 'next_index': 8, 'course_type': '지교',
+        }
+        assert courses[1]['credits'] == 2
+
+    def test_defaults_when_grade_missing(self):
+        """성적 없이 다음 학기가 나오면 기본값으로 마치고 다음 과목을 읽는지 테스트"""
+        row = ['23/1', 'BPHI20001', '서양고대철학', '2', '24/2', 'BPHI20003', '인식론', '3', 'B+']
+
+        courses = build_tokenizer().extract_courses(row, '전선')
+
+        assert [(c['course_name'], c['credits'], c['grade']) for c in courses] == [
+            ('서양고대철학', 2, 'P'), ('인식론', 3, 'B+'),
+        ]
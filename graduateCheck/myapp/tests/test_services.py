@@ -1,7 +1,9 @@
 import pytest
 import pandas as pd
 from unittest.mock import Mock, patch, MagicMock
-from myapp.services.graduation.graduation_analyzer import GraduationAnalyzer
+from myapp.services.graduation.graduation_analyzer import (
+    GraduationAnalyzer, CohortStudent, choose_cleaner, smart_clean_dataframe
+)
 from myapp.services.cleaner import clean_dataframe
 
 
@@ -20,7 +22,7 @@ class TestGraduationAnalyzer:
             'credits': [3, 3, 3, 3]
         })
         
-        mapped_df = self.analyzer._apply_course_name_mapping(df)
+        mapped_df = self.analyzer._normalize(df)
         
         assert '철학산책' in mapped_df['course_name'].values
         assert '서양고중세철학' in mapped_df['course_name'].values
@@ -35,7 +37,7 @@ class TestGraduationAnalyzer:
             'credits': [3, 3]
         })
         
-        mapped_df = self.analyzer._apply_course_type_mapping(df)
+        mapped_df = self.analyzer._normalize(df)
         
         assert '심화교양' in mapped_df['course_type'].values
         assert '전공선택' in mapped_df['course_type'].values
@@ -68,6 +70,20 @@ class TestGraduationAnalyzer:
         # 이 테스트는 현재 구현과 맞지 않음
         pytest.skip("현재 구현에서는 clean_dataframe이 F학점을 제거하므로 이 테스트는 실제 동작과 맞지 않음")
     
+    def test_f_grade_courses_records(self):
+        """F/N 과목을 행 순서대로, 없는 열은 빈 값으로 꺼내는지 테스트"""
+        df = pd.DataFrame({
+            'course_name': ['윤리학', '논리학', '인식론'],
+            'grade': ['F', 'A+', 'N'],
+            'credits': [3, 3, 2],
+            'year': [2022, 2022, 2023],
+        })
+        
+        assert self.analyzer._f_grade_courses(df) == [
+            {'course_name': '윤리학', 'year': 2022, 'semester': '', 'grade': 'F', 'credits': 3},
+            {'course_name': '인식론', 'year': 2023, 'semester': '', 'grade': 'N', 'credits': 2},
+        ]
+    
     def test_analyze_invalid_requirement(self):
         """잘못된 졸업요건으로 분석 시 에러 처리 테스트"""
         df = pd.DataFrame({
@@ -135,6 +151,157 @@ class TestCleanDataframe:
             assert len(result) == 1
         except Exception as e:
             pytest.skip(f"clean_dataframe 함수 테스트 스킵: {e}")
+    
+    def test_clean_dataframe_fixed_columns(self):
+        """기존 포털 고정 열 형식(36열)에서 과목 추출과 취득학점포기 제외 테스트"""
+        # pd.read_excel과 같이 빈 셀은 NaN
+        rows = [[float('nan')] * 36 for _ in range(7)]
+        for year, course_type, name, grade, note in [
+            ('2022', '전선', '논리학', 'A+', None),
+            ('2022', '심교', '철학산책', 'B', None),
+            ('2023', '전선', '윤리학', 'F', '취득학점포기'),
+            (float('nan'), '전선', '미학', 'A', None),
+        ]:
+            row = [float('nan')] * 36
+            row[1], row[3], row[8], row[18], row[31], row[34], row[25] = year, '1학기', course_type, name, 3, grade, note
+            rows.append(row)
+        
+        result = clean_dataframe(pd.DataFrame(rows))
+        
+        assert result['course_name'].tolist() == ['논리학', '철학산책']
+        assert result['year'].tolist() == [2022, 2022]
+        assert 'delete_type' in result.columns
+    
+    def test_clean_dataframe_34_columns(self):
+        """34열 시트는 성적이 33열에서 찾아지면 정제되고, 기본 성적 열(34)을 써야 하면 실패하는지 테스트"""
+        def fixed_rows(grade_col):
+            rows = [[float('nan')] * 34 for _ in range(7)]
+            for name in ['논리학', '철학산책']:
+                row = [float('nan')] * 34
+                row[1], row[3], row[8], row[18], row[31] = '2022', '1학기', '전선', name, 3
+                if grade_col is not None:
+                    row[grade_col] = 'A+'
+                rows.append(row)
+            return pd.DataFrame(rows)
+        
+        result = clean_dataframe(fixed_rows(grade_col=33))
+        
+        assert result['course_name'].tolist() == ['논리학', '철학산책']
+        assert result['grade'].tolist() == ['A+', 'A+']
+        with pytest.raises(IndexError):
+            clean_dataframe(fixed_rows(grade_col=None))
+
+
+class TestSmartCleanDataframe:
+    """형식 판별 후 cleaner 선택 테스트"""
+    
+    def test_header_based_uses_cleaner2_only(self):
+        """헤더 기반 형식은 기존 cleaner를 실행하지 않는지 테스트"""
+        df = pd.DataFrame([
+            ['년도', '학기', '이수구분', '과목명', '학점', '성적'],
+            [2023, '1학기', '전선', '논리학', 3, 'A+'],
+            [2023, '2학기', '심교', '철학산책', 3, 'B0'],
+        ])
+        
+        with patch('myapp.services.graduation.graduation_analyzer.clean_dataframe') as mock_clean_dataframe:
+            result = smart_clean_dataframe(df)
+        
+        mock_clean_dataframe.assert_not_called()
+        assert result.attrs['cleaned_by'] == 'cleaner2'
+        assert '헤더 기반' in result.attrs['clean_reason']
+        assert result['course_name'].tolist() == ['논리학', '철학산책']
+    
+    def test_unknown_format_declined_by_both(self):
+        """두 cleaner가 모두 거절하면 이유를 남기고 기존 cleaner로 시도하는지 테스트"""
+        df = pd.DataFrame({'메모': ['철학과', '졸업']})
+        
+        cleaner_name, reason = choose_cleaner(df)
+        
+        assert cleaner_name == 'cleaner'
+        assert '필수 컬럼 없음' in reason and '열 수 부족' in reason
+        with pytest.raises(ValueError, match='데이터 정제 실패 - cleaner'):
+            smart_clean_dataframe(df)
+    
+    def test_cleaner2_failure_falls_back_to_legacy(self):
+        """cleaner2가 받아들였지만 정제에 실패하면 기존 cleaner가 받아들이는 시트는 기존 cleaner로 정제하는지 테스트"""
+        # 제목만 취득학점 확인원이고 과목 행은 고정 열 형식(34열)
+        rows = [[float('nan')] * 34 for _ in range(7)]
+        rows[0][0] = '취득학점 확인원'
+        for name in ['논리학', '철학산책']:
+            row = [float('nan')] * 34
+            row[1], row[3], row[8], row[18], row[31], row[33] = '2022', '1학기', '전선', name, 3, 'A+'
+            rows.append(row)
+        df = pd.DataFrame(rows)
+        assert choose_cleaner(df)[0] == 'cleaner2'
+        
+        result = smart_clean_dataframe(df)
+        
+        assert result.attrs['cleaned_by'] == 'cleaner'
+        assert 'cleaner2 정제 실패' in result.attrs['clean_reason']
+        assert result['course_name'].tolist() == ['논리학', '철학산책']
+
+
+def cleaned_transcript(names, types, grades, credits=None):
+    df = pd.DataFrame({
+        'course_name': names,
+        'course_type': types,
+        'credits': credits or [3] * len(names),
+        'grade': grades,
+    })
+    df.attrs['cleaned_by'] = 'cleaner2'
+    return df
+
+
+class TestAnalyzeBatch:
+    """코호트 일괄 분석 테스트"""
+    
+    def setup_method(self):
+        self.analyzer = GraduationAnalyzer()
+    
+    def cohort(self):
+        return [
+            CohortStudent('20220001', cleaned_transcript(
+                ['철학산책', '서양고대철학', '윤리학', '학술답사Ⅰ'], ['심교', '전선', '전선', '전선'],
+                ['A+', 'B0', 'F', 'P'], [3, 3, 3, 1]), 'normal', 2022, 'yes'),
+            CohortStudent('20190002', cleaned_transcript(
+                ['철학의 이해', '논리학', '인식론'], ['심교', '지교', '전선'], ['A0', 'N', 'B+']), 'double', 2019, 'no'),
+            CohortStudent('20230003', pd.DataFrame({'메모': ['철학과']}), 'normal', 2023),
+            CohortStudent('20210004', cleaned_transcript(
+                ['형이상학'], ['전선'], ['A+'], [2.0]), 'transfer', 2021),
+        ]
+    
+    def test_matches_single_student_results(self):
+        """학생별 결과가 analyze와 같은지 테스트"""
+        single = {
+            student.student_id: self.analyzer.analyze(
+                student.df.copy(), student.student_type, student.admission_year, student.internship_completed)
+            for student in self.cohort()
+        }
+        
+        batch = self.analyzer.analyze_batch(self.cohort())
+        
+        assert list(batch) == ['20220001', '20190002', '20230003', '20210004']
+        assert repr(batch) == repr(single)
+        assert batch['20230003']['status'] == '오류'
+        assert batch['20220001']['f_grade_courses'][0]['course_name'] == '윤리학'
+    
+    def test_stacks_compatible_transcripts(self):
+        """dtype이 같은 성적표는 한 번에 쌓아서 분석하는지 테스트"""
+        with patch.object(self.analyzer, 'analyze', wraps=self.analyzer.analyze) as mock_analyze:
+            with patch.object(self.analyzer, '_analyze_stacked', wraps=self.analyzer._analyze_stacked) as mock_stacked:
+                self.analyzer.analyze_batch(self.cohort())
+        
+        mock_analyze.assert_not_called()
+        # 정수 학점 두 명은 한 묶음, 실수 학점 한 명은 따로
+        assert sorted(len(call.args[0]) for call in mock_stacked.call_args_list) == [1, 2]
+    
+    def test_duplicate_student_id(self):
+        """중복 학번은 거부하는지 테스트"""
+        students = self.cohort()[:2]
+        students[1] = students[1]._replace(student_id=students[0].student_id)
+        
+        with pytest.raises(ValueError, match='중복된 학번'):
+            self.analyzer.analyze_batch(students)
 
 
 class TestAnalyzeContext:
@@ -0,0 +1,121 @@
+import time
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from myapp.services.analysis_pool import AnalysisPool
+from myapp.services.timing import (
+    StageHistograms, StageTimer, current_timer, stage, stage_histograms, start_timer, stop_timer
+)
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestStageTimer:
+    """단계별 타이머 테스트"""
+
+    def test_stage_without_timer_is_noop(self):
+        """요청 타이머가 없으면 같은 빈 컨텍스트를 돌려주는지 테스트"""
+        assert current_timer() is None
+        assert stage('read') is stage('clean')
+        with stage('read'):
+            pass
+
+    def test_durations_accumulate(self):
+        """같은 단계는 합산하고 Server-Timing 형식으로 내보내는지 테스트"""
+        clock = FakeClock()
+        timer = StageTimer(clock=clock)
+        for seconds in (0.010, 0.005):
+            start = clock.now
+            clock.now += seconds
+            timer.add('read', clock.now - start)
+        timer.add('render', 0.002)
+
+        assert timer.milliseconds() == {'read': 15.0, 'render': 2.0}
+        assert timer.server_timing(20.0) == 'read;dur=15.0, render;dur=2.0, total;dur=20.0'
+
+    def test_stage_records_into_current_timer(self):
+        """설치된 타이머에 단계 시간이 기록되는지 테스트"""
+        timer, token = start_timer()
+        try:
+            with stage('detect'):
+                time.sleep(0.001)
+        finally:
+            stop_timer(token)
+
+        assert timer.milliseconds()['detect'] >= 1.0
+        assert current_timer() is None
+
+    def test_pool_thread_sees_timer(self):
+        """분석 풀 스레드에서 잰 단계도 요청 타이머에 남는지 테스트"""
+        pool = AnalysisPool(max_workers=1, max_queue=0)
+
+        def work():
+            with stage('analyze'):
+                return 1
+
+        timer, token = start_timer()
+        try:
+            pool.submit(work).result(timeout=5)
+        finally:
+            stop_timer(token)
+
+        assert 'analyze' in timer.milliseconds()
+
+
+class TestStageHistograms:
+    """단계별 히스토그램 테스트"""
+
+    def test_window_and_percentiles(self):
+        """최근 window개만 남기고 백분위수/누적 구간을 계산하는지 테스트"""
+        histograms = StageHistograms(window=100)
+        for ms in range(1, 201):
+            histograms.record({'read': float(ms)})
+
+        snapshot = histograms.snapshot()['read']
+
+        assert snapshot['count'] == 100
+        assert snapshot['p50'] == 151.0 and snapshot['max'] == 200.0
+        assert snapshot['buckets'][100] == 0
+        assert snapshot['buckets'][250] == 100
+
+
+@pytest.mark.django_db
+class TestStageTimingMiddleware:
+    """Server-Timing 미들웨어 테스트"""
+
+    @pytest.fixture(autouse=True)
+    def timing_settings(self, settings):
+        settings.STAGE_TIMING = True
+        stage_histograms.clear()
+        yield
+        stage_histograms.clear()
+
+    def test_upload_reports_stages(self, client):
+        """업로드 분석 응답에 단계별 시간이 붙고 히스토그램에 쌓이는지 테스트"""
+        excel_file = SimpleUploadedFile("test.xlsx", build_credit_confirmation_workbook())
+        response = client.post(reverse('index'), {
+            'excel_file': excel_file,
+            'student_id': '20220001',
+            'student_type': 'normal',
+            'internship_completed': 'yes',
+        })
+
+        metrics = [metric.split(';')[0] for metric in response['Server-Timing'].split(', ')]
+        for name in ('read', 'detect', 'clean', 'normalize', 'common', 'major', 'field_trip', 'render', 'total'):
+            assert name in metrics
+        assert stage_histograms.snapshot()['total']['count'] == 1
+
+    def test_disabled(self, client, settings):
+        """꺼져 있으면 헤더를 붙이지 않는지 테스트"""
+        settings.STAGE_TIMING = False
+
+        response = client.get(reverse('index'))
+
+        assert 'Server-Timing' not in response
@@ -0,0 +1,37 @@
+import io
+import pytest
+from benchmarks.transcripts import LAYOUTS, TranscriptSpec, expected_course_count, generate_workbook
+from myapp.services.cleaner import clean_dataframe
+from myapp.services.graduation.graduation_analyzer import GraduationAnalyzer, choose_cleaner, smart_clean_dataframe
+from myapp.services.ingestion import load_transcript, read_transcript
+
+
+@pytest.mark.parametrize('layout', LAYOUTS)
+def test_generated_workbook_cleans_to_expected_courses(layout):
+    """합성 성적표가 정제 후 기대한 과목 수(포기 과목 제외)로 남는지 테스트"""
+    spec = TranscriptSpec(layout=layout, courses=60, retakes=3, failures=2, forfeits=2, noise=0.3, seed=7)
+    cleaned = smart_clean_dataframe(load_transcript(io.BytesIO(generate_workbook(spec))))
+
+    assert cleaned['grade'].isin(['F', 'N']).sum() == spec.retakes + spec.failures
+    if layout != 'portal':
+        # portal 형식은 cleaner2가 맡으면 포기 과목이 남으므로 개수는 기존 cleaner 테스트에서 확인
+        assert len(cleaned) == expected_course_count(spec)
+    assert 'error' not in GraduationAnalyzer().analyze(cleaned, 'normal', 2022, 'yes')
+
+
+def test_portal_layout_matches_legacy_cleaner():
+    """portal 형식은 기존 cleaner가 포기 과목을 빼고 모두 읽는지 테스트"""
+    spec = TranscriptSpec(layout='portal', courses=40, forfeits=2, noise=0.3, seed=3)
+    df = read_transcript(io.BytesIO(generate_workbook(spec)))
+
+    assert len(clean_dataframe(df)) == expected_course_count(spec)
+
+
+def test_same_spec_generates_same_workbook():
+    """같은 spec이면 같은 과목 기록을 만드는지 테스트"""
+    spec = TranscriptSpec(layout='columns', seed=5)
+    first = read_transcript(io.BytesIO(generate_workbook(spec)))
+    second = read_transcript(io.BytesIO(generate_workbook(spec)))
+
+    assert first.equals(second)
+    assert choose_cleaner(first)[0] == 'cleaner2'
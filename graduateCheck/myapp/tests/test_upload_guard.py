@@ -0,0 +1,127 @@
+import io
+import re
+import zipfile
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from openpyxl import Workbook
+from myapp.services.ingestion import guard_workbook, load_transcript, read_transcript
+from myapp.services.upload_guard import UploadLimits, UploadRejected, parse_dimension
+from myapp.tests.test_xlsx_reader import build_credit_confirmation_workbook
+
+
+def build_rows_workbook(rows=30, columns=3):
+    workbook = Workbook()
+    sheet = workbook.active
+    for i in range(rows):
+        sheet.append([f'값{i}-{j}' for j in range(columns)])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def rewrite_part(content: bytes, name: str, func) -> bytes:
+    """xlsx(zip) 안 파일 하나를 func(bytes) 결과로 바꾼 새 xlsx (없으면 func(b'')로 추가)"""
+    output = io.BytesIO()
+    with zipfile.ZipFile(io.BytesIO(content)) as source, \
+            zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as target:
+        for info in source.infolist():
+            data = source.read(info.filename)
+            target.writestr(info.filename, func(data) if info.filename == name else data)
+        if name not in source.namelist():
+            target.writestr(name, func(b''))
+    return output.getvalue()
+
+
+def declare_dimension(content: bytes, ref: str) -> bytes:
+    return rewrite_part(content, 'xl/worksheets/sheet1.xml',
+                        lambda data: re.sub(rb'<dimension ref="[^"]*"', f'<dimension ref="{ref}"'.encode(), data))
+
+
+def test_parse_dimension():
+    """dimension ref에서 (행 수, 열 수)를 읽는지 테스트"""
+    assert parse_dimension('A1:AJ120') == (120, 36)
+    assert parse_dimension('$A$1:$C$3') == (3, 3)
+    assert parse_dimension('B7') == (7, 2)
+    assert parse_dimension('') is None
+
+
+def test_normal_workbooks_pass():
+    """일반 성적표는 기본 제한을 통과하는지 테스트"""
+    content = build_credit_confirmation_workbook()
+    guard_workbook(io.BytesIO(content), UploadLimits())
+
+    assert len(load_transcript(io.BytesIO(content))) > 0
+
+
+def test_declared_dimension_rejected_before_parsing():
+    """선언한 dimension이 크면 행을 읽기 전에 거절하는지 테스트"""
+    content = declare_dimension(build_credit_confirmation_workbook(), 'A1:XFD1048576')
+
+    with pytest.raises(UploadRejected, match='시트가 너무 큽니다'):
+        load_transcript(io.BytesIO(content))
+
+
+def test_shared_strings_bomb_rejected():
+    """압축률이 비정상적인 sharedStrings는 압축을 풀지 않고 거절하는지 테스트"""
+    bomb = b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">' + \
+        b'<si><t>a</t></si>' * 200_000 + b'</sst>'
+    content = rewrite_part(build_credit_confirmation_workbook(), 'xl/sharedStrings.xml', lambda data: bomb)
+
+    with pytest.raises(UploadRejected, match='압축률'):
+        load_transcript(io.BytesIO(content))
+    with pytest.raises(UploadRejected, match='너무 큽니다'):
+        guard_workbook(io.BytesIO(content), UploadLimits(max_part_bytes=1024 * 1024, max_compression_ratio=10_000))
+
+
+def test_upload_size_limit():
+    """파일 크기 제한을 넘으면 거절하는지 테스트"""
+    with pytest.raises(UploadRejected, match='파일이 너무 큽니다'):
+        load_transcript(io.BytesIO(build_credit_confirmation_workbook()), UploadLimits(max_upload_bytes=1024))
+
+
+@pytest.mark.parametrize('content', [
+    declare_dimension(build_rows_workbook(rows=30), 'A1:C3'),
+    declare_dimension(build_credit_confirmation_workbook(), 'A1:C3'),
+])
+def test_row_limit_enforced_while_streaming(content):
+    """dimension이 작게 선언되어 있어도 읽는 동안 행 수 제한을 지키는지 테스트"""
+    with pytest.raises(UploadRejected, match='행이 너무 많습니다'):
+        load_transcript(io.BytesIO(content), UploadLimits(max_rows=5))
+
+
+def test_column_limit_enforced_while_streaming():
+    """먼 열에 있는 셀 하나로 행을 키우는 파일을 빈 칸을 채우기 전에 거절하는지 테스트"""
+    workbook = Workbook()
+    workbook.active['A1'] = '헤더'
+    workbook.active.cell(row=2, column=500, value='x')
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    content = declare_dimension(buffer.getvalue(), 'A1:C3')
+
+    with pytest.raises(UploadRejected, match='열이 너무 많습니다'):
+        read_transcript(io.BytesIO(content), limits=UploadLimits(max_columns=50))
+
+
+def test_limits_from_settings(settings):
+    """settings.UPLOAD_LIMITS로 제한을 바꿀 수 있는지 테스트"""
+    settings.UPLOAD_LIMITS = {'max_rows': 5}
+
+    assert UploadLimits.from_settings().max_rows == 5
+    with pytest.raises(UploadRejected):
+        load_transcript(io.BytesIO(build_rows_workbook(rows=30)))
+
+
+@pytest.mark.django_db
+def test_view_shows_rejection(client, settings):
+    """업로드 뷰가 거절 사유를 오류 메시지로 보여주는지 테스트"""
+    settings.UPLOAD_LIMITS = {'max_upload_bytes': 1024}
+
+    response = client.post(reverse('index'), {
+        'excel_file': SimpleUploadedFile('test.xlsx', build_credit_confirmation_workbook()),
+        'student_id': '20220001',
+        'student_type': 'normal',
+        'internship_completed': 'yes',
+    })
+
+    assert '파일이 너무 큽니다' in response.content.decode()
@@ -0,0 +1,78 @@
+import io
+import pytest
+import pandas as pd
+from openpyxl import Workbook
+from benchmarks.transcripts import TranscriptSpec, generate_workbook
+from myapp.services.cleaner2 import FlexibleCleaner, clean_dataframe_v2
+from myapp.services.ingestion import load_transcript
+from myapp.services.xlsx_reader import read_row_tokens
+
+
+def build_credit_confirmation_workbook():
+    """취득학점확인원 형식의 테스트용 xlsx 바이트 생성"""
+    rows = [
+        ['취득학점 확인원'],
+        ['학번', '202200000', '성명', '홍길동'],
+        ['구분', '취득학점'],
+        ['지교', 12.0, '(12.0)', '22/1', 'BAGA49118', '철학의문제들', 3, 'A+',
+         '22/2', 'BAGA49119', '논리학', 3, 'B0'],
+        [None, None, None, '23/1', 'BKSA56558(SW)', '동양사상과현실문제', 3, 'A0'],
+        ['심교', 3.0, '22/1', 'BAGA10001', '철학의 이해', 3, 'P'],
+        ['전선', 9.0, '(9.0)', '23/1', 'BPHI20001', '서양고대철학', 3, 'A+',
+         '(계)24/1 3', 'BPHI20002', '윤리학', 3, 'F', '24/2', 'BPHI20003', '인식론', 3, 'B+'],
+    ]
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class TestXlsxReader:
+    """zip/XML 직접 읽기 테스트"""
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_tokens_match_dataframe_rows(self, seed):
+        """생성한 성적표 시트 전체에서 토큰 경로 정제 결과가 pd.read_excel 경로와 같은지 테스트
+
+        실수 열은 토큰 문자열이 다르므로('3'과 '3.0') 행 토큰이 아니라 정제 결과를 비교합니다.
+        """
+        spec = TranscriptSpec(layout='credit_confirmation', courses=60, noise=0.3, seed=seed)
+        content = generate_workbook(spec)
+
+        expected = clean_dataframe_v2(pd.read_excel(io.BytesIO(content)))
+        result = FlexibleCleaner().clean_row_tokens(read_row_tokens(io.BytesIO(content)))
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert len(result) > 0
+
+    def test_clean_row_tokens_matches_clean_dataframe_v2(self):
+        """토큰 경로 정제 결과가 기존 DataFrame 경로와 같은지 테스트"""
+        content = build_credit_confirmation_workbook()
+
+        expected = clean_dataframe_v2(pd.read_excel(io.BytesIO(content)))
+        result = FlexibleCleaner().clean_row_tokens(read_row_tokens(io.BytesIO(content)))
+
+        pd.testing.assert_frame_equal(result, expected)
+        assert '철학산책' in result['course_name'].values
+
+    def test_load_transcript_marks_cleaned(self):
+        """취득학점확인원은 정제된 DataFrame으로 반환되는지 테스트"""
+        content = build_credit_confirmation_workbook()
+
+        result = load_transcript(io.BytesIO(content))
+
+        assert result.attrs['cleaned_by'] == 'cleaner2'
+        assert len(result) == 7
+
+    def test_load_transcript_other_format(self):
+        """다른 형식은 원본 DataFrame으로 반환되는지 테스트"""
+        buffer = io.BytesIO()
+        pd.DataFrame({'과목명': ['철학산책'], '이수구분': ['심교']}).to_excel(buffer, index=False)
+
+        result = load_transcript(io.BytesIO(buffer.getvalue()))
+
+        assert 'cleaned_by' not in result.attrs
+        assert list(result.columns) == ['과목명', '이수구분']
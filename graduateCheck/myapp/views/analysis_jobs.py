@@ -0,0 +1,75 @@
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+from ..models import AnalysisJob
+from ..services.ingestion import student_id_from_filename
+from ..services.jobs import enqueue_upload
+from ..services.upload_guard import UploadRejected
+
+def _job_payload(job: AnalysisJob):
+    payload = {
+        'id': str(job.id),
+        'filename': job.filename,
+        'student_id': job.student_id,
+        'status': job.status,
+        'status_url': reverse('analysis_job_status', args=[job.id]),
+    }
+    if job.status == AnalysisJob.Status.DONE:
+        payload['result_url'] = reverse('analysis_job_result', args=[job.id])
+    if job.error:
+        payload['error'] = job.error
+    return payload
+
+def _get_job(job_id):
+    try:
+        return AnalysisJob.objects.get(id=job_id)
+    except AnalysisJob.DoesNotExist:
+        raise Http404('분석 작업을 찾을 수 없습니다.')
+
+@require_POST
+def submit_analysis_jobs(request):
+    """성적표(여러 개 가능)를 분석 작업으로 등록하고 바로 작업 id를 반환
+
+    학번은 폼의 student_id(파일이 하나일 때) 또는 파일명에서 찾습니다.
+    """
+    files = request.FILES.getlist('excel_file')
+    if not files:
+        return JsonResponse({'error': '성적표 파일을 선택해주세요.'}, status=400)
+
+    student_type = request.POST.get('student_type', 'normal')
+    internship_completed = request.POST.get('internship_completed', 'no')
+    form_student_id = request.POST.get('student_id') if len(files) == 1 else None
+
+    jobs = []
+    for upload in files:
+        student_id = form_student_id or student_id_from_filename(upload.name)
+        if not student_id or not student_id[:4].isdigit():
+            jobs.append({'filename': upload.name, 'error': '학번을 입력하거나 파일명에 학번을 넣어주세요.'})
+            continue
+        try:
+            job = enqueue_upload(upload, student_id, student_type, internship_completed)
+        except UploadRejected as e:
+            jobs.append({'filename': upload.name, 'error': str(e)})
+            continue
+        jobs.append(_job_payload(job))
+
+    return JsonResponse({'jobs': jobs}, status=202)
+
+@require_GET
+def analysis_job_status(request, job_id):
+    return JsonResponse(_job_payload(_get_job(job_id)))
+
+@require_GET
+def analysis_job_result(request, job_id):
+    """끝난 작업의 결과 페이지 (아직이면 202)"""
+    job = _get_job(job_id)
+    if job.status == AnalysisJob.Status.FAILED:
+        return render(request, 'upload.html', {'error': job.error})
+    if job.status != AnalysisJob.Status.DONE:
+        return render(request, 'upload.html', {'error': '아직 분석 중입니다. 잠시 후 다시 확인해주세요.'}, status=202)
+
+    return render(request, 'result.html', {
+        'result': job.result,
+        'student_type': job.student_type
+    })
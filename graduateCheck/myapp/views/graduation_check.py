@@ -1,45 +1,170 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.shortcuts import render
-import pandas as pd
+from django.views.decorators.http import require_POST
+from ..services.parse_cache import (
+    load_cached_transcript, load_transcript_by_token, transcript_token, upload_digest
+)
+from ..services.analysis_pool import PoolBusy, analysis_pool
+from ..services.metrics import metrics
+from ..services.timing import stage
+from ..services.upload_guard import UploadRejected
 from ..services.graduation.graduation_analyzer import GraduationAnalyzer
 from ..models.graduation_requirement import GraduationRequirementManager
 
+BUSY_MESSAGE = '지금은 분석 요청이 많습니다. 잠시 후 다시 시도해주세요.'
+EXPIRED_MESSAGE = '업로드한 성적표의 보관 시간이 지났습니다. 파일을 다시 올려주세요.'
+STUDENT_TYPE_CHOICES = [
+    ('normal', '원전공'),
+    ('transfer', '편입생'),
+    ('double', '다전공'),
+    ('minor', '부전공'),
+]
+
+def _read_analysis_options(request):
+    """분석 조건 폼 값 확인 -> (분석 인자, 오류 메시지)"""
+    student_id = request.POST.get('student_id')
+    student_type = request.POST.get('student_type', 'normal')
+    internship_completed = request.POST.get('internship_completed', 'no')
+
+    if not student_id:
+        return None, '학번을 입력해주세요.'
+
+    # 학번에서 입학년도 추출 (예: 201110207 -> 2011)
+    admission_year = int(student_id[:4])
+
+    # 2024학번까지는 인턴십 이수 여부 확인
+    if admission_year <= 2024 and not internship_completed:
+        return None, '2024학번까지는 인턴십 이수 여부를 선택해주세요.'
+
+    return {
+        'student_id': student_id,
+        'student_type': student_type,
+        'admission_year': admission_year,
+        'internship_completed': internship_completed,
+    }, None
+
+def _read_upload_form(request):
+    """업로드 폼 값 확인 -> (분석 인자, 오류 메시지)"""
+    excel_file = request.FILES['excel_file']
+    params, error = _read_analysis_options(request)
+    if error:
+        return None, error
+    return {'excel_file': excel_file, **params}, None
+
+def _analyze_transcript(df, student_id, student_type, admission_year, internship_completed):
+    """정제(또는 읽기만 한) 성적표를 분석하고 남은 학점을 더함"""
+    analyzer = GraduationAnalyzer()
+    result = analyzer.analyze(df, student_type, admission_year, internship_completed)
+
+    if 'error' in result:
+        return result
+
+    # 남은 학점 계산
+    requirement_manager = GraduationRequirementManager()
+    requirement = requirement_manager.get_requirement(admission_year, student_type)
+    result['remaining_credits'] = max(0, requirement.total_credits - result['total_credits'])
+    return result
+
+def _analyze_upload(excel_file, **params):
+    """성적표를 읽고 분석 -> (결과, 재분석용 토큰) (CPU 작업, 비동기 뷰에서는 분석 풀에서 실행)"""
+    df = load_cached_transcript(excel_file)
+    result = _analyze_transcript(df, **params)
+    return result, transcript_token(upload_digest(excel_file))
+
+def _render_result(request, result, params, transcript_token=None):
+    if 'error' in result:
+        return render(request, 'upload.html', {'error': result['error']})
+
+    with stage('render'):
+        return render(request, 'result.html', {
+            'result': result,
+            'student_type': params['student_type'],
+            # 학생 유형/인턴십만 바꿔 다시 분석할 때 파일 대신 보내는 값
+            'student_id': params['student_id'],
+            'internship_completed': params['internship_completed'],
+            'transcript_token': transcript_token,
+            'student_type_choices': STUDENT_TYPE_CHOICES,
+        })
+
+def _count_upload(outcome, excel_file=None):
+    """업로드 결과(ok|error|rejected)와 크기를 지표로 남김"""
+    metrics.inc('myapp_uploads_total', outcome=outcome)
+    if excel_file is not None:
+        metrics.observe('myapp_upload_bytes', excel_file.size)
+
 def analyze_graduation(request):
     if request.method == 'POST':
         try:
-            excel_file = request.FILES['excel_file']
-            student_id = request.POST.get('student_id')
-            student_type = request.POST.get('student_type', 'normal')
-            internship_completed = request.POST.get('internship_completed', 'no')
-            
-            if not student_id:
-                return render(request, 'upload.html', {'error': '학번을 입력해주세요.'})
-            
-            # 학번에서 입학년도 추출 (예: 201110207 -> 2011)
-            admission_year = int(student_id[:4])
-            
-            # 2024학번까지는 인턴십 이수 여부 확인
-            if admission_year <= 2024 and not internship_completed:
-                return render(request, 'upload.html', {'error': '2024학번까지는 인턴십 이수 여부를 선택해주세요.'})
-            
-            df = pd.read_excel(excel_file)
-            
-            analyzer = GraduationAnalyzer()
-            result = analyzer.analyze(df, student_type, admission_year, internship_completed)
-            
-            if 'error' in result:
-                return render(request, 'upload.html', {'error': result['error']})
-            
-            # 남은 학점 계산
-            requirement_manager = GraduationRequirementManager()
-            requirement = requirement_manager.get_requirement(admission_year, student_type)
-            result['remaining_credits'] = max(0, requirement.total_credits - result['total_credits'])
-            
-            return render(request, 'result.html', {
-                'result': result,
-                'student_type': student_type
-            })
-            
+            params, error = _read_upload_form(request)
+            if error:
+                _count_upload('rejected')
+                return render(request, 'upload.html', {'error': error})
+
+            result, token = _analyze_upload(**params)
+            _count_upload('error' if 'error' in result else 'ok', params['excel_file'])
+            return _render_result(request, result, params, token)
+
+        except UploadRejected as e:
+            _count_upload('rejected', params['excel_file'])
+            return render(request, 'upload.html', {'error': str(e)})
         except Exception as e:
+            _count_upload('error')
             return render(request, 'upload.html', {'error': str(e)})
-    
-    return render(request, 'upload.html') 
\ No newline at end of file
+
+    return render(request, 'upload.html')
+
+async def analyze_graduation_async(request):
+    """analyze_graduation의 비동기 버전 (ASGI)
+
+    파싱, 분석과 토큰 계산은 analysis_pool에서, 폼(multipart) 읽기와 템플릿 렌더링은
+    sync_to_async로 실행해 이벤트 루프를 막지 않습니다. 풀이 가득 차면 기다리지 않고
+    바로 503과 Retry-After로 응답합니다.
+    """
+    if request.method == 'POST':
+        try:
+            params, error = await sync_to_async(_read_upload_form)(request)
+            if error:
+                _count_upload('rejected')
+                return await sync_to_async(render)(request, 'upload.html', {'error': error})
+
+            result, token = await analysis_pool.run(_analyze_upload, **params)
+            _count_upload('error' if 'error' in result else 'ok', params['excel_file'])
+            return await sync_to_async(_render_result)(request, result, params, token)
+
+        except PoolBusy:
+            _count_upload('rejected')
+            response = await sync_to_async(render)(request, 'upload.html', {'error': BUSY_MESSAGE}, status=503)
+            response['Retry-After'] = str(getattr(settings, 'ANALYSIS_POOL_RETRY_AFTER', 5))
+            return response
+        except UploadRejected as e:
+            _count_upload('rejected', params['excel_file'])
+            return await sync_to_async(render)(request, 'upload.html', {'error': str(e)})
+        except Exception as e:
+            _count_upload('error')
+            return await sync_to_async(render)(request, 'upload.html', {'error': str(e)})
+
+    return await sync_to_async(render)(request, 'upload.html')
+
+@require_POST
+def reanalyze_graduation(request):
+    """업로드 없이 학생 유형/인턴십 이수 여부만 바꿔 다시 분석
+
+    결과 페이지가 보낸 transcript_token으로 파싱 캐시의 정제된 성적표를 찾아 요건
+    분석만 다시 실행합니다.
+    """
+    try:
+        params, error = _read_analysis_options(request)
+        if error:
+            return render(request, 'upload.html', {'error': error})
+
+        token = request.POST.get('transcript_token', '')
+        df = load_transcript_by_token(token)
+        if df is None:
+            return render(request, 'upload.html', {'error': EXPIRED_MESSAGE})
+
+        result = _analyze_transcript(df, **params)
+        return _render_result(request, result, params, token)
+
+    except Exception as e:
+        return render(request, 'upload.html', {'error': str(e)})
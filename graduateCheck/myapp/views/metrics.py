@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+from ..services.metrics import metrics
+
+# Prometheus 텍스트 형식 버전
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+@require_GET
+def metrics_view(request):
+    """모든 워커의 지표를 Prometheus 텍스트 형식으로 (로컬 수집기 전용)"""
+    if not metrics.enabled:
+        raise Http404('지표 수집이 꺼져 있습니다.')
+    if request.META.get('REMOTE_ADDR') not in getattr(settings, 'METRICS_ALLOWED_IPS', ()):
+        return HttpResponseForbidden()
+    return HttpResponse(metrics.render(), content_type=CONTENT_TYPE)